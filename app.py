@@ -1,16 +1,7 @@
 import argparse
-from predictor import (
-    load_games,
-    compute_team_ratings,
-    compute_team_point_avgs,
-
-    compute_team_players,
-
-
-    predict_with_reasoning,
-    predict_final_score,
-)
-from player_predictor import load_player_stats, compute_averages, predict_player
+from model_snapshot import load_model
+from predictor import predict_with_reasoning, predict_final_score
+from player_predictor import predict_player
 from teams import ALL_TEAMS
 
 DEFAULT_GAMES_PATH = 'data/sample_games.csv'
@@ -18,12 +9,11 @@ DEFAULT_STATS_PATH = 'data/sample_player_stats.csv'
 
 
 def interactive_mode(games_path, stats_path):
-    games = load_games(games_path)
-    player_stats = load_player_stats(stats_path)
-    team_players = compute_team_players(player_stats)
+    model = load_model(games_path, stats_path)
+    team_players = model.roster.team_players
 
     teams = sorted(ALL_TEAMS)
-    players = sorted({s['player'] for s in player_stats})
+    players = model.players
 
     print("Select an option:\n1) Predict game outcome\n2) Predict player stats")
     choice = input("Enter 1 or 2: ").strip()
@@ -32,29 +22,27 @@ def interactive_mode(games_path, stats_path):
         home = input("Home team: ")
         away = input("Away team: ")
 
-        ratings = compute_team_ratings(games, trade_date=None)
-        avgs = compute_team_point_avgs(games, trade_date=None)
-
-        ratings = compute_team_ratings(games)
-        avgs = compute_team_point_avgs(games)
-
-        prob, reason = predict_with_reasoning(home, away, ratings)
-        home_score, away_score = predict_final_score(home, away, avgs)
+        prob, reason = predict_with_reasoning(
+            home, away, model.ratings, k=model.k, home_weight=model.home_weight
+        )
+        home_score, away_score = predict_final_score(home, away, model.team_avgs)
         print(reason)
         print(f"Predicted probability {home} beats {away}: {prob:.3f}")
         print(f"Predicted final score: {home} {home_score} - {away} {away_score}")
 
-        print(f"Players {home}: {', '.join(team_players.get(home, []))}")
-        print(f"Players {away}: {', '.join(team_players.get(away, []))}")
+        print(f"Players {home}: {', '.join(team_players(home))}")
+        print(f"Players {away}: {', '.join(team_players(away))}")
 
 
     elif choice == '2':
         print("Available players: " + ", ".join(players))
         player = input("Player name: ")
-        avgs = compute_averages(player_stats)
-        stats = predict_player(player, avgs)
+        stats = predict_player(player, model.player_avgs)
         if stats:
             print(f"Predicted stats for {player} (averages):")
+            team = model.current_team(player)
+            if team:
+                print(f"  Current team: {team}")
             print(f"  Points: {stats['points']:.1f}")
             print(f"  Rebounds: {stats['rebounds']:.1f}")
             print(f"  Assists: {stats['assists']:.1f}")
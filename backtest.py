@@ -0,0 +1,218 @@
+"""Walk-forward backtest of the team rating model.
+
+For every game day the games on that day are predicted from ratings built
+only on earlier games, exactly as ``compute_ratings_and_avgs`` would build
+them if it were run the night before. Instead of recomputing ratings once
+per day, games are bucketed into per-day, per-team sums once; the weighted
+totals for every day then come from a single lower-triangular weight
+matrix product, so a full history costs O(days^2 x teams) arithmetic
+rather than O(days x games) Python-level work.
+"""
+
+import argparse
+import itertools
+import json
+import os
+
+import numpy as np
+
+from game_table import as_game_table, day_number
+from predictor import HOME_WEIGHT, TRADE_DEADLINE, load_games
+from tuning import DEFAULT_PARAMS
+
+EPSILON = 1e-15  # probability clip for log-loss
+
+
+class WalkForward:
+    """Per-day aggregates of a game history, ready to be weighted.
+
+    ``sums[d, t]`` holds the unweighted margin, points scored, points
+    allowed and games played by team ``t`` on ``days[d]``. Those do not
+    depend on any model parameter, so one instance can score any number of
+    parameter sets.
+    """
+
+    _FIELDS = 4  # diff, scored, allowed, games
+    _ARRAYS = ('days', 'slot', 'home', 'away', 'home_points', 'away_points', 'sums')
+
+    def __init__(self, games):
+        table = as_game_table(games)
+        self.teams = table.teams
+        self.days, slot = np.unique(table.day, return_inverse=True)
+        self.slot = slot.astype(np.intp)
+        self.home = table.home.astype(np.intp)
+        self.away = table.away.astype(np.intp)
+        self.home_points = table.home_points.astype(np.float64)
+        self.away_points = table.away_points.astype(np.float64)
+
+        sums = np.zeros((len(self.days), len(self.teams), self._FIELDS))
+        hp, ap = self.home_points, self.away_points
+        ones = np.ones(len(table))
+        for team, values in (
+            (self.home, (hp - ap, hp, ap, ones)),
+            (self.away, (ap - hp, ap, hp, ones)),
+        ):
+            for field, value in enumerate(values):
+                np.add.at(sums, (self.slot, team, field), value)
+        self.sums = sums
+        self._totals = {}
+
+    def __len__(self):
+        return len(self.slot)
+
+    def save(self, directory: str) -> None:
+        """Write the arrays as ``.npy`` files so other processes can map them."""
+        os.makedirs(directory, exist_ok=True)
+        for name in self._ARRAYS:
+            np.save(os.path.join(directory, name + '.npy'), getattr(self, name))
+        with open(os.path.join(directory, 'teams.json'), 'w') as f:
+            json.dump(self.teams, f)
+
+    @classmethod
+    def load(cls, directory: str, mmap_mode: str | None = 'r') -> "WalkForward":
+        """Open a saved instance; by default the arrays are read-only memory maps."""
+        walk = cls.__new__(cls)
+        for name in cls._ARRAYS:
+            setattr(walk, name, np.load(os.path.join(directory, name + '.npy'), mmap_mode=mmap_mode))
+        with open(os.path.join(directory, 'teams.json')) as f:
+            walk.teams = json.load(f)
+        walk._totals = {}
+        return walk
+
+    def weight_matrix(self, recency_bias=0.02, trade_date=None, post_trade_weight=1.5):
+        """Return the ``(days x days)`` matrix of weights seen by each day.
+
+        Row ``i`` weights every earlier day ``j`` by
+        ``1 / (1 + bias * (days[i-1] - days[j]))``: the model predicting day
+        ``i`` was last refreshed with the previous game day's results.
+        """
+        days = self.days.astype(np.float64)
+        latest = np.concatenate(([days[0]], days[:-1]))
+        gap = np.maximum(latest[:, None] - days[None, :], 0)
+        weights = 1 / (1 + recency_bias * gap)
+        weights = np.tril(weights, k=-1)
+        if trade_date:
+            weights[:, self.days >= day_number(trade_date)] *= post_trade_weight
+        return weights
+
+    def totals(self, recency_bias=0.02, trade_date=None, post_trade_weight=1.5):
+        """Return the ``(days x teams x 4)`` weighted sums each day predicts from.
+
+        Results are cached per rating parameter set, since ``k`` and the home
+        weight only change the final probability step.
+        """
+        key = (recency_bias, trade_date, post_trade_weight)
+        cached = self._totals.get(key)
+        if cached is None:
+            weights = self.weight_matrix(recency_bias, trade_date, post_trade_weight)
+            flat = self.sums.reshape(len(self.days), -1)
+            cached = self._totals[key] = (weights @ flat).reshape(self.sums.shape)
+        return cached
+
+    def predictions(self, recency_bias=0.02, trade_date=None, post_trade_weight=1.5,
+                    k=0.1, home_weight=HOME_WEIGHT):
+        """Return per-game ``(prob_home, home_score, away_score, scored)``.
+
+        ``scored`` is False for games where either team had no earlier
+        games; the other arrays hold placeholders there.
+        """
+        totals = self.totals(recency_bias, trade_date, post_trade_weight)
+        home = totals[self.slot, self.home]
+        away = totals[self.slot, self.away]
+        scored = (home[:, 3] > 0) & (away[:, 3] > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            home = home / home[:, 3:]
+            away = away / away[:, 3:]
+        diff = home[:, 0] * home_weight - away[:, 0]
+        prob_home = 1 / (1 + np.exp(-k * diff))
+        home_score = np.rint((home[:, 1] + away[:, 2]) / 2)
+        away_score = np.rint((away[:, 1] + home[:, 2]) / 2)
+        return prob_home, home_score, away_score, scored
+
+    def evaluate(self, recency_bias=0.02, trade_date=None, post_trade_weight=1.5,
+                 k=0.1, home_weight=HOME_WEIGHT):
+        """Score one parameter set; returns a dict of metrics."""
+        prob, home_score, away_score, scored = self.predictions(
+            recency_bias, trade_date, post_trade_weight, k, home_weight
+        )
+        prob = prob[scored]
+        home_won = (self.home_points > self.away_points)[scored]
+        if not len(prob):
+            return {'games': 0, 'log_loss': float('nan'), 'brier': float('nan'),
+                    'accuracy': float('nan'), 'score_mae': float('nan')}
+        clipped = np.clip(prob, EPSILON, 1 - EPSILON)
+        log_loss = -np.mean(np.where(home_won, np.log(clipped), np.log(1 - clipped)))
+        errors = np.concatenate((
+            np.abs(home_score[scored] - self.home_points[scored]),
+            np.abs(away_score[scored] - self.away_points[scored]),
+        ))
+        return {
+            'games': int(len(prob)),
+            'log_loss': float(log_loss),
+            'brier': float(np.mean((prob - home_won) ** 2)),
+            'accuracy': float(np.mean((prob > 0.5) == home_won)),
+            'score_mae': float(errors.mean()),
+        }
+
+
+def expand_grid(grid: dict):
+    """Turn ``{param: [values]}`` into a list of full parameter dicts."""
+    names = list(grid)
+    candidates = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(DEFAULT_PARAMS)
+        params.update(zip(names, values))
+        candidates.append(params)
+    return candidates
+
+
+def backtest(games, grid: dict | None = None):
+    """Walk-forward evaluate every parameter set in ``grid``.
+
+    Returns a list of ``(params, metrics)`` sorted by log-loss. Candidates
+    sharing rating parameters reuse the same weighted totals.
+    """
+    walk = WalkForward(games)
+    results = [(params, walk.evaluate(**params)) for params in expand_grid(grid or {})]
+    return sorted(results, key=lambda r: r[1]['log_loss'])
+
+
+def _floats(text):
+    return [float(v) for v in text.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the rating model")
+    parser.add_argument('--data', default='data/sample_games.csv', help='Path to games CSV or SQLite data')
+    parser.add_argument('--since', help='Only use games on or after this date')
+    parser.add_argument('--recency-bias', type=_floats, default=[0.02], help='Comma-separated values')
+    parser.add_argument('--post-trade-weight', type=_floats, default=[1.5], help='Comma-separated values')
+    parser.add_argument('--trade-date', default=None, help=f'Trade deadline date, e.g. {TRADE_DEADLINE}')
+    parser.add_argument('--k', type=_floats, default=[0.1], help='Comma-separated logistic scales')
+    parser.add_argument('--home-weight', type=_floats, default=[HOME_WEIGHT], help='Comma-separated values')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    grid = {
+        'recency_bias': args.recency_bias,
+        'trade_date': [args.trade_date],
+        'post_trade_weight': args.post_trade_weight,
+        'k': args.k,
+        'home_weight': args.home_weight,
+    }
+    results = backtest(load_games(args.data, since=args.since), grid)
+    if args.json:
+        print(json.dumps([{'params': p, 'metrics': m} for p, m in results], indent=2))
+        return
+    print(f"{'bias':>6} {'ptw':>5} {'k':>6} {'home_w':>6} {'games':>6} "
+          f"{'logloss':>8} {'brier':>7} {'acc':>6} {'mae':>6}")
+    for p, m in results:
+        print(
+            f"{p['recency_bias']:6.3f} {p['post_trade_weight']:5.2f} {p['k']:6.3f} "
+            f"{p['home_weight']:6.2f} {m['games']:6d} {m['log_loss']:8.4f} "
+            f"{m['brier']:7.4f} {m['accuracy']:6.1%} {m['score_mae']:6.2f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Load time of the CSVs vs their memory-mapped binary copies.
+
+Writes synthetic games and box-score CSVs (1M rows each by default),
+exports them with ``columnar.update_binary`` and times ``load_games`` /
+``load_player_stats`` against both. The binary load opens the ``.npy``
+files with ``mmap_mode='r'``, so its cost does not grow with the file.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import columnar
+from bench_streaming import write_games, write_stats
+from game_table import load_game_table
+from player_predictor import load_player_stats
+from player_table import load_player_table
+from predictor import load_games
+
+
+def best_of(func, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV vs memory-mapped loads")
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Rows per synthetic file')
+    parser.add_argument('--runs', type=int, default=3, help='Loads per case; the fastest counts')
+    parser.add_argument('--dir', help='Keep the synthetic files here instead of a temp dir')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.dir or tmp
+        os.makedirs(directory, exist_ok=True)
+        games_path = os.path.join(directory, f"games_{args.rows}.csv")
+        stats_path = os.path.join(directory, f"stats_{args.rows}.csv")
+        if not os.path.exists(games_path):
+            write_games(games_path, args.rows)
+        if not os.path.exists(stats_path):
+            write_stats(stats_path, args.rows)
+
+        print(f"{args.rows:,} rows per file")
+        print(f"{'case':<14} {'export s':>9} {'csv s':>8} {'mmap s':>8} {'speedup':>8}")
+        for name, path, load, parse in (
+            ("games", games_path, load_games, load_game_table),
+            ("box scores", stats_path, load_player_stats, load_player_table),
+        ):
+            start = time.perf_counter()
+            columnar.update_binary(path)
+            export = time.perf_counter() - start
+            csv_time = best_of(lambda: parse(path), args.runs)
+            mmap_time = best_of(lambda: load(path), args.runs)
+            print(f"{name:<14} {export:9.2f} {csv_time:8.3f} {mmap_time:8.4f} {csv_time / mmap_time:7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
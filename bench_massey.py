@@ -0,0 +1,64 @@
+"""Solve-time benchmark for massey.MasseySolver vs seasons and league size."""
+
+import argparse
+import time
+
+import numpy as np
+
+from game_table import GameTable
+from massey import MasseySolver
+
+GAMES_PER_TEAM = 82
+DAYS_PER_SEASON = 165
+
+
+def synthetic_table(n_teams: int, seasons: int, seed: int = 0) -> GameTable:
+    """Random games between ``n_teams`` teams with hidden true strengths."""
+    rng = np.random.default_rng(seed)
+    n_games = n_teams * GAMES_PER_TEAM // 2 * seasons
+    strength = rng.normal(0, 5, n_teams)
+    home = rng.integers(0, n_teams, n_games)
+    away = (home + rng.integers(1, n_teams, n_games)) % n_teams
+    margin = strength[home] - strength[away] + 2.5 + rng.normal(0, 12, n_games)
+    away_points = rng.integers(95, 120, n_games)
+    home_points = np.clip(away_points + np.rint(margin), 60, 180)
+    season = np.repeat(np.arange(seasons), n_games // seasons + 1)[:n_games]
+    day = 738000 + season * 365 + np.sort(rng.integers(0, DAYS_PER_SEASON, n_games))
+    order = np.argsort(day, kind="stable")
+    return GameTable(
+        [f"Team {i}" for i in range(n_teams)],
+        day[order], home[order], away[order], home_points[order], away_points[order],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the least-squares rating solver")
+    parser.add_argument('--teams', default='30,100,300', help='Comma-separated league sizes')
+    parser.add_argument('--seasons', default='1,5,10', help='Comma-separated numbers of seasons')
+    args = parser.parse_args()
+
+    print(f"{'teams':>6} {'seasons':>8} {'games':>8} {'cold s':>8} {'iters':>6} {'warm s':>8} {'iters':>6}")
+    for n_teams in map(int, args.teams.split(',')):
+        for seasons in map(int, args.seasons.split(',')):
+            table = synthetic_table(n_teams, seasons)
+            last_day = table.day.max()
+            history = table.select(table.day < last_day)
+            solver = MasseySolver()
+
+            start = time.perf_counter()
+            solver.fit(history)
+            cold = time.perf_counter() - start
+            cold_iters = solver.iterations
+
+            # The daily refit: one more night of games, warm-started.
+            start = time.perf_counter()
+            solver.fit(table)
+            warm = time.perf_counter() - start
+            print(
+                f"{n_teams:>6} {seasons:>8} {len(table):>8} {cold:8.4f} {cold_iters:>6} "
+                f"{warm:8.4f} {solver.iterations:>6}"
+            )
+
+
+if __name__ == '__main__':
+    main()
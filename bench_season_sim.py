@@ -0,0 +1,40 @@
+"""Throughput benchmark for season_sim: simulated seasons per second vs cores."""
+
+import argparse
+import os
+import random
+import time
+
+from season_sim import simulate_season
+from teams import ALL_TEAMS
+
+
+def synthetic_inputs(n_games: int = 1230, seed: int = 0):
+    """Return a random full-season schedule and ratings for all 30 teams."""
+    rng = random.Random(seed)
+    schedule = [tuple(rng.sample(ALL_TEAMS, 2)) for _ in range(n_games)]
+    ratings = {team: rng.gauss(0, 5) for team in ALL_TEAMS}
+    return schedule, ratings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark season_sim throughput")
+    parser.add_argument('--sims', type=int, default=100_000, help='Simulated seasons per run')
+    parser.add_argument('--games', type=int, default=1230, help='Remaining games in the schedule')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    schedule, ratings = synthetic_inputs(args.games)
+    workers = 1
+    print(f"{args.sims} seasons x {args.games} games")
+    print(f"{'workers':>8} {'seconds':>8} {'seasons/s':>11}")
+    while workers <= args.max_workers:
+        start = time.perf_counter()
+        simulate_season(schedule, ratings, n_sims=args.sims, seed=0, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>8} {elapsed:8.2f} {args.sims / elapsed:11,.0f}")
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Cold-start import benchmark for the command line entry points.
+
+Each module is imported in a fresh interpreter with ``-X importtime``. The
+script reports the cumulative import time, fails if a module pulls in one
+of the heavy libraries it should only load on demand, and fails if it goes
+over its time budget. The exit status is non-zero on any failure, so this
+can run as a CI step.
+"""
+
+import argparse
+import subprocess
+import sys
+
+# Heavy third-party modules that must stay out of these entry points'
+# import graph; they are imported inside the functions that need them.
+HEAVY = ('pandas', 'requests', 'tqdm', 'dateutil', 'streamlit', 'scipy')
+
+# Module -> import-time budget in milliseconds (generous, numpy alone is ~80).
+BUDGETS = {
+    'predictor': 250,
+    'player_predictor': 250,
+    'app': 300,
+    'backtest': 300,
+    'prediction_server': 300,
+    'update_games': 350,
+    'update_data': 350,
+}
+
+
+def import_profile(module: str):
+    """Return ``(cumulative_us, imported module names)`` for one cold import."""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, check=True,
+    )
+    total = 0
+    names = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        name = name.strip()
+        names.add(name)
+        if name == module:
+            total = int(cumulative)
+    return total, names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check entry-point import time and heavy imports")
+    parser.add_argument('modules', nargs='*', help='Modules to check (default: all budgeted)')
+    parser.add_argument('--runs', type=int, default=3, help='Imports per module; the fastest counts')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiply every budget, for slow machines')
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':<20} {'ms':>8} {'budget':>8}  heavy imports")
+    for module in args.modules or BUDGETS:
+        budget = BUDGETS.get(module, 250) * args.scale
+        profiles = [import_profile(module) for _ in range(args.runs)]
+        best = min(total for total, _ in profiles) / 1000
+        heavy = sorted({h for h in HEAVY for name in profiles[0][1] if name == h or name.startswith(h + '.')})
+        print(f"{module:<20} {best:8.1f} {budget:8.0f}  {', '.join(heavy) or '-'}")
+        if heavy:
+            failures.append(f"{module} imports {', '.join(heavy)} at startup")
+        if best > budget:
+            failures.append(f"{module} took {best:.1f} ms (budget {budget:.0f} ms)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
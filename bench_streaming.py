@@ -0,0 +1,119 @@
+"""Memory and throughput of whole-file vs streaming ingestion.
+
+Writes synthetic games and box-score CSVs (1M rows each by default) and
+compares loading the whole file before aggregating with streaming it in
+chunks through ``IncrementalRatings`` and ``PlayerAccumulator``. Peak
+memory is measured with ``tracemalloc``, which also sees NumPy buffers,
+and timing is taken in a separate untraced run.
+"""
+
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from game_table import CHUNK_ROWS
+from player_predictor import compute_averages, load_player_stats, stream_player_stats
+from predictor import compute_team_players, iter_game_chunks, load_games
+from rating_engine import compute_ratings_and_avgs, stream_ratings_and_avgs
+from teams import ALL_TEAMS
+
+
+def write_games(path: str, n: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    start = date(2000, 10, 1)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "date", "home_team", "away_team", "home_points", "away_points"])
+        for i in range(n):
+            home, away = rng.sample(ALL_TEAMS, 2)
+            day = start + timedelta(days=i * 9000 // n)
+            writer.writerow([i, day.isoformat(), home, away, rng.randint(85, 135), rng.randint(85, 135)])
+
+
+def write_stats(path: str, n: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    start = date(2000, 10, 1)
+    players = [f"Player {i}" for i in range(5000)]
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            "game_id", "player_id", "date", "player", "team",
+            "points", "rebounds", "assists", "steals", "fgm", "fga", "ftm", "fta",
+        ])
+        for i in range(n):
+            p = rng.randrange(len(players))
+            fga = rng.randint(0, 25)
+            fta = rng.randint(0, 12)
+            writer.writerow([
+                i // 20, p, (start + timedelta(days=i * 9000 // n)).isoformat(), players[p],
+                ALL_TEAMS[p % len(ALL_TEAMS)], rng.randint(0, 45), rng.randint(0, 15),
+                rng.randint(0, 12), rng.randint(0, 4), rng.randint(0, fga), fga,
+                rng.randint(0, fta), fta,
+            ])
+
+
+def whole_games(path, chunk_rows):
+    return compute_ratings_and_avgs(load_games(path))
+
+
+def streamed_games(path, chunk_rows):
+    return stream_ratings_and_avgs(iter_game_chunks(path, chunk_rows))
+
+
+def whole_stats(path, chunk_rows):
+    stats = load_player_stats(path)
+    return compute_averages(stats), compute_team_players(stats)
+
+
+def streamed_stats(path, chunk_rows):
+    players = stream_player_stats(path, chunk_rows)
+    return players.averages(), players.team_players()
+
+
+def measure(func, path, chunk_rows):
+    start = time.perf_counter()
+    func(path, chunk_rows)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func(path, chunk_rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming CSV ingestion")
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Rows per synthetic file')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--dir', help='Keep the synthetic files here instead of a temp dir')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.dir or tmp
+        os.makedirs(directory, exist_ok=True)
+        games_path = os.path.join(directory, f"games_{args.rows}.csv")
+        stats_path = os.path.join(directory, f"stats_{args.rows}.csv")
+        if not os.path.exists(games_path):
+            write_games(games_path, args.rows)
+        if not os.path.exists(stats_path):
+            write_stats(stats_path, args.rows)
+
+        print(f"{args.rows:,} rows per file, chunks of {args.chunk_rows:,}")
+        print(f"{'case':<22} {'seconds':>8} {'rows/s':>11} {'peak MiB':>9}")
+        for name, func, path in (
+            ("games, whole file", whole_games, games_path),
+            ("games, streamed", streamed_games, games_path),
+            ("box scores, whole file", whole_stats, stats_path),
+            ("box scores, streamed", streamed_stats, stats_path),
+        ):
+            elapsed, peak = measure(func, path, args.chunk_rows)
+            print(f"{name:<22} {elapsed:8.2f} {args.rows / elapsed:11,.0f} {peak / 2**20:9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+"""Fixed-width binary copies of the game and box-score CSVs.
+
+Next to ``data/nba_games.csv`` the updaters keep ``data/nba_games.cols/``,
+a directory with one ``.npy`` file per column plus ``strings.json`` (the
+team and player names that the integer columns index) and ``meta.json``
+(the CSV's size and mtime at export). Loaders open the ``.npy`` files with
+``mmap_mode='r'``: nothing is parsed or copied, and every process reading
+the same file shares one copy in the page cache.
+
+When the CSV has only been appended to since the last export, only the
+new bytes are parsed and added to the columns; any other change
+rebuilds the copy from scratch. A copy whose CSV changed since its export
+is stale and ignored, so loaders fall back to the CSV.
+"""
+
+import argparse
+import csv
+import json
+import os
+import shutil
+
+import numpy as np
+
+from game_table import GameTable, GameTableBuilder, _game_rows
+from player_table import PlayerStatTable, PlayerStatTableBuilder, iter_player_tables
+
+FORMAT_VERSION = 2  # 2: blank player names get their own id, not -1
+SUFFIX = ".cols"
+SIGNATURE_BYTES = 64  # bytes before the export offset that must be unchanged
+
+GAME_COLUMNS = ("day", "home", "away", "home_points", "away_points", "game_id")
+PLAYER_COLUMNS = ("player", "team", "day", "game_id", "stats")
+
+
+def binary_path(csv_path: str) -> str:
+    """Return the directory holding the binary copy of ``csv_path``."""
+    root, _ = os.path.splitext(csv_path)
+    return root + SUFFIX
+
+
+def _kind(csv_path: str) -> str | None:
+    with open(csv_path, newline="") as f:
+        header = next(csv.reader(f), [])
+    if "home_team" in header:
+        return "games"
+    if "player" in header:
+        return "player_stats"
+    return None
+
+
+def _signature(csv_path: str, size: int) -> str:
+    with open(csv_path, "rb") as f:
+        f.seek(max(0, size - SIGNATURE_BYTES))
+        return f.read(min(size, SIGNATURE_BYTES)).hex()
+
+
+def _read_meta(directory: str):
+    try:
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == FORMAT_VERSION else None
+
+
+def is_fresh(csv_path: str) -> bool:
+    """True if the binary copy exists and matches the CSV's current size and mtime."""
+    meta = _read_meta(binary_path(csv_path))
+    if meta is None or not os.path.exists(csv_path):
+        return False
+    st = os.stat(csv_path)
+    return meta["size"] == st.st_size and meta["mtime_ns"] == st.st_mtime_ns
+
+
+def _load_columns(directory: str, names, mmap_mode):
+    return {name: np.load(os.path.join(directory, name + ".npy"), mmap_mode=mmap_mode) for name in names}
+
+
+def _load_strings(directory: str) -> dict:
+    with open(os.path.join(directory, "strings.json")) as f:
+        return json.load(f)
+
+
+def _games_from(directory: str, mmap_mode) -> GameTable:
+    cols = _load_columns(directory, GAME_COLUMNS, mmap_mode)
+    return GameTable(_load_strings(directory)["teams"], *(cols[name] for name in GAME_COLUMNS))
+
+
+def _players_from(directory: str, mmap_mode) -> PlayerStatTable:
+    cols = _load_columns(directory, PLAYER_COLUMNS, mmap_mode)
+    strings = _load_strings(directory)
+    return PlayerStatTable(
+        strings["players"], cols["player"], cols["stats"], strings["teams"],
+        cols["team"], cols["day"], cols["game_id"],
+    )
+
+
+def _load_binary(csv_path: str, load, mmap_mode):
+    if not is_fresh(csv_path):
+        return None
+    try:
+        return load(binary_path(csv_path), mmap_mode)
+    except (OSError, ValueError, KeyError):
+        # An export swapped the directory out between the check and the
+        # load; the caller parses the CSV instead.
+        return None
+
+
+def load_game_binary(csv_path: str, mmap_mode: str | None = "r") -> GameTable | None:
+    """Return the memory-mapped games for ``csv_path``, or ``None`` if not fresh."""
+    return _load_binary(csv_path, _games_from, mmap_mode)
+
+
+def load_player_binary(csv_path: str, mmap_mode: str | None = "r") -> PlayerStatTable | None:
+    """Return the memory-mapped box scores for ``csv_path``, or ``None`` if not fresh."""
+    return _load_binary(csv_path, _players_from, mmap_mode)
+
+
+def _parse_games(csv_path: str, offset: int, previous: GameTable | None) -> GameTable:
+    builder = GameTableBuilder()
+    if previous is not None:
+        builder.teams = list(previous.teams)
+        builder.team_index = dict(previous.team_index)
+    for row in _game_rows(csv_path, offset):
+        builder.add(*row)
+    new = builder.build()
+    if previous is None:
+        return new
+    return GameTable(new.teams, *(
+        np.concatenate((getattr(previous, name), getattr(new, name))) for name in GAME_COLUMNS
+    ))
+
+
+def _parse_players(csv_path: str, offset: int, previous: PlayerStatTable | None) -> PlayerStatTable:
+    builder = PlayerStatTableBuilder()
+    parts = []
+    if previous is not None:
+        builder.players, builder.player_index = list(previous.players), dict(previous.player_index)
+        builder.teams, builder.team_index = list(previous.teams), dict(previous.team_index)
+        parts.append(previous)
+    parts.extend(iter_player_tables(csv_path, offset=offset, builder=builder))
+    if not parts:
+        return builder.build()
+    return PlayerStatTable(
+        builder.players,
+        np.concatenate([p.player for p in parts]),
+        np.concatenate([p.stats for p in parts]),
+        builder.teams,
+        np.concatenate([p.team for p in parts]),
+        np.concatenate([p.day for p in parts]),
+        np.concatenate([p.game_id for p in parts]),
+    )
+
+
+def _write(directory: str, kind: str, table, st, signature: str) -> None:
+    """Write a complete copy beside ``directory`` and swap it into place."""
+    tmp = f"{directory}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    if kind == "games":
+        names, strings = GAME_COLUMNS, {"teams": table.teams}
+    else:
+        names, strings = PLAYER_COLUMNS, {"players": table.players, "teams": table.teams}
+    for name in names:
+        np.save(os.path.join(tmp, name + ".npy"), np.ascontiguousarray(getattr(table, name)))
+    with open(os.path.join(tmp, "strings.json"), "w") as f:
+        json.dump(strings, f)
+    meta = {
+        "version": FORMAT_VERSION,
+        "kind": kind,
+        "rows": len(table),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "signature": signature,
+    }
+    with open(os.path.join(tmp, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+    # Readers that already mapped the old files keep them until they close.
+    old = f"{directory}.{os.getpid()}.old"
+    if os.path.exists(directory):
+        os.rename(directory, old)
+    os.rename(tmp, directory)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+def update_binary(csv_path: str, attempts: int = 3) -> bool:
+    """Bring the binary copy of ``csv_path`` up to date; returns True if it was written.
+
+    The readers parse to EOF, so a row appended mid-export would be in the
+    copy but not counted in its recorded size, and the next incremental
+    export would add it again. The CSV is therefore stat'ed again after
+    parsing, and the export is redone if it changed; after ``attempts``
+    tries the copy is left stale and the loaders keep using the CSV.
+    """
+    if not os.path.exists(csv_path) or is_fresh(csv_path):
+        return False
+    kind = _kind(csv_path)
+    if kind is None:
+        return False
+    directory = binary_path(csv_path)
+    parse = _parse_games if kind == "games" else _parse_players
+    for _ in range(attempts):
+        st = os.stat(csv_path)
+        meta = _read_meta(directory)
+        offset, previous = 0, None
+        if (
+            meta is not None
+            and meta.get("kind") == kind
+            and st.st_size > meta["size"]
+            and _signature(csv_path, meta["size"]) == meta["signature"]
+        ):
+            # Appended to since the last export: parse only the new rows. The
+            # old columns are read into memory because the directory is replaced.
+            offset = meta["size"]
+            previous = (_games_from if kind == "games" else _players_from)(directory, None)
+
+        table = parse(csv_path, offset, previous)
+        after = os.stat(csv_path)
+        if (after.st_size, after.st_mtime_ns) == (st.st_size, st.st_mtime_ns):
+            _write(directory, kind, table, st, _signature(csv_path, st.st_size))
+            return True
+    return False
+
+
+def refresh(*csv_paths: str) -> None:
+    """Update the binary copies after a write, warning instead of raising.
+
+    A failed export only costs speed: the stale copy is ignored and the
+    loaders parse the CSV.
+    """
+    for path in csv_paths:
+        try:
+            update_binary(path)
+        except Exception as exc:
+            print(f"⚠️ Could not update {binary_path(path)}: {exc}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export CSVs to the memory-mapped binary format")
+    parser.add_argument('paths', nargs='+', help='Games or player stats CSV files')
+    args = parser.parse_args()
+    for path in args.paths:
+        if update_binary(path):
+            print(f"✅ Wrote {binary_path(path)}")
+        else:
+            print(f"{binary_path(path)} is up to date")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""Online Elo rating engine with per-date rating history.
+
+Games are processed in date order and each one changes exactly two
+ratings, so folding in a night of games costs O(games that night). After
+every game the two teams' new ratings are appended to their history
+(one entry per team per day), which lets ``rating_on`` answer "what was
+this team rated on date X" with a binary search instead of a replay.
+
+The state is pickled to ``data/.cache/elo.pkl``; ``refresh`` folds newly
+downloaded games into it and only replays the full history when a game
+older than the newest processed one shows up.
+"""
+
+import math
+import os
+import pickle
+from array import array
+from bisect import bisect_right
+
+import numpy as np
+
+from game_table import as_game_table, day_number, day_string, load_game_table
+from predictor import predict_with_reasoning
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 20.0
+HOME_ADVANTAGE = 100.0  # Elo points added to the home team's rating
+# Logistic scale that turns an Elo difference into the standard
+# 1 / (1 + 10 ** (-diff / 400)) win probability in predict_with_reasoning.
+ELO_K = math.log(10) / 400
+ELO_FILE = os.path.join("data", ".cache", "elo.pkl")
+
+
+def _margin_multiplier(margin: int, winner_diff: float) -> float:
+    """Scale updates by margin of victory, damped for expected blowouts."""
+    return math.log(abs(margin) + 1) * 2.2 / (winner_diff * 0.001 + 2.2)
+
+
+class EloRatings:
+    """Elo ratings updated one game at a time, with a per-team history."""
+
+    def __init__(
+        self,
+        k_factor: float = K_FACTOR,
+        home_advantage: float = HOME_ADVANTAGE,
+        initial: float = INITIAL_RATING,
+    ):
+        self.k_factor = k_factor
+        self.home_advantage = home_advantage
+        self.initial = initial
+        self.ratings = {}
+        self._history = {}  # team -> (array of days, array of ratings)
+        self.last_day = 0
+        self.n_games = 0
+
+    @classmethod
+    def from_games(cls, games, **kwargs) -> "EloRatings":
+        elo = cls(**kwargs)
+        elo.update(games)
+        return elo
+
+    def __len__(self):
+        return self.n_games
+
+    def _record(self, team: str, day: int, rating: float) -> None:
+        self.ratings[team] = rating
+        days, values = self._history.setdefault(team, (array('i'), array('d')))
+        if days and days[-1] == day:
+            values[-1] = rating
+        else:
+            days.append(day)
+            values.append(rating)
+
+    def update(self, games) -> int:
+        """Fold new games (``GameTable`` or dicts) in; returns how many were used.
+
+        Games must not be older than the newest game already processed;
+        ``refresh`` handles that case by replaying. Unplayed rows (scores
+        missing, ``None`` or 0-0) and ties are skipped.
+        """
+        table = as_game_table(games)
+        if not len(table):
+            return 0
+        order = np.argsort(table.day, kind='stable')
+        if int(table.day[order[0]]) < self.last_day:
+            raise ValueError(
+                f"game on {day_string(table.day[order[0]])} is older than "
+                f"the last processed day {day_string(self.last_day)}"
+            )
+        rating = self.ratings
+        used = 0
+        for i in order.tolist():
+            hp, ap = int(table.home_points[i]), int(table.away_points[i])
+            if hp == ap:
+                continue
+            home, away = table.teams[table.home[i]], table.teams[table.away[i]]
+            day = int(table.day[i])
+            rh = rating.get(home, self.initial)
+            ra = rating.get(away, self.initial)
+            diff = rh + self.home_advantage - ra
+            expected = 1 / (1 + 10 ** (-diff / 400))
+            won = 1.0 if hp > ap else 0.0
+            winner_diff = diff if hp > ap else -diff
+            change = self.k_factor * _margin_multiplier(hp - ap, winner_diff) * (won - expected)
+            self._record(home, day, rh + change)
+            self._record(away, day, ra - change)
+            self.last_day = max(self.last_day, day)
+            used += 1
+        self.n_games += used
+        return used
+
+    def rating_on(self, team: str, date: str) -> float:
+        """Return ``team``'s rating after all games on or before ``date``."""
+        days, values = self._history.get(team, ((), ()))
+        i = bisect_right(days, day_number(date))
+        return values[i - 1] if i else self.initial
+
+    def ratings_on(self, date: str) -> dict:
+        """Return every known team's rating as of ``date``."""
+        return {team: self.rating_on(team, date) for team in self._history}
+
+    def history(self, team: str):
+        """Return ``(dates, ratings)`` lists for one team, oldest first."""
+        days, values = self._history.get(team, ((), ()))
+        return [day_string(d) for d in days], list(values)
+
+    def centered(self, date: str | None = None) -> dict:
+        """Ratings relative to ``initial``, current or as of ``date``."""
+        ratings = self.ratings if date is None else self.ratings_on(date)
+        return {team: r - self.initial for team, r in ratings.items()}
+
+    def predict(self, home_team: str, away_team: str, date: str | None = None):
+        """Return ``(prob_home, reasoning)`` through ``predict_with_reasoning``.
+
+        The home advantage is added to the home rating and ``home_weight``
+        is 1, so the probability is the usual Elo expectation.
+        """
+        ratings = self.centered(date)
+        pair = {
+            home_team: ratings.get(home_team, 0.0) + self.home_advantage,
+            away_team: ratings.get(away_team, 0.0),
+        }
+        return predict_with_reasoning(home_team, away_team, pair, k=ELO_K, home_weight=1.0)
+
+    def save(self, path: str = ELO_FILE) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def load(path: str = ELO_FILE) -> "EloRatings | None":
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+            return None
+
+
+def refresh(games_path: str, new_games=None, path: str = ELO_FILE) -> EloRatings:
+    """Bring the saved Elo state up to date and return it.
+
+    With a saved state and ``new_games`` (for example the rows returned by
+    ``update_data.update_nba_data``) only those games are processed. The
+    full history in ``games_path`` is replayed when there is no saved
+    state or a new game predates what was already processed.
+    """
+    elo = EloRatings.load(path)
+    try:
+        if elo is None:
+            raise ValueError("no saved Elo state")
+        if new_games:
+            elo.update(new_games)
+    except ValueError:
+        elo = EloRatings.from_games(load_game_table(games_path))
+    elo.save(path)
+    return elo
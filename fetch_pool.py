@@ -0,0 +1,130 @@
+"""Concurrent API fetching behind a shared token-bucket rate limit."""
+
+import email.utils
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from http_client import get_session
+
+# balldontlie's published limit for the ALL-STAR tier; the free tier is 5.
+REQUESTS_PER_MINUTE = 60
+DEFAULT_CONCURRENCY = 4
+MAX_RETRIES = 5
+BACKOFF_SECONDS = 1.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every worker.
+
+    ``acquire`` blocks until a token is available. ``pause`` empties the
+    bucket and blocks everyone for a while, which is how a 429 from one
+    worker slows down all of them.
+    """
+
+    def __init__(self, rate_per_minute: float = REQUESTS_PER_MINUTE, burst: float = 1.0,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst
+        self.tokens = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self._clock()
+                if now >= self._updated:
+                    self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+                else:
+                    wait = self._updated - now
+            self._sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self.tokens = 0.0
+            self._updated = max(self._updated, self._clock() + seconds)
+
+
+def retry_after_seconds(value: str | None) -> float | None:
+    """Parse a ``Retry-After`` header given as seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class RateLimitedFetcher:
+    """GET JSON through a shared limiter, retrying 429s and 5xx errors.
+
+    A 429 honours ``Retry-After`` when the server sends it and otherwise
+    backs off exponentially with jitter.
+    """
+
+    def __init__(self, limiter: TokenBucket | None = None, session=None, headers=None,
+                 max_retries: int = MAX_RETRIES, backoff: float = BACKOFF_SECONDS):
+        self.limiter = limiter or TokenBucket()
+        self.session = session or get_session()
+        self.headers = headers or {}
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.retries = 0
+
+    def get_json(self, url: str, params: dict) -> dict:
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            resp = self.session.get(url, params=params, headers=self.headers, timeout=30)
+            retryable = resp.status_code == 429 or resp.status_code >= 500
+            if not retryable or attempt == self.max_retries:
+                resp.raise_for_status()
+                return resp.json()
+            self.retries += 1
+            delay = retry_after_seconds(resp.headers.get("Retry-After"))
+            if delay is None:
+                delay = self.backoff * 2 ** attempt + random.uniform(0, self.backoff)
+            self.limiter.pause(delay)
+            attempt += 1
+
+    def get_cursor_pages(self, url: str, params: dict) -> list:
+        """Return ``data`` from every page, following ``meta.next_cursor``."""
+        rows = []
+        params = dict(params)
+        while True:
+            data = self.get_json(url, params)
+            rows.extend(data.get("data", []))
+            cursor = data.get("meta", {}).get("next_cursor")
+            if not cursor:
+                return rows
+            params["cursor"] = cursor
+
+
+def map_concurrent(func, items, max_workers: int = DEFAULT_CONCURRENCY):
+    """Yield ``(item, result, error)`` for each item, in input order.
+
+    At most ``max_workers`` calls are in flight at once. The rate limit
+    itself lives in the shared ``TokenBucket``.
+    """
+    def call(item):
+        try:
+            return item, func(item), None
+        except Exception as exc:  # reported per item, like the serial loop did
+            return item, None, exc
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        yield from pool.map(call, items)
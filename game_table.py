@@ -0,0 +1,243 @@
+"""Columnar, NumPy-backed storage for game results."""
+
+import csv
+from array import array
+from datetime import date
+
+import numpy as np
+
+CHUNK_ROWS = 16384  # rows per chunk for the streaming readers
+
+
+def day_number(value: str) -> int:
+    """Return the proleptic ordinal for an ISO ``YYYY-MM-DD`` date string."""
+    return date.fromisoformat(value[:10]).toordinal()
+
+
+def day_string(day: int) -> str:
+    """Return the ISO date string for an ordinal day number."""
+    return date.fromordinal(int(day)).isoformat()
+
+
+class GameTable:
+    """Games stored as packed parallel arrays.
+
+    Team names are interned to small integer ids (``teams[id]`` gives the
+    name back), dates are ordinal day numbers and points are ``int16``.
+    Iterating or indexing the table yields the same dicts ``load_games``
+    used to return, so existing callers keep working.
+    """
+
+    def __init__(self, teams, day, home, away, home_points, away_points, game_id=None):
+        self.teams = list(teams)
+        self.team_index = {name: i for i, name in enumerate(self.teams)}
+        self.day = np.asarray(day, dtype=np.int32)
+        self.home = np.asarray(home, dtype=np.int16)
+        self.away = np.asarray(away, dtype=np.int16)
+        self.home_points = np.asarray(home_points, dtype=np.int16)
+        self.away_points = np.asarray(away_points, dtype=np.int16)
+        if game_id is None:
+            game_id = np.full(len(self.day), -1, dtype=np.int64)
+        self.game_id = np.asarray(game_id, dtype=np.int64)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a table from an iterable of game dicts.
+
+        Rows without both scores (scheduled games) are skipped, as
+        ``_game_rows`` skips them in a CSV.
+        """
+        builder = GameTableBuilder()
+        for row in rows:
+            if row.get("home_points") in (None, "") or row.get("away_points") in (None, ""):
+                continue
+            builder.add(
+                row["date"],
+                row["home_team"],
+                row["away_team"],
+                int(row["home_points"]),
+                int(row["away_points"]),
+                int(row.get("id") or -1),
+            )
+        return builder.build()
+
+    def __len__(self):
+        return len(self.day)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.row(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("game index out of range")
+        return self.row(i)
+
+    def row(self, i: int) -> dict:
+        """Return game ``i`` as a dict in the original ``load_games`` format."""
+        return {
+            "date": day_string(self.day[i]),
+            "home_team": self.teams[self.home[i]],
+            "away_team": self.teams[self.away[i]],
+            "home_points": int(self.home_points[i]),
+            "away_points": int(self.away_points[i]),
+        }
+
+    def select(self, mask) -> "GameTable":
+        """Return the games where ``mask`` is true, sharing the team names."""
+        return GameTable(
+            self.teams,
+            self.day[mask],
+            self.home[mask],
+            self.away[mask],
+            self.home_points[mask],
+            self.away_points[mask],
+            self.game_id[mask],
+        )
+
+    def team_id(self, name: str) -> int:
+        """Return the interned id for ``name`` or -1 if the team is unknown."""
+        return self.team_index.get(name, -1)
+
+
+class GameTableBuilder:
+    """Accumulate games into packed arrays before building a ``GameTable``."""
+
+    def __init__(self):
+        self.teams = []
+        self.team_index = {}
+        self._days = {}
+        self.day = array("i")
+        self.home = array("h")
+        self.away = array("h")
+        self.home_points = array("h")
+        self.away_points = array("h")
+        self.game_id = array("q")
+
+    def _intern(self, name: str) -> int:
+        tid = self.team_index.get(name)
+        if tid is None:
+            tid = len(self.teams)
+            self.team_index[name] = tid
+            self.teams.append(name)
+        return tid
+
+    def add(self, date_str, home_team, away_team, home_points, away_points, game_id=-1):
+        day = self._days.get(date_str)
+        if day is None:
+            day = self._days[date_str] = day_number(date_str)
+        self.day.append(day)
+        self.home.append(self._intern(home_team))
+        self.away.append(self._intern(away_team))
+        self.home_points.append(home_points)
+        self.away_points.append(away_points)
+        self.game_id.append(game_id)
+
+    def fresh(self) -> "GameTableBuilder":
+        """Return an empty builder that keeps this one's team ids."""
+        builder = GameTableBuilder()
+        builder.teams = self.teams
+        builder.team_index = self.team_index
+        builder._days = self._days
+        return builder
+
+    def build(self) -> GameTable:
+        return GameTable(
+            self.teams,
+            np.frombuffer(self.day, dtype=np.int32) if self.day else [],
+            np.frombuffer(self.home, dtype=np.int16) if self.home else [],
+            np.frombuffer(self.away, dtype=np.int16) if self.away else [],
+            np.frombuffer(self.home_points, dtype=np.int16) if self.home_points else [],
+            np.frombuffer(self.away_points, dtype=np.int16) if self.away_points else [],
+            np.frombuffer(self.game_id, dtype=np.int64) if self.game_id else None,
+        )
+
+
+def _game_rows(path, offset: int = 0):
+    """Yield ``(date, home, away, home_points, away_points, game_id)`` per played game.
+
+    Rows without both scores are skipped silently (unplayed games); rows
+    whose scores or date fail to parse are reported and skipped. A
+    non-zero ``offset`` starts reading at that byte, after the header.
+    """
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        if offset:
+            f.seek(offset)
+        col = {name: i for i, name in enumerate(header)}
+        i_date = col["date"]
+        i_home = col["home_team"]
+        i_away = col["away_team"]
+        i_hp = col["home_points"]
+        i_ap = col["away_points"]
+        i_id = col.get("id")
+        dates = set()  # date strings already checked to parse
+        for row in reader:
+            if len(row) < len(header):
+                continue
+            hp, ap = row[i_hp], row[i_ap]
+            if not hp or not ap:
+                continue
+            try:
+                gid = int(row[i_id]) if i_id is not None and row[i_id] else -1
+                if row[i_date] not in dates:
+                    day_number(row[i_date])
+                    dates.add(row[i_date])
+                yield row[i_date], row[i_home], row[i_away], int(hp), int(ap), gid
+            except ValueError:
+                print(f"⚠️ Skipping bad row: {dict(zip(header, row))}")
+
+
+def load_game_table(path) -> GameTable:
+    """Load a games CSV straight into a ``GameTable``."""
+    builder = GameTableBuilder()
+    for row in _game_rows(path):
+        builder.add(*row)
+    return builder.build()
+
+
+def iter_game_tables(path, chunk_rows: int = CHUNK_ROWS):
+    """Yield a games CSV as ``GameTable`` chunks of at most ``chunk_rows`` games.
+
+    Only one chunk is held at a time, so memory stays flat however long the
+    file is. Chunks share team ids: a team keeps the id it got in the
+    first chunk it appeared in.
+    """
+    builder = GameTableBuilder()
+    for row in _game_rows(path):
+        builder.add(*row)
+        if len(builder.day) >= chunk_rows:
+            yield builder.build()
+            builder = builder.fresh()
+    if len(builder.day):
+        yield builder.build()
+
+
+def filter_games(table: GameTable, team: str | None = None, since: str | None = None,
+                 until: str | None = None) -> GameTable:
+    """Return the games involving ``team`` between ``since`` and ``until`` inclusive."""
+    if not (team or since or until):
+        return table
+    mask = np.ones(len(table), dtype=bool)
+    if team:
+        tid = table.team_id(team)
+        mask &= (table.home == tid) | (table.away == tid)
+    if since:
+        mask &= table.day >= day_number(since)
+    if until:
+        mask &= table.day <= day_number(until)
+    return table.select(mask)
+
+
+def as_game_table(games) -> GameTable:
+    """Return ``games`` as a ``GameTable``, converting a list of dicts if needed."""
+    if isinstance(games, GameTable):
+        return games
+    return GameTable.from_rows(games)
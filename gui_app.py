@@ -1,63 +1,33 @@
+import argparse
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
-from predictor import (
-    load_games,
-    compute_team_ratings,
-    compute_team_point_avgs,
-
-    compute_team_players,
-=======
-
-    predict_with_reasoning,
-    predict_final_score,
-)
-from player_predictor import load_player_stats, compute_averages, predict_player
+from model_refresh import ModelRefresher
+from model_snapshot import load_model
+from predictor import predict_with_reasoning, predict_final_score
+from player_predictor import predict_player
 from teams import ALL_TEAMS
+from tuning import PARAMS_FILE
 
 GAMES_PATH = 'data/sample_games.csv'
 STATS_PATH = 'data/sample_player_stats.csv'
+POLL_MS = 200  # how often the UI checks the refresher for a new model
 
 
-def load_data():
-    games = load_games(GAMES_PATH)
-    player_stats = load_player_stats(STATS_PATH)
-    player_set = {s['player'] for s in player_stats}
-
-    ratings = compute_team_ratings(games, trade_date=None)
-    team_avgs = compute_team_point_avgs(games, trade_date=None)
-    team_players = compute_team_players(player_stats)
-    player_avgs = compute_averages(player_stats)
-    return (
-        sorted(ALL_TEAMS),
-        sorted(player_set),
-        ratings,
-        team_avgs,
-        team_players,
-        player_avgs,
-    )
-=======
-    ratings = compute_team_ratings(games)
-    team_avgs = compute_team_point_avgs(games)
-    player_avgs = compute_averages(player_stats)
-    return sorted(ALL_TEAMS), sorted(player_set), ratings, team_avgs, player_avgs
-
+def load_data(games_path=GAMES_PATH, stats_path=STATS_PATH):
+    return load_model(games_path, stats_path)
 
 
 class BettingApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, games_path=GAMES_PATH, stats_path=STATS_PATH):
         super().__init__()
         self.title('NBA Betting Helper')
 
-        teams, players, ratings, team_avgs, team_players, player_avgs = load_data()
-        self.ratings = ratings
-        self.team_avgs = team_avgs
-        self.team_players = team_players
-=======
-        teams, players, ratings, team_avgs, player_avgs = load_data()
-        self.ratings = ratings
-        self.team_avgs = team_avgs
-
-        self.player_avgs = player_avgs
+        # The window is drawn first; the model is built and rebuilt on a
+        # worker thread and picked up by _poll, so the UI never blocks on it.
+        teams = sorted(ALL_TEAMS)
+        self.model = None
+        self.generation = 0
 
         self.notebook = ttk.Notebook(self)
         self.game_frame = ttk.Frame(self.notebook)
@@ -82,42 +52,90 @@ class BettingApp(tk.Tk):
 
         # Player stats UI
         ttk.Label(self.player_frame, text='Player:').grid(column=0, row=0, padx=5, pady=5)
-        self.player_var = tk.StringVar(value=players[0])
-        ttk.Combobox(self.player_frame, textvariable=self.player_var, values=players).grid(column=1, row=0, padx=5, pady=5)
+        self.player_var = tk.StringVar(value='')
+        self.player_box = ttk.Combobox(self.player_frame, textvariable=self.player_var, values=[])
+        self.player_box.grid(column=1, row=0, padx=5, pady=5)
 
         ttk.Button(self.player_frame, text='Show Stats', command=self.predict_player_stats).grid(column=0, row=1, columnspan=2, pady=10)
 
         self.stats_text = tk.Text(self.player_frame, width=40, height=6, state='disabled')
         self.stats_text.grid(column=0, row=2, columnspan=2, pady=5)
 
+        status_bar = ttk.Frame(self)
+        status_bar.pack(fill='x', padx=5, pady=2)
+        self.status = ttk.Label(status_bar, text='Loading data...')
+        self.status.pack(side='left')
+        self.progress = ttk.Progressbar(status_bar, mode='indeterminate', length=120)
+        self.progress.pack(side='right')
+        self.progress.start()
+
+        self.refresher = ModelRefresher(
+            [games_path, stats_path, PARAMS_FILE], lambda: load_data(games_path, stats_path)
+        ).start()
+        self.protocol('WM_DELETE_WINDOW', self.close)
+        self.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        refresher = self.refresher
+        if refresher.generation != self.generation:
+            self.generation = refresher.generation
+            self.use_model(refresher.model)
+        if refresher.building:
+            self.status.config(text='Loading data...' if self.model is None else 'Refreshing data...')
+            self.progress.start()
+        else:
+            self.progress.stop()
+            if refresher.error is not None:
+                self.status.config(text=f'Data load failed: {refresher.error}')
+            elif self.model is not None:
+                self.status.config(text=time.strftime('Data loaded %H:%M:%S', time.localtime(refresher.loaded_at)))
+        self.after(POLL_MS, self._poll)
+
+    def use_model(self, model):
+        players = model.players
+        self.player_box.config(values=players)
+        if players and self.player_var.get() not in model.player_avgs:
+            self.player_var.set(players[0])
+        self.model = model
+
+    def close(self):
+        self.refresher.stop(timeout=0)
+        self.destroy()
+
+    def _ready(self):
+        if self.model is None:
+            messagebox.showinfo('Loading', 'Data is still loading, try again in a moment')
+        return self.model is not None
+
     def predict_game(self):
         home = self.home_var.get()
         away = self.away_var.get()
         if home == away:
             messagebox.showerror('Error', 'Teams must be different')
             return
-        prob, reason = predict_with_reasoning(home, away, self.ratings)
-        home_score, away_score = predict_final_score(home, away, self.team_avgs)
+        if not self._ready():
+            return
+        model = self.model
+        prob, reason = predict_with_reasoning(
+            home, away, model.ratings, k=model.k, home_weight=model.home_weight
+        )
+        home_score, away_score = predict_final_score(home, away, model.team_avgs)
 
-        home_players = ", ".join(self.team_players.get(home, []))
-        away_players = ", ".join(self.team_players.get(away, []))
+        home_players = ", ".join(model.roster.team_players(home))
+        away_players = ", ".join(model.roster.team_players(away))
         self.game_result.config(
             text=(
                 f"{reason}\nProbability {home} beats {away}: {prob:.3f}\n"
                 f"Predicted score: {home} {home_score} - {away} {away_score}\n"
                 f"Players {home}: {home_players}\nPlayers {away}: {away_players}"
-=======
-        self.game_result.config(
-            text=(
-                f"{reason}\nProbability {home} beats {away}: {prob:.3f}\n"
-                f"Predicted score: {home} {home_score} - {away} {away_score}"
-
             )
         )
 
     def predict_player_stats(self):
+        if not self._ready():
+            return
         player = self.player_var.get()
-        stats = predict_player(player, self.player_avgs)
+        stats = predict_player(player, self.model.player_avgs)
         if not stats:
             messagebox.showerror('Error', f'No data for {player}')
             return
@@ -136,7 +154,13 @@ class BettingApp(tk.Tk):
 
 
 def main():
-    app = BettingApp()
+    parser = argparse.ArgumentParser(description='NBA Betting Helper')
+    parser.add_argument('--data', default=GAMES_PATH,
+                        help='Games CSV to load and watch (update_data.py writes data/nba_games.csv)')
+    parser.add_argument('--stats', default=STATS_PATH,
+                        help='Player stats CSV to load and watch (update_data.py writes data/player_stats.csv)')
+    args = parser.parse_args()
+    app = BettingApp(args.data, args.stats)
     app.mainloop()
 
 
@@ -0,0 +1,117 @@
+"""Shared HTTP client: pooled keep-alive connections plus an on-disk cache.
+
+Responses that carry an ``ETag`` or ``Last-Modified`` header are stored
+under ``data/.cache/http``. The next request for the same URL sends
+``If-None-Match`` / ``If-Modified-Since``, and a ``304 Not Modified`` is
+answered from disk, so re-reading a finished season costs headers only.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import TYPE_CHECKING
+from urllib.parse import urlencode
+
+if TYPE_CHECKING:
+    import requests
+
+CACHE_DIR = os.path.join("data", ".cache", "http")
+POOL_SIZE = 16
+
+
+class CachedSession:
+    """A ``requests.Session`` wrapper with connection pooling and revalidation."""
+
+    def __init__(self, cache_dir: str = CACHE_DIR, pool_size: int = POOL_SIZE):
+        # requests is imported on first use so tools that never hit the
+        # network do not pay for it at startup.
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.cache_dir = cache_dir
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.bytes_downloaded = 0
+        self._lock = threading.Lock()
+
+    def _paths(self, url: str, params) -> tuple[str, str]:
+        query = urlencode(sorted((params or {}).items()), doseq=True)
+        key = hashlib.sha256(f"{url}?{query}".encode()).hexdigest()
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return base + ".json", base + ".body"
+
+    def _store(self, meta_path: str, body_path: str, meta: dict, body: bytes) -> None:
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(body_path + suffix, "wb") as f:
+            f.write(body)
+        os.replace(body_path + suffix, body_path)
+        with open(meta_path + suffix, "w") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + suffix, meta_path)
+
+    def get(self, url: str, params=None, headers=None, timeout: float = 30) -> "requests.Response":
+        """GET ``url``, revalidating against the disk cache when possible.
+
+        A 304 is turned back into a 200 carrying the cached body, so callers
+        never see the difference.
+        """
+        meta_path, body_path = self._paths(url, params)
+        meta = None
+        if os.path.exists(meta_path) and os.path.exists(body_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+        request_headers = dict(headers or {})
+        if meta:
+            if meta.get("etag"):
+                request_headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request_headers["If-Modified-Since"] = meta["last_modified"]
+
+        resp = self.session.get(url, params=params, headers=request_headers, timeout=timeout)
+
+        if resp.status_code == 304 and meta:
+            with open(body_path, "rb") as f:
+                body = f.read()
+            resp._content = body
+            resp.status_code = 200
+            with self._lock:
+                self.hits += 1
+                self.bytes_saved += len(body)
+            return resp
+
+        with self._lock:
+            self.misses += 1
+            self.bytes_downloaded += len(resp.content)
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if resp.status_code == 200 and (etag or last_modified):
+            self._store(meta_path, body_path, {"etag": etag, "last_modified": last_modified}, resp.content)
+        return resp
+
+    def report(self) -> str:
+        return (
+            f"HTTP cache: {self.hits} hits, {self.misses} misses, "
+            f"{self.bytes_saved / 1024:.1f} KiB saved, "
+            f"{self.bytes_downloaded / 1024:.1f} KiB downloaded"
+        )
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_session() -> CachedSession:
+    """Return the process-wide ``CachedSession``, creating it on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = CachedSession()
+        return _shared
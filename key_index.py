@@ -0,0 +1,89 @@
+"""Persistent SQLite index of the keys already written to the updater CSVs."""
+
+import csv
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Tuple
+
+INDEX_FILE = os.path.join("data", "keys.sqlite")
+
+
+class KeyIndex:
+    """Game ids and ``(game_id, player_id)`` keys backed by SQLite.
+
+    The index records each CSV's size after every write it sees. When a
+    CSV's size no longer matches (first run, a crash between the CSV write
+    and the index commit, or a hand edit) that table is rebuilt from the
+    CSV once; otherwise lookups never touch the CSVs.
+    """
+
+    def __init__(self, game_path: str, stat_path: str, index_path: str = INDEX_FILE):
+        self.game_path = game_path
+        self.stat_path = stat_path
+        os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(index_path)
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS game_keys (game_id INTEGER PRIMARY KEY)")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS stat_keys ("
+                "game_id INTEGER, player_id INTEGER, PRIMARY KEY (game_id, player_id)"
+                ") WITHOUT ROWID"
+            )
+            self.conn.execute("CREATE TABLE IF NOT EXISTS sources (path TEXT PRIMARY KEY, size INTEGER)")
+        self.sync()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _recorded_size(self, path: str):
+        row = self.conn.execute(
+            "SELECT size FROM sources WHERE path = ?", (os.path.abspath(path),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _record_size(self, path: str) -> None:
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sources (path, size) VALUES (?, ?)", (os.path.abspath(path), size)
+        )
+
+    def sync(self) -> None:
+        """Rebuild any table whose CSV changed behind the index's back."""
+        for path, table in ((self.game_path, "game_keys"), (self.stat_path, "stat_keys")):
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            if self._recorded_size(path) == size:
+                continue
+            with self.conn:
+                self.conn.execute(f"DELETE FROM {table}")
+                if os.path.exists(path):
+                    with open(path, newline="") as f:
+                        self._insert(path, csv.DictReader(f))
+                self._record_size(path)
+
+    def _insert(self, path: str, rows: Iterable[Dict]) -> None:
+        if os.path.abspath(path) == os.path.abspath(self.game_path):
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO game_keys (game_id) VALUES (?)",
+                ((int(r["id"]),) for r in rows if r.get("id")),
+            )
+        else:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO stat_keys (game_id, player_id) VALUES (?, ?)",
+                ((int(r["game_id"]), int(r.get("player_id") or 0)) for r in rows),
+            )
+
+    def add_rows(self, path: str, rows: List[Dict]) -> None:
+        """Index rows that were just appended to ``path``."""
+        with self.conn:
+            self._insert(path, rows)
+            self._record_size(path)
+
+    def has_game(self, game_id: int) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM game_keys WHERE game_id = ?", (game_id,)
+        ).fetchone() is not None
+
+    def has_stat(self, key: Tuple[int, int]) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM stat_keys WHERE game_id = ? AND player_id = ?", key
+        ).fetchone() is not None
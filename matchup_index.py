@@ -0,0 +1,25 @@
+"""Layout of games by unordered team pair for head-to-head lookups.
+
+``shared_model`` stores games in this order so one pair's meetings are a
+contiguous, newest-first slice.
+"""
+
+import numpy as np
+
+MATCHUP_COLUMNS = ["date", "home_team", "away_team", "home_points", "away_points"]
+
+
+def pair_layout(table):
+    """Order games by unordered team pair, newest first within a pair.
+
+    Returns ``(order, keys, starts, n)``: the game order, each pair's key
+    ``min(a, b) * n + max(a, b)`` and where its run of games starts.
+    """
+    n = max(len(table.teams), 1)
+    lo = np.minimum(table.home, table.away).astype(np.int64)
+    hi = np.maximum(table.home, table.away).astype(np.int64)
+    pair = lo * n + hi
+    order = np.lexsort((-table.day.astype(np.int64), pair))
+    keys, starts = np.unique(pair[order], return_index=True)
+    return order, keys, starts, n
+
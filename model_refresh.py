@@ -0,0 +1,96 @@
+"""Background model rebuilds for the interactive front ends.
+
+``ModelRefresher`` runs a daemon thread that builds the model, then polls
+the source files every ``interval`` seconds and rebuilds when one of them
+changes (for example after ``update_data``'s scheduled job appends a
+night of games). A new model is swapped in with a single reference
+assignment once it is complete, so a reader that grabs ``refresher.model``
+always holds a whole model, old or new, and never waits on a rebuild.
+
+The thread never touches the UI: front ends poll ``generation`` (Tk from
+``after``, Streamlit on each rerun) and pick up the new model themselves.
+"""
+
+import os
+import threading
+import time
+
+RELOAD_INTERVAL = 2.0  # seconds between data file checks
+
+
+def source_mtimes(paths):
+    """Return each path's mtime in nanoseconds, ``None`` for missing files."""
+    mtimes = []
+    for path in paths:
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return mtimes
+
+
+class ModelRefresher:
+    """Keep ``build()``'s result current for the files in ``paths``.
+
+    ``build`` runs on the worker thread only. ``model`` is ``None`` until
+    the first build finishes; ``generation`` counts completed builds and
+    ``building`` is true while one is in progress. A failed build keeps
+    the previous model, stores the exception in ``error`` and is retried
+    at the next check.
+    """
+
+    def __init__(self, paths, build, interval: float = RELOAD_INTERVAL):
+        self.paths = list(paths)
+        self.build = build
+        self.interval = interval
+        self.model = None
+        self.generation = 0
+        self.building = False
+        self.error = None
+        self.loaded_at = None
+        self._mtimes = None
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._first = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="model-refresh", daemon=True)
+
+    def start(self) -> "ModelRefresher":
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join(timeout)
+
+    def refresh(self) -> None:
+        """Check the files now instead of at the next interval."""
+        self._wake.set()
+
+    def wait(self, timeout: float | None = None):
+        """Block until the first build has finished or failed; return ``model``."""
+        self._first.wait(timeout)
+        return self.model
+
+    def _run(self):
+        while not self._stopped.is_set():
+            mtimes = source_mtimes(self.paths)
+            if mtimes != self._mtimes:
+                self._rebuild(mtimes)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def _rebuild(self, mtimes):
+        self.building = True
+        try:
+            model = self.build()
+        except Exception as exc:
+            # Keep serving the old model; the next check will retry.
+            self.error = exc
+        else:
+            self.model, self._mtimes, self.error = model, mtimes, None
+            self.loaded_at = time.time()
+            self.generation += 1
+        finally:
+            self.building = False
+            self._first.set()
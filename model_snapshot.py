@@ -0,0 +1,192 @@
+"""Compiled on-disk model snapshot shared by the command line and GUI tools.
+
+Building the model means parsing every CSV and aggregating ratings, point
+averages, rosters and player averages. The result is small, so it is
+pickled next to the data and reused until one of the source files or the
+model parameters change.
+"""
+
+import hashlib
+import os
+import pickle
+
+from massey import MasseySolver
+from player_predictor import iter_player_chunks
+from player_table import PlayerAccumulator
+from predictor import iter_game_chunks, load_games
+from rating_engine import compute_ratings_and_avgs, stream_ratings_and_avgs
+from roster_index import RosterIndex
+from tuning import DEFAULT_PARAMS, PARAMS_FILE, RATING_PARAMS, load_params
+
+SNAPSHOT_VERSION = 4
+CACHE_DIR_NAME = ".cache"
+TUNED = object()  # load_model default: take the value from the tuned parameters
+
+
+class Model:
+    """Everything the predictors need to answer a query.
+
+    Team and player lookups go through ``roster``, a ``RosterIndex`` built
+    once with the model; extend it with new box scores to keep them current.
+    """
+
+    def __init__(self, ratings, team_avgs, roster, player_avgs, params, solver=None):
+        self.ratings = ratings
+        self.team_avgs = team_avgs
+        self.roster = roster
+        self.player_avgs = player_avgs
+        self.players = sorted(player_avgs)
+        self.params = params
+        self.solver = solver  # the least-squares engine's MasseySolver, kept for refits
+        self.k = DEFAULT_PARAMS["k"]
+        self.home_weight = DEFAULT_PARAMS["home_weight"]
+
+    @property
+    def team_players(self) -> dict:
+        """Team -> everyone who has played for it, as ``compute_team_players`` returns."""
+        return self.roster.team_players()
+
+    def current_team(self, player: str) -> str | None:
+        return self.roster.current_team(player)
+
+
+def file_digest(path: str) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _source_key(path: str) -> dict:
+    st = os.stat(path)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": file_digest(path)}
+
+
+def _sources_match(stored: dict, paths) -> bool:
+    """Check stored source keys, hashing only files whose stat changed.
+
+    Files that were touched without changing content get their stored
+    mtime refreshed so the next check is a plain ``stat`` again.
+    """
+    for path in paths:
+        key = stored.get(os.path.abspath(path))
+        if key is None or not os.path.exists(path):
+            return False
+        st = os.stat(path)
+        if st.st_mtime_ns == key["mtime_ns"] and st.st_size == key["size"]:
+            continue
+        if st.st_size != key["size"] or file_digest(path) != key["sha256"]:
+            return False
+        key["mtime_ns"] = st.st_mtime_ns
+    return True
+
+
+def snapshot_path(games_path: str, stats_path: str, params: dict) -> str:
+    """Return where the snapshot for these inputs and parameters lives."""
+    ident = repr((os.path.abspath(games_path), os.path.abspath(stats_path), sorted(params.items())))
+    name = "model-" + hashlib.sha1(ident.encode()).hexdigest()[:12] + ".pkl"
+    return os.path.join(os.path.dirname(os.path.abspath(games_path)), CACHE_DIR_NAME, name)
+
+
+def build_model(games_path: str, stats_path: str, params: dict, solver=None) -> Model:
+    """Stream the data files through the accumulators into a fresh ``Model``.
+
+    Only one chunk of rows is in memory at a time. The least-squares
+    engine needs every game at once, so it loads the games table whole;
+    it refits ``solver`` (an earlier model's, with the same parameters)
+    from its last solution, and the new model keeps it for the next build.
+    """
+    rating_params = {name: params[name] for name in RATING_PARAMS}
+    if params.get("engine", "average") == "average":
+        ratings, team_avgs = stream_ratings_and_avgs(iter_game_chunks(games_path), **rating_params)
+        solver = None
+    else:
+        solver = solver or MasseySolver(**rating_params)
+        ratings, team_avgs = compute_ratings_and_avgs(load_games(games_path), **params, solver=solver)
+    players, roster = PlayerAccumulator(), RosterIndex()
+    for chunk in iter_player_chunks(stats_path):
+        players.add(chunk)
+        roster.extend(chunk)
+    return Model(ratings, team_avgs, roster, players.averages(), params, solver)
+
+
+def _write_snapshot(path: str, payload: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def load_model(
+    games_path: str,
+    stats_path: str,
+    recency_bias: float = TUNED,
+    trade_date: str | None = TUNED,
+    post_trade_weight: float = TUNED,
+    rebuild: bool = False,
+    params_path: str = PARAMS_FILE,
+    engine: str = "average",
+    previous: Model | None = None,
+) -> Model:
+    """Return the model for these inputs, rebuilding only when they changed.
+
+    Rating parameters left at ``TUNED`` come from the tuned parameter file
+    (see ``tuning.py``), as do the model's ``k`` and ``home_weight``. An
+    explicit ``trade_date=None`` turns the trade weighting off.
+    ``engine`` picks the rating engine (see ``rating_engine.ENGINES``).
+    A rebuild warm-starts the least-squares engine from ``previous``, a
+    model its caller already holds, or else from the outdated snapshot.
+    """
+    tuned = load_params(params_path)
+    explicit = {
+        "recency_bias": recency_bias,
+        "trade_date": trade_date,
+        "post_trade_weight": post_trade_weight,
+    }
+    params = {
+        name: tuned[name] if explicit[name] is TUNED else explicit[name]
+        for name in RATING_PARAMS
+    }
+    params["engine"] = engine
+    path = snapshot_path(games_path, stats_path, params)
+    sources = [games_path, stats_path]
+    solver = previous.solver if previous is not None and previous.params == params else None
+
+    if not rebuild and os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                payload = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+            payload = None
+        if (
+            payload
+            and payload.get("version") == SNAPSHOT_VERSION
+            and payload.get("params") == params
+        ):
+            before = {p: dict(k) for p, k in payload["sources"].items()}
+            if _sources_match(payload["sources"], sources):
+                if payload["sources"] != before:
+                    _write_snapshot(path, payload)
+                return _with_tuning(payload["model"], tuned)
+            solver = solver or payload["model"].solver
+
+    keys = {os.path.abspath(p): _source_key(p) for p in sources}
+    model = build_model(games_path, stats_path, params, solver)
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "params": params,
+        "sources": keys,
+        "model": model,
+    }
+    _write_snapshot(path, payload)
+    return _with_tuning(model, tuned)
+
+
+def _with_tuning(model: Model, tuned: dict) -> Model:
+    """Attach the probability parameters, which do not affect the snapshot."""
+    model.k = tuned["k"]
+    model.home_weight = tuned["home_weight"]
+    return model
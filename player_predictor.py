@@ -1,48 +1,62 @@
-import csv
 import argparse
-from collections import defaultdict
-
-
-def load_player_stats(path):
-    """Load player stats from CSV."""
-    stats = []
-    with open(path, newline='') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            entry = {
-                'player': row['player'],
-                'points': int(row['points']),
-                'rebounds': int(row['rebounds']),
-                'assists': int(row['assists']),
-                'steals': int(row['steals']),
-                'fgm': int(row['fgm']),
-                'fga': int(row['fga']),
-                'ftm': int(row['ftm']),
-                'fta': int(row['fta']),
-            }
-            stats.append(entry)
-    return stats
+
+from columnar import load_player_binary
+from player_projections import DEFAULT_ALPHA, DEFAULT_WINDOW, PlayerProjector
+from player_table import (
+    CHUNK_ROWS,
+    PlayerAccumulator,
+    PlayerStatTable,
+    as_player_table,
+    compute_player_averages,
+    filter_player_stats,
+    iter_player_tables,
+    load_player_table,
+)
+from storage import SQLiteStore, is_sqlite_path
+
+
+def load_player_stats(path, player=None, team=None, since=None, last=None):
+    """Load player stats from a CSV or SQLite path into a ``PlayerStatTable``.
+
+    The table iterates as the stat dicts this function used to return.
+    ``player``, ``team`` and ``since`` filter the rows and ``last`` keeps
+    only the most recent N of them; for SQLite these run as indexed queries.
+    A CSV with a fresh binary copy (see ``columnar``) is memory-mapped
+    instead of parsed.
+    """
+    if is_sqlite_path(path):
+        with SQLiteStore(path) as store:
+            rows = store.query_player_stats(player, team, since, last=last)
+            return PlayerStatTable.from_rows(dict(row) for row in rows)
+    table = load_player_binary(path)
+    if table is None:
+        table = load_player_table(path)
+    return filter_player_stats(table, player, team, since, last)
+
+
+def iter_player_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Yield the box scores at a CSV or SQLite path as ``PlayerStatTable`` chunks."""
+    if is_sqlite_path(path):
+        with SQLiteStore(path) as store:
+            yield from store.iter_player_tables(chunk_rows)
+    elif (table := load_player_binary(path)) is not None:
+        for start in range(0, len(table), chunk_rows):
+            yield table.select(slice(start, start + chunk_rows))
+    else:
+        yield from iter_player_tables(path, chunk_rows)
+
+
+def stream_player_stats(path, chunk_rows=CHUNK_ROWS) -> PlayerAccumulator:
+    """Accumulate averages and rosters chunk by chunk with flat memory use."""
+    accumulator = PlayerAccumulator()
+    for chunk in iter_player_chunks(path, chunk_rows):
+        accumulator.add(chunk)
+    return accumulator
 
 
 def compute_averages(stats):
     """Compute per-player averages."""
-    totals = defaultdict(lambda: defaultdict(int))
-    counts = defaultdict(int)
-    for s in stats:
-        player = s['player']
-        counts[player] += 1
-        for k, v in s.items():
-            if k != 'player':
-                totals[player][k] += v
-    avgs = {}
-    for player, sums in totals.items():
-        games = counts[player]
-        avgs[player] = {k: sums[k] / games for k in sums}
-        fg_attempts = sums['fga']
-        ft_attempts = sums['fta']
-        avgs[player]['fg_pct'] = sums['fgm'] / fg_attempts if fg_attempts else 0
-        avgs[player]['ft_pct'] = sums['ftm'] / ft_attempts if ft_attempts else 0
-    return avgs
+    return compute_player_averages(as_player_table(stats))
 
 
 def predict_player(player, avgs):
@@ -53,18 +67,50 @@ def predict_player(player, avgs):
 def main():
     parser = argparse.ArgumentParser(description="NBA Player Stats Predictor")
     parser.add_argument('--data', default='data/sample_player_stats.csv', help='Path to player stats CSV')
+    projection = parser.add_mutually_exclusive_group()
+    projection.add_argument('--last', type=int, metavar='N', help='Project from the last N games only')
+    projection.add_argument('--ewma', type=float, metavar='ALPHA',
+                            help='Project with an exponentially weighted average (0 < ALPHA <= 1)')
+    parser.add_argument('--server', metavar='URL',
+                        help='Ask a running prediction_server (e.g. http://127.0.0.1:8765) for season averages')
     parser.add_argument('player', help='Player name')
     args = parser.parse_args()
+    if args.last is not None and args.last < 1:
+        parser.error("--last must be at least 1")
+    if args.ewma is not None and not 0 < args.ewma <= 1:
+        parser.error("--ewma must be in (0, 1]")
+    projecting = args.last is not None or args.ewma is not None
+
+    if args.server:
+        if projecting:
+            parser.error("--server serves season averages only; drop --last/--ewma")
+        from prediction_server import request
 
-    stats = load_player_stats(args.data)
-    avgs = compute_averages(stats)
-    prediction = predict_player(args.player, avgs)
+        try:
+            status, result = request(args.server, "/player", {"name": args.player})
+        except (OSError, ValueError) as exc:
+            parser.exit(1, f"Could not reach {args.server}: {exc}\n")
+        prediction, basis = (result["stats"] if status == 200 else None), "averages"
+    elif projecting:
+        stats = load_player_stats(args.data)
+        projector = PlayerProjector.from_stats(
+            stats,
+            window=args.last if args.last is not None else DEFAULT_WINDOW,
+            alpha=args.ewma if args.ewma is not None else DEFAULT_ALPHA,
+        )
+        if args.ewma is not None:
+            prediction, basis = projector.ewma(args.player), f"EWMA, alpha {args.ewma}"
+        else:
+            prediction, basis = projector.last_n(args.player), f"last {args.last} games"
+    else:
+        avgs = compute_averages(load_player_stats(args.data))
+        prediction, basis = predict_player(args.player, avgs), "averages"
 
     if prediction is None:
         print(f"No data for player {args.player}")
         return
 
-    print(f"Predicted stats for {args.player} (based on averages):")
+    print(f"Predicted stats for {args.player} (based on {basis}):")
     print(f"  Points: {prediction['points']:.1f}")
     print(f"  Rebounds: {prediction['rebounds']:.1f}")
     print(f"  Assists: {prediction['assists']:.1f}")
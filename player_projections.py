@@ -0,0 +1,103 @@
+"""Streaming last-N-games and EWMA projections for players.
+
+Each player keeps a small running state that is updated in O(1) per new
+stat line, so refreshing projections after a night of games only costs
+the new box scores. Lines must be fed oldest first.
+"""
+
+from collections import deque
+
+import numpy as np
+
+from player_table import STAT_KEYS, as_player_table
+
+DEFAULT_WINDOW = 10
+DEFAULT_ALPHA = 0.2  # EWMA weight of the newest game
+
+
+def _with_pcts(values: dict) -> dict:
+    values['fg_pct'] = values['fgm'] / values['fga'] if values['fga'] else 0
+    values['ft_pct'] = values['ftm'] / values['fta'] if values['fta'] else 0
+    return values
+
+
+class _PlayerState:
+    __slots__ = ('window', 'window_sums', 'ewma', 'games')
+
+    def __init__(self, size: int):
+        self.window = deque(maxlen=size)
+        self.window_sums = [0] * len(STAT_KEYS)
+        self.ewma = None
+        self.games = 0
+
+
+class PlayerProjector:
+    """Rolling-window and exponentially weighted averages per player.
+
+    The window keeps running sums: a new line is added and the line that
+    falls out of the window is subtracted. The EWMA starts at a player's
+    first line and then moves ``alpha`` of the way toward each new one.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW, alpha: float = DEFAULT_ALPHA):
+        self.window = window
+        self.alpha = alpha
+        self.players = {}
+        self.lines_seen = 0
+
+    @classmethod
+    def from_stats(cls, stats, window: int = DEFAULT_WINDOW, alpha: float = DEFAULT_ALPHA):
+        """Build projections from a ``PlayerStatTable`` or stat dicts, in date order."""
+        table = as_player_table(stats)
+        projector = cls(window, alpha)
+        order = np.argsort(table.day, kind='stable')
+        rows = table.stats[order].tolist()
+        for pid, values in zip(table.player[order].tolist(), rows):
+            projector._update(table.players[pid], values)
+        return projector
+
+    def _update(self, player: str, values: list) -> None:
+        state = self.players.get(player)
+        if state is None:
+            state = self.players[player] = _PlayerState(self.window)
+        if len(state.window) == state.window.maxlen:
+            dropped = state.window[0]
+            state.window_sums = [s - d for s, d in zip(state.window_sums, dropped)]
+        state.window.append(values)
+        state.window_sums = [s + v for s, v in zip(state.window_sums, values)]
+        if state.ewma is None:
+            state.ewma = [float(v) for v in values]
+        else:
+            a = self.alpha
+            state.ewma = [e + a * (v - e) for e, v in zip(state.ewma, values)]
+        state.games += 1
+        self.lines_seen += 1
+
+    def update(self, line: dict) -> None:
+        """Fold one stat line (a dict with ``player`` and the stat keys) in.
+
+        A missing or ``None`` stat counts as 0, as it does in the loaders.
+        """
+        self._update(line['player'], [int(line.get(k) or 0) for k in STAT_KEYS])
+
+    def update_many(self, lines) -> int:
+        """Consume an iterable or generator of stat lines; return how many."""
+        before = self.lines_seen
+        for line in lines:
+            self.update(line)
+        return self.lines_seen - before
+
+    def last_n(self, player: str):
+        """Averages over the player's last ``window`` games, or ``None``."""
+        state = self.players.get(player)
+        if state is None:
+            return None
+        n = len(state.window)
+        return _with_pcts({k: s / n for k, s in zip(STAT_KEYS, state.window_sums)})
+
+    def ewma(self, player: str):
+        """Exponentially weighted averages for the player, or ``None``."""
+        state = self.players.get(player)
+        if state is None:
+            return None
+        return _with_pcts(dict(zip(STAT_KEYS, state.ewma)))
@@ -0,0 +1,346 @@
+"""Columnar storage and vectorized averaging for player box scores."""
+
+import csv
+from itertools import islice
+
+import numpy as np
+
+from game_table import day_number, day_string
+
+STAT_KEYS = ['points', 'rebounds', 'assists', 'steals', 'fgm', 'fga', 'ftm', 'fta']
+CHUNK_ROWS = 16384  # about 15 MiB of parsed CSV rows per chunk
+
+
+class PlayerStatTable:
+    """Box-score lines stored as typed arrays.
+
+    ``stats`` is an ``(n, len(STAT_KEYS))`` int32 array. Player and team
+    names are interned to ids; ``team`` is -1, ``day`` 0 and ``game_id`` -1
+    where the source had no such column. Iterating yields the dicts that
+    ``load_player_stats`` used to return, plus ``team``/``date`` when known.
+    """
+
+    def __init__(self, players, player, stats, teams=(), team=None, day=None, game_id=None):
+        self.players = list(players)
+        self.player_index = {name: i for i, name in enumerate(self.players)}
+        self.teams = list(teams)
+        self.team_index = {name: i for i, name in enumerate(self.teams)}
+        self.player = np.asarray(player, dtype=np.int32)
+        n = len(self.player)
+        self.stats = np.asarray(stats, dtype=np.int32).reshape(n, len(STAT_KEYS))
+        self.team = np.full(n, -1, dtype=np.int16) if team is None else np.asarray(team, dtype=np.int16)
+        self.day = np.zeros(n, dtype=np.int32) if day is None else np.asarray(day, dtype=np.int32)
+        self.game_id = np.full(n, -1, dtype=np.int64) if game_id is None else np.asarray(game_id, dtype=np.int64)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a table from an iterable of stat dicts."""
+        builder = PlayerStatTableBuilder()
+        for row in rows:
+            builder.add(
+                row['player'],
+                [int(row.get(k) or 0) for k in STAT_KEYS],
+                row.get('team'),
+                row.get('date'),
+                int(row.get('game_id') or -1),
+            )
+        return builder.build()
+
+    def __len__(self):
+        return len(self.player)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.row(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("stat index out of range")
+        return self.row(i)
+
+    def row(self, i: int) -> dict:
+        entry = {'player': self.players[self.player[i]]}
+        entry.update(zip(STAT_KEYS, self.stats[i].tolist()))
+        if self.team[i] >= 0:
+            entry['team'] = self.teams[self.team[i]]
+        if self.day[i]:
+            entry['date'] = day_string(self.day[i])
+        return entry
+
+    def select(self, rows) -> "PlayerStatTable":
+        """Return the lines picked by a boolean mask or index array."""
+        return PlayerStatTable(
+            self.players, self.player[rows], self.stats[rows],
+            self.teams, self.team[rows], self.day[rows], self.game_id[rows],
+        )
+
+
+class PlayerStatTableBuilder:
+    """Collect stat lines column by column before building a table."""
+
+    def __init__(self):
+        self.players = []
+        self.player_index = {}
+        self.teams = []
+        self.team_index = {}
+        self._days = {'': 0}
+        self.player = []
+        self.team = []
+        self.day = []
+        self.game_id = []
+        self.stats = []
+
+    @staticmethod
+    def _intern(name, names, index):
+        i = index.get(name)
+        if i is None:
+            i = index[name] = len(names)
+            names.append(name)
+        return i
+
+    def _day(self, value) -> int:
+        day = self._days.get(value)
+        if day is None:
+            day = self._days[value] = day_number(value)
+        return day
+
+    def fresh(self) -> "PlayerStatTableBuilder":
+        """Return an empty builder that keeps this one's player and team ids."""
+        builder = PlayerStatTableBuilder()
+        builder.players, builder.player_index = self.players, self.player_index
+        builder.teams, builder.team_index = self.teams, self.team_index
+        builder._days = self._days
+        return builder
+
+    def add(self, player, stats, team=None, date=None, game_id=-1):
+        self.player.append(self._intern(player, self.players, self.player_index))
+        self.team.append(self._intern(team, self.teams, self.team_index) if team else -1)
+        self.day.append(self._day(date or ''))
+        self.game_id.append(game_id)
+        self.stats.append(stats)
+
+    def build(self) -> PlayerStatTable:
+        stats = np.asarray(self.stats, dtype=np.int32).reshape(len(self.player), len(STAT_KEYS))
+        return PlayerStatTable(
+            self.players, self.player, stats, self.teams, self.team, self.day, self.game_id,
+        )
+
+
+def _intern_column(values, names, index, n, blank_is_none=False):
+    """Map a column of names to ids, adding unseen names in first-seen order.
+
+    With ``blank_is_none`` an empty name maps to -1 (no team) instead of
+    getting an id of its own.
+    """
+    def intern(name):
+        i = index.get(name)
+        if i is None:
+            if blank_is_none and not name:
+                return -1
+            i = index[name] = len(names)
+            names.append(name)
+        return i
+    return np.fromiter(map(intern, values), dtype=np.int32, count=n)
+
+
+def iter_player_tables(path, chunk_rows: int = CHUNK_ROWS, offset: int = 0, builder=None):
+    """Yield a player stats CSV as ``PlayerStatTable`` chunks.
+
+    Rows are read ``chunk_rows`` at a time and converted a column at a time
+    straight into typed arrays, so no per-row dict is ever built and only
+    one chunk is in memory at once. Chunks share player and team ids,
+    continuing from ``builder``'s names if one is given. A non-zero
+    ``offset`` starts reading at that byte, just after earlier rows.
+    Stat columns missing from the file read as 0.
+    """
+    builder = builder or PlayerStatTableBuilder()
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return
+        if offset:
+            f.seek(offset)
+        col = {name: i for i, name in enumerate(header)}
+        stat_cols = [col.get(k) for k in STAT_KEYS]
+        while True:
+            chunk = [row for row in islice(reader, chunk_rows) if row]
+            if not chunk:
+                break
+            yield _chunk_table(builder, col, stat_cols, chunk)
+
+
+def _chunk_table(builder, col, stat_cols, chunk) -> PlayerStatTable:
+    columns = list(zip(*chunk))
+    n = len(chunk)
+    player = _intern_column(columns[col['player']], builder.players, builder.player_index, n)
+    if 'team' in col:
+        team = _intern_column(columns[col['team']], builder.teams, builder.team_index, n, blank_is_none=True)
+    else:
+        team = np.full(n, -1)
+    if 'date' in col:
+        day = np.fromiter(map(builder._day, columns[col['date']]), dtype=np.int32, count=n)
+    else:
+        day = np.zeros(n, dtype=np.int32)
+    if 'game_id' in col:
+        ids = (int(v) if v else -1 for v in columns[col['game_id']])
+        game_id = np.fromiter(ids, dtype=np.int64, count=n)
+    else:
+        game_id = np.full(n, -1)
+    stats = np.zeros((n, len(STAT_KEYS)), dtype=np.int32)
+    for j, i in enumerate(stat_cols):
+        if i is None:
+            continue
+        try:
+            stats[:, j] = np.fromiter(map(int, columns[i]), dtype=np.int32, count=n)
+        except ValueError:  # blank cells
+            stats[:, j] = np.fromiter((int(v) if v else 0 for v in columns[i]), dtype=np.int32, count=n)
+    return PlayerStatTable(builder.players, player, stats, builder.teams, team, day, game_id)
+
+
+def load_player_table(path) -> PlayerStatTable:
+    """Load a player stats CSV into a ``PlayerStatTable``."""
+    chunks = list(iter_player_tables(path))
+    if not chunks:
+        return PlayerStatTableBuilder().build()
+    last = chunks[-1]  # chunks share ids, so the last one knows every name
+    return PlayerStatTable(
+        last.players,
+        np.concatenate([c.player for c in chunks]),
+        np.concatenate([c.stats for c in chunks]),
+        last.teams,
+        np.concatenate([c.team for c in chunks]),
+        np.concatenate([c.day for c in chunks]),
+        np.concatenate([c.game_id for c in chunks]),
+    )
+
+
+def as_player_table(stats) -> PlayerStatTable:
+    if isinstance(stats, PlayerStatTable):
+        return stats
+    return PlayerStatTable.from_rows(stats)
+
+
+def filter_player_stats(table: PlayerStatTable, player=None, team=None, since=None, last=None):
+    """Return lines for ``player``/``team`` on or after ``since``; ``last`` keeps the newest N."""
+    if not (player or team or since or last):
+        return table
+    mask = np.ones(len(table), dtype=bool)
+    if player:
+        mask &= table.player == table.player_index.get(player, -1)
+    if team:
+        mask &= table.team == table.team_index.get(team, -1)
+    if since:
+        mask &= table.day >= day_number(since)
+    rows = np.flatnonzero(mask)
+    if last:
+        rows = rows[np.argsort(table.day[rows], kind='stable')][-last:]
+    return table.select(rows)
+
+
+def _averages_from_sums(players, counts, sums) -> dict:
+    played = np.flatnonzero(counts)
+    means = sums[played] / counts[played, None]
+    fgm, fga = sums[played, STAT_KEYS.index('fgm')], sums[played, STAT_KEYS.index('fga')]
+    ftm, fta = sums[played, STAT_KEYS.index('ftm')], sums[played, STAT_KEYS.index('fta')]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fg_pct = np.where(fga > 0, fgm / fga, 0.0)
+        ft_pct = np.where(fta > 0, ftm / fta, 0.0)
+
+    avgs = {}
+    for i, pid in enumerate(played.tolist()):
+        entry = dict(zip(STAT_KEYS, means[i].tolist()))
+        entry['fg_pct'] = fg_pct[i].item() if fga[i] else 0
+        entry['ft_pct'] = ft_pct[i].item() if fta[i] else 0
+        avgs[players[pid]] = entry
+    return avgs
+
+
+def _grouped_sums(player, stats, n):
+    counts = np.bincount(player, minlength=n)
+    sums = np.stack(
+        [np.bincount(player, weights=stats[:, j], minlength=n) for j in range(len(STAT_KEYS))],
+        axis=1,
+    )
+    return counts, sums
+
+
+def latest_rows(player, day):
+    """Return ``(player ids, rows)`` with each player's latest line by date.
+
+    Of lines on the same day the later one wins, so a mid-day trade
+    resolves to the team listed last.
+    """
+    order = np.lexsort((np.arange(len(player)), day, player))
+    grouped = player[order]
+    last = np.flatnonzero(np.r_[grouped[1:] != grouped[:-1], True]) if len(order) else order
+    return grouped[last], order[last]
+
+
+def compute_player_averages(table: PlayerStatTable) -> dict:
+    """Per-player means, FG% and FT% from one grouped reduction.
+
+    Sums of integer stats are exact in float64, so the results match the
+    old per-line accumulation exactly.
+    """
+    if not len(table):
+        return {}
+    counts, sums = _grouped_sums(table.player, table.stats, len(table.players))
+    return _averages_from_sums(table.players, counts, sums)
+
+
+class PlayerAccumulator:
+    """Running per-player sums and rosters fed one chunk at a time.
+
+    Feeding every chunk of a file gives the same ``averages()`` as
+    ``compute_player_averages`` on the whole table, and the same
+    ``team_players()`` as ``predictor.compute_team_players``, while only
+    O(players) state is kept between chunks.
+    """
+
+    def __init__(self):
+        self.players = []
+        self.player_index = {}
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.sums = np.zeros((0, len(STAT_KEYS)))
+        self.rosters = {}
+        self.n_lines = 0
+
+    def add(self, table) -> None:
+        """Fold a ``PlayerStatTable`` (or iterable of stat dicts) in."""
+        table = as_player_table(table)
+        if (table.player < 0).any():
+            # A -1 player id means the line names no player; NumPy would
+            # read it as the last player, so such lines are left out.
+            table = table.select(table.player >= 0)
+        if not len(table):
+            return
+        ids = np.fromiter(
+            (PlayerStatTableBuilder._intern(name, self.players, self.player_index) for name in table.players),
+            dtype=np.intp, count=len(table.players),
+        )
+        n = len(self.players)
+        if n > len(self.counts):
+            self.counts = np.concatenate((self.counts, np.zeros(n - len(self.counts), dtype=np.int64)))
+            self.sums = np.vstack((self.sums, np.zeros((n - len(self.sums), len(STAT_KEYS)))))
+        counts, sums = _grouped_sums(ids[table.player], table.stats, n)
+        self.counts += counts
+        self.sums += sums
+        self.n_lines += len(table)
+
+        on_team = table.team >= 0
+        pairs = np.unique(
+            table.team[on_team].astype(np.int64) * len(table.players) + table.player[on_team]
+        )
+        for team_id, player_id in zip(*np.divmod(pairs, len(table.players))):
+            self.rosters.setdefault(table.teams[team_id], set()).add(table.players[player_id])
+
+    def averages(self) -> dict:
+        return _averages_from_sums(self.players, self.counts, self.sums)
+
+    def team_players(self) -> dict:
+        return {team: sorted(players) for team, players in self.rosters.items()}
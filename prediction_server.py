@@ -0,0 +1,233 @@
+"""Long-running local prediction server with a warm in-memory model.
+
+The model is loaded once (through the ``model_snapshot`` cache) and every
+request is answered from dict lookups, so handlers take microseconds
+instead of a process start plus a CSV parse. The data and parameter files
+are polled every ``RELOAD_INTERVAL`` seconds on a background thread; when
+one changes a fresh model is built there and swapped in with a single
+reference assignment, so a request always sees one complete model and
+never waits for a rebuild.
+
+Endpoints (all return JSON):
+
+- ``GET /health``
+- ``GET /game?home=...&away=...``
+- ``GET /player?name=...``
+- ``POST /batch`` with ``{"games": [[home, away], ...], "players": [...]}``
+
+``predictor.py`` and ``player_predictor.py`` accept ``--server URL`` to act
+as thin clients of a running server.
+"""
+
+import argparse
+import json
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from model_refresh import RELOAD_INTERVAL, ModelRefresher
+from model_snapshot import load_model
+from predictor import predict_batch, predict_final_score, predict_with_reasoning
+from rating_engine import ENGINES
+from tuning import PARAMS_FILE
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+class ModelHolder:
+    """Serves the current model while a ``ModelRefresher`` rebuilds it.
+
+    The first model is built before the constructor returns. After that
+    the refresher thread polls the data and parameter files and builds a
+    replacement in the background, so requests never wait on a rebuild;
+    they keep getting the old model until the new one is swapped in.
+    """
+
+    def __init__(self, games_path: str, stats_path: str, params_path: str = PARAMS_FILE,
+                 interval: float = RELOAD_INTERVAL, engine: str = "average"):
+        self.paths = (games_path, stats_path, params_path)
+        self.engine = engine
+        # Started only once assigned: the first build already reads it.
+        self.refresher = ModelRefresher(self.paths, self._build, interval)
+        if self.refresher.start().wait() is None:
+            self.refresher.stop()
+            raise self.refresher.error
+
+    def _build(self):
+        games_path, stats_path, params_path = self.paths
+        return load_model(games_path, stats_path, params_path=params_path, engine=self.engine,
+                          previous=self.refresher.model)
+
+    @property
+    def model(self):
+        return self.refresher.model
+
+    @property
+    def loaded_at(self):
+        return self.refresher.loaded_at
+
+    def get(self):
+        """Return the current model; never blocks on a rebuild."""
+        return self.refresher.model
+
+    def close(self) -> None:
+        self.refresher.stop()
+
+
+def game_prediction(model, home: str, away: str) -> dict:
+    prob, reason = predict_with_reasoning(home, away, model.ratings, k=model.k, home_weight=model.home_weight)
+    home_score, away_score = predict_final_score(home, away, model.team_avgs)
+    return {
+        "home": home,
+        "away": away,
+        "prob_home": prob,
+        "home_score": home_score,
+        "away_score": away_score,
+        "reasoning": reason,
+        "home_players": model.team_players.get(home, []),
+        "away_players": model.team_players.get(away, []),
+    }
+
+
+def batch_prediction(model, games, players) -> dict:
+    result = {"games": [], "players": {p: model.player_avgs.get(p) for p in players}}
+    if games:
+        pairs = [tuple(g) for g in games]
+        probs, home_scores, away_scores = predict_batch(
+            pairs, model.ratings, model.team_avgs, k=model.k, home_weight=model.home_weight
+        )
+        result["games"] = [
+            {"home": h, "away": a, "prob_home": p, "home_score": hs, "away_score": as_}
+            for (h, a), p, hs, as_ in zip(
+                pairs, probs.tolist(), home_scores.tolist(), away_scores.tolist()
+            )
+        ]
+    return result
+
+
+def parse_batch(body):
+    """Return ``(games, players)`` from a ``/batch`` body or raise ``ValueError``."""
+    if not isinstance(body, dict):
+        raise ValueError("body must be a JSON object")
+    games = body.get("games", [])
+    players = body.get("players", [])
+    if not isinstance(games, list) or not all(
+        isinstance(g, list) and len(g) == 2 and all(isinstance(t, str) for t in g) for g in games
+    ):
+        raise ValueError("games must be a list of [home, away] team name pairs")
+    if not isinstance(players, list) or not all(isinstance(p, str) for p in players):
+        raise ValueError("players must be a list of player names")
+    return games, players
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    """Routes requests to the model held by ``self.server.holder``."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        model = self.server.holder.get()
+        if url.path == "/health":
+            self._send(200, {"status": "ok", "loaded_at": self.server.holder.loaded_at})
+        elif url.path == "/game":
+            if not query.get("home") or not query.get("away"):
+                self._send(400, {"error": "home and away are required"})
+                return
+            self._send(200, game_prediction(model, query["home"], query["away"]))
+        elif url.path == "/player":
+            name = query.get("name", "")
+            stats = model.player_avgs.get(name)
+            if stats is None:
+                self._send(404, {"error": f"No data for player {name}"})
+                return
+            self._send(200, {"player": name, "stats": stats})
+        else:
+            self._send(404, {"error": f"unknown path {url.path}"})
+
+    def do_POST(self):
+        if urllib.parse.urlsplit(self.path).path != "/batch":
+            self._send(404, {"error": f"unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, {"error": "body must be JSON"})
+            return
+        try:
+            games, players = parse_batch(body)
+        except ValueError as exc:
+            self._send(400, {"error": str(exc)})
+            return
+        self._send(200, batch_prediction(self.server.holder.get(), games, players))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(games_path: str, stats_path: str, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                params_path: str = PARAMS_FILE, engine: str = "average") -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), PredictionHandler)
+    server.daemon_threads = True
+    server.holder = ModelHolder(games_path, stats_path, params_path, engine=engine)
+    return server
+
+
+# --- thin client ---
+
+def request(server: str, path: str, params: dict | None = None, body=None, timeout: float = 5.0):
+    """Call a running server and return ``(status, decoded JSON)``.
+
+    An error response whose body is not JSON (a proxy's HTML page, say)
+    comes back as ``{"error": <reason>}``. A server that cannot be reached
+    raises ``OSError`` (``urllib.error.URLError`` is one).
+    """
+    url = server.rstrip("/") + path
+    if params:
+        url += "?" + urllib.parse.urlencode(params)
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.status, json.load(resp)
+    except urllib.error.HTTPError as exc:
+        try:
+            return exc.code, json.load(exc)
+        except ValueError:
+            return exc.code, {"error": f"HTTP {exc.code} {exc.reason}"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve game and player predictions over HTTP")
+    parser.add_argument('--data', default='data/sample_games.csv', help='Path to games CSV data')
+    parser.add_argument('--stats', default='data/sample_player_stats.csv', help='Path to player stats CSV')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--engine', choices=ENGINES, default='average', help='Rating engine')
+    args = parser.parse_args()
+
+    server = make_server(args.data, args.stats, args.host, args.port, engine=args.engine)
+    print(f"Serving predictions on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.holder.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,38 +1,54 @@
-import csv
 import math
 import argparse
-from collections import defaultdict
-from datetime import datetime
-from player_predictor import load_player_stats
 
-# Extra emphasis for the home team
-HOME_WEIGHT = 1.2  # multiplier applied to the home team's rating
-HOME_ADVANTAGE = 3  # points added to predicted home score
-TRADE_DEADLINE = "2025-02-08"  # date separating roster changes
+import numpy as np
+
+from columnar import load_game_binary
+from game_table import CHUNK_ROWS, filter_games, iter_game_tables, load_game_table
+from rating_engine import ENGINES, compute_ratings_and_avgs
+from roster_index import RosterIndex
+from storage import SQLiteStore, is_sqlite_path
+from teams import ALL_TEAMS
 
 # Extra emphasis for the home team
 HOME_WEIGHT = 1.1  # multiplier applied to the home team's rating
 HOME_ADVANTAGE = 3  # points added to predicted home score
+TRADE_DEADLINE = "2025-02-08"  # date separating roster changes
 
-
-def load_games(path):
-    """Load games from a CSV path."""
-    games = []
-    with open(path, newline='') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row.get('home_points') and row.get('away_points'):
-                try:
-                    games.append({
-                        'date': row['date'],
-                        'home_team': row['home_team'],
-                        'away_team': row['away_team'],
-                        'home_points': int(row['home_points']),
-                        'away_points': int(row['away_points']),
-                    })
-                except ValueError:
-                    print(f"⚠️ Skipping bad row: {row}")
-    return games
+# Default address of prediction_server.py for the --server thin client.
+DEFAULT_SERVER = "http://127.0.0.1:8765"
+
+def load_games(path, team=None, since=None, until=None):
+    """Load games from a CSV or SQLite path into a columnar ``GameTable``.
+
+    The table iterates as the game dicts this function used to return.
+    ``team``, ``since`` and ``until`` filter the games; for SQLite they are
+    answered by indexed queries. A CSV with a fresh binary copy (see
+    ``columnar``) is memory-mapped instead of parsed.
+    """
+    if is_sqlite_path(path):
+        with SQLiteStore(path) as store:
+            return store.load_game_table(team, since, until)
+    table = load_game_binary(path)
+    if table is None:
+        table = load_game_table(path)
+    return filter_games(table, team, since, until)
+
+
+def iter_game_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Yield the games at a CSV or SQLite path as ``GameTable`` chunks.
+
+    Feed them to ``rating_engine.stream_ratings_and_avgs`` to rate a history
+    too large to hold in memory at once.
+    """
+    if is_sqlite_path(path):
+        with SQLiteStore(path) as store:
+            yield from store.iter_game_tables(chunk_rows)
+    elif (table := load_game_binary(path)) is not None:
+        for start in range(0, len(table), chunk_rows):
+            yield table.select(slice(start, start + chunk_rows))
+    else:
+        yield from iter_game_tables(path, chunk_rows)
 
 
 def compute_team_ratings(
@@ -40,37 +56,13 @@ def compute_team_ratings(
     recency_bias: float = 0.02,
     trade_date: str | None = None,
     post_trade_weight: float = 1.5,
+    engine: str = "average",
 ):
     """Compute rating weighted by recency and trade deadline."""
-    if not games:
-        return {}
-
-    latest = max(datetime.strptime(g["date"], "%Y-%m-%d") for g in games)
-    td = datetime.strptime(trade_date, "%Y-%m-%d") if trade_date else None
-
-    totals = defaultdict(lambda: {"diff_sum": 0.0, "weight_sum": 0.0})
-    for g in games:
-        g_date = datetime.strptime(g["date"], "%Y-%m-%d")
-        age_days = (latest - g_date).days
-        weight = 1 / (1 + recency_bias * age_days)
-        if td and g_date >= td:
-            weight *= post_trade_weight
-
-        diff = g["home_points"] - g["away_points"]
-        totals[g["home_team"]]["diff_sum"] += diff * weight
-        totals[g["home_team"]]["weight_sum"] += weight
-
-        totals[g["away_team"]]["diff_sum"] -= diff * weight
-        totals[g["away_team"]]["weight_sum"] += weight
-
-    ratings = {
-        team: vals["diff_sum"] / vals["weight_sum"]
-        for team, vals in totals.items()
-    }
+    ratings, _ = compute_ratings_and_avgs(games, recency_bias, trade_date, post_trade_weight, engine)
     return ratings
 
 
-
 def compute_team_point_avgs(
     games,
     recency_bias: float = 0.02,
@@ -78,69 +70,17 @@ def compute_team_point_avgs(
     post_trade_weight: float = 1.5,
 ):
     """Return weighted average points scored and allowed for each team."""
-    if not games:
-        return {}
-
-    latest = max(datetime.strptime(g["date"], "%Y-%m-%d") for g in games)
-    td = datetime.strptime(trade_date, "%Y-%m-%d") if trade_date else None
-
-    totals = defaultdict(lambda: {"scored": 0.0, "allowed": 0.0, "weight_sum": 0.0})
-    for g in games:
-        g_date = datetime.strptime(g["date"], "%Y-%m-%d")
-        age_days = (latest - g_date).days
-        weight = 1 / (1 + recency_bias * age_days)
-        if td and g_date >= td:
-            weight *= post_trade_weight
-
-        totals[g["home_team"]]["scored"] += g["home_points"] * weight
-        totals[g["home_team"]]["allowed"] += g["away_points"] * weight
-        totals[g["home_team"]]["weight_sum"] += weight
-
-        totals[g["away_team"]]["scored"] += g["away_points"] * weight
-        totals[g["away_team"]]["allowed"] += g["home_points"] * weight
-        totals[g["away_team"]]["weight_sum"] += weight
-
-    avgs = {}
-    for team, vals in totals.items():
-        w = vals["weight_sum"]
-        avgs[team] = {
-            "scored": vals["scored"] / w,
-            "allowed": vals["allowed"] / w,
-        }
+    _, avgs = compute_ratings_and_avgs(games, recency_bias, trade_date, post_trade_weight)
     return avgs
 
-def compute_team_point_avgs(games):
-    """Return average points scored and allowed for each team."""
-    totals = defaultdict(lambda: {'scored': 0, 'allowed': 0, 'games': 0})
-    for g in games:
-        totals[g['home_team']]['scored'] += g['home_points']
-        totals[g['home_team']]['allowed'] += g['away_points']
-        totals[g['home_team']]['games'] += 1
-
-        totals[g['away_team']]['scored'] += g['away_points']
-        totals[g['away_team']]['allowed'] += g['home_points']
-        totals[g['away_team']]['games'] += 1
-
-    avgs = {}
-    for team, vals in totals.items():
-        games_played = vals['games']
-        avgs[team] = {
-            'scored': vals['scored'] / games_played,
-            'allowed': vals['allowed'] / games_played,
-
-        }
-    return avgs
-
-
 
 def compute_team_players(player_stats):
-    """Return a mapping of team -> list of players."""
-    players = defaultdict(set)
-    for row in player_stats:
-        team = row.get("team")
-        if team:
-            players[team].add(row.get("player"))
-    return {team: sorted(p_list) for team, p_list in players.items()}
+    """Return a mapping of team -> list of players.
+
+    Build a ``roster_index.RosterIndex`` directly to keep the lookups and
+    extend them as new box scores arrive.
+    """
+    return RosterIndex(player_stats).team_players()
 
 
 def predict_final_score(home_team, away_team, avgs):
@@ -152,50 +92,121 @@ def predict_final_score(home_team, away_team, avgs):
     away_score = (a['scored'] + h['allowed']) / 2
     return round(home_score), round(away_score)
 
-def predict_with_reasoning(home_team, away_team, ratings, k=0.1):
+def _format_reasoning(raw_home, home_weight, rating_away, diff, prob_home):
+    return (
+        f"Home rating {raw_home:.2f} x{home_weight:.2f}, "
+        f"Away rating {rating_away:.2f}, diff {diff:.2f} -> prob {prob_home:.3f}"
+    )
 
 
+def predict_with_reasoning(home_team, away_team, ratings, k=0.1, home_weight=HOME_WEIGHT):
     """Return win probability plus explanation of the calculation."""
     raw_home = ratings.get(home_team, 0)
     rating_home = raw_home * home_weight
     rating_away = ratings.get(away_team, 0)
     diff = rating_home - rating_away
     prob_home = 1 / (1 + math.exp(-k * diff))
-    reasoning = (
-        f"Home rating {raw_home:.2f} x{home_weight:.2f}, "
-        f"Away rating {rating_away:.2f}, diff {diff:.2f} -> prob {prob_home:.3f}"
-    )
+    reasoning = _format_reasoning(raw_home, home_weight, rating_away, diff, prob_home)
     return prob_home, reasoning
 
 
+def _team_arrays(teams, ratings, avgs):
+    """Return rating, scored and allowed arrays aligned with ``teams``."""
+    blank = {'scored': 0, 'allowed': 0}
+    rating = np.array([ratings.get(t, 0) for t in teams], dtype=np.float64)
+    scored = np.array([avgs.get(t, blank)['scored'] for t in teams], dtype=np.float64)
+    allowed = np.array([avgs.get(t, blank)['allowed'] for t in teams], dtype=np.float64)
+    return rating, scored, allowed
+
+
+def predict_batch(pairs, ratings, avgs, k=0.1, home_weight=HOME_WEIGHT, reasoning=False):
+    """Predict a slate of ``(home_team, away_team)`` pairs in one call.
+
+    Returns ``(prob_home, home_scores, away_scores)`` as arrays matching the
+    order of ``pairs``; the numbers agree with ``predict_with_reasoning`` and
+    ``predict_final_score``. With ``reasoning=True`` a fourth element holds
+    the explanation strings, which are only formatted in that case.
+    """
+    pairs = list(pairs)
+    teams = sorted({t for pair in pairs for t in pair})
+    index = {t: i for i, t in enumerate(teams)}
+    rating, scored, allowed = _team_arrays(teams, ratings, avgs)
+    home = np.array([index[h] for h, _ in pairs], dtype=np.intp)
+    away = np.array([index[a] for _, a in pairs], dtype=np.intp)
+
+    diff = rating[home] * home_weight - rating[away]
+    prob_home = 1 / (1 + np.exp(-k * diff))
+    home_scores = np.rint((scored[home] + allowed[away]) / 2).astype(int)
+    away_scores = np.rint((scored[away] + allowed[home]) / 2).astype(int)
+    if not reasoning:
+        return prob_home, home_scores, away_scores
+    reasons = [
+        _format_reasoning(rating[h], home_weight, rating[a], d, p)
+        for h, a, d, p in zip(home.tolist(), away.tolist(), diff.tolist(), prob_home.tolist())
+    ]
+    return prob_home, home_scores, away_scores, reasons
+
+
+def predict_matrix(ratings, avgs, teams=ALL_TEAMS, k=0.1, home_weight=HOME_WEIGHT):
+    """Predict every home/away combination of ``teams``.
+
+    Returns ``(prob_home, home_scores, away_scores)`` as ``len(teams)`` square
+    arrays where row ``i`` is the home team and column ``j`` the away team.
+    The diagonal (a team against itself) is meaningless and left as computed.
+    """
+    rating, scored, allowed = _team_arrays(teams, ratings, avgs)
+    diff = rating[:, None] * home_weight - rating[None, :]
+    prob_home = 1 / (1 + np.exp(-k * diff))
+    home_scores = np.rint((scored[:, None] + allowed[None, :]) / 2).astype(int)
+    away_scores = np.rint((scored[None, :] + allowed[:, None]) / 2).astype(int)
+    return prob_home, home_scores, away_scores
+
+
 def main():
     parser = argparse.ArgumentParser(description="NBA Betting Predictor")
-    parser.add_argument('--data', default='data/sample_games.csv', help='Path to games CSV data')
-    parser.add_argument('--stats', default='data/sample_player_stats.csv', help='Path to player stats CSV')
+    parser.add_argument('--data', help='Path to games CSV data (default data/sample_games.csv)')
+    parser.add_argument('--stats', help='Path to player stats CSV (default data/sample_player_stats.csv)')
     parser.add_argument('home_team', help='Home team name')
     parser.add_argument('away_team', help='Away team name')
+    parser.add_argument('--engine', choices=ENGINES,
+                        help='Rating engine: average margin (default) or opponent-adjusted least squares')
+    parser.add_argument('--server', metavar='URL',
+                        help=f'Ask a running prediction_server (e.g. {DEFAULT_SERVER}) instead of loading the data')
     args = parser.parse_args()
 
-    games = load_games(args.data)
-
-    ratings = compute_team_ratings(games, trade_date=TRADE_DEADLINE)
-    avgs = compute_team_point_avgs(games, trade_date=TRADE_DEADLINE)
-    player_stats = load_player_stats(args.stats)
-    team_players = compute_team_players(player_stats)
-
-    ratings = compute_team_ratings(games)
-    avgs = compute_team_point_avgs(games)
-
-
-    prob, reason = predict_with_reasoning(args.home_team, args.away_team, ratings)
-    home_score, away_score = predict_final_score(args.home_team, args.away_team, avgs)
-
-    print(reason)
-    print(f"Predicted probability {args.home_team} beats {args.away_team}: {prob:.3f}")
-    print(f"Predicted final score: {args.home_team} {home_score} - {args.away_team} {away_score}")
+    if args.server:
+        # The server was started with its own data and engine.
+        if args.data or args.stats or args.engine:
+            parser.error("--server uses the server's data and engine; drop --data/--stats/--engine")
+        # Imported here because both modules build on this one.
+        from prediction_server import request
+
+        try:
+            status, result = request(args.server, "/game", {"home": args.home_team, "away": args.away_team})
+        except (OSError, ValueError) as exc:
+            parser.exit(1, f"Could not reach {args.server}: {exc}\n")
+        if status != 200:
+            parser.exit(1, f"Server error: {result.get('error')}\n")
+    else:
+        from model_snapshot import load_model
+        from prediction_server import game_prediction
+
+        model = load_model(
+            args.data or 'data/sample_games.csv',
+            args.stats or 'data/sample_player_stats.csv',
+            engine=args.engine or 'average',
+        )
+        result = game_prediction(model, args.home_team, args.away_team)
+
+    print(result["reasoning"])
+    print(f"Predicted probability {args.home_team} beats {args.away_team}: {result['prob_home']:.3f}")
+    print(
+        f"Predicted final score: {args.home_team} {result['home_score']} - "
+        f"{args.away_team} {result['away_score']}"
+    )
 
-    h_players = ", ".join(team_players.get(args.home_team, []))
-    a_players = ", ".join(team_players.get(args.away_team, []))
+    h_players = ", ".join(result["home_players"])
+    a_players = ", ".join(result["away_players"])
     print(f"Players {args.home_team}: {h_players}")
     print(f"Players {args.away_team}: {a_players}")
 
@@ -0,0 +1,160 @@
+"""Team and player lookups over box scores, built once and extended in place.
+
+Rows are numbered in the order they were added, across every ``extend``
+call, so row ``i`` is line ``i`` of the box scores concatenated in that
+order (for a file, simply its ``i``-th stat line).
+"""
+
+from array import array
+
+import numpy as np
+
+from player_table import PlayerStatTableBuilder, as_player_table, latest_rows
+
+
+class RosterIndex:
+    """Team -> players, player -> rows by date and player -> current team.
+
+    Every lookup is a dict access. ``extend`` costs O(new rows) plus one
+    step per player and team they touch; a player's rows are only
+    re-sorted when a new line predates one already indexed. The current
+    team is the team on the player's latest dated line (the later line
+    wins a same-day tie), so a traded player moves to the new team's
+    ``roster`` while ``team_players`` keeps everyone who played for a team.
+    """
+
+    def __init__(self, stats=()):
+        self.players = []
+        self.player_index = {}
+        self.teams = []
+        self.team_index = {}
+        self.n_rows = 0
+        self._rows = []  # player id -> array of row numbers, date order
+        self._days = []  # player id -> array of the matching days
+        self._current = []  # player id -> (day, row, team id) of the latest team line
+        self._members = {}  # team name -> set of every player seen with it
+        self._roster = {}  # team name -> set of players currently on it
+        self._sorted = {}  # (kind, team) -> sorted list, dropped when the set changes
+        self.extend(stats)
+
+    def __len__(self):
+        return len(self.players)
+
+    def __contains__(self, player):
+        return player in self.player_index
+
+    def extend(self, stats) -> None:
+        """Index new box-score lines (``PlayerStatTable`` or stat dicts)."""
+        table = as_player_table(stats)
+        n = len(table)
+        if not n:
+            return
+        intern = PlayerStatTableBuilder._intern
+        player_ids = np.fromiter(
+            (intern(name, self.players, self.player_index) for name in table.players),
+            dtype=np.intp, count=len(table.players),
+        )
+        team_ids = np.fromiter(
+            (intern(name, self.teams, self.team_index) for name in table.teams),
+            dtype=np.intp, count=len(table.teams),
+        )
+        for _ in range(len(self.players) - len(self._rows)):
+            self._rows.append(array('q'))
+            self._days.append(array('i'))
+            self._current.append(None)
+
+        rows = np.arange(self.n_rows, self.n_rows + n)
+        self.n_rows += n
+        # A -1 player id means the line names no player; it is not indexed.
+        named = np.flatnonzero(table.player >= 0)
+        if len(named) < n:
+            table, rows = table.select(named), rows[named]
+            n = len(named)
+            if not n:
+                return
+        pid = player_ids[table.player]
+        day = np.asarray(table.day)
+
+        order = np.lexsort((rows, day, pid))
+        grouped = pid[order]
+        starts = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]])
+        stops = np.r_[starts[1:], n]
+        for p, start, stop in zip(grouped[starts].tolist(), starts.tolist(), stops.tolist()):
+            self._add_rows(p, rows[order[start:stop]], day[order[start:stop]])
+
+        on_team = np.flatnonzero(table.team >= 0)
+        if not len(on_team):
+            return
+        tid = team_ids[table.team[on_team]]
+        pairs = np.unique(tid * len(self.players) + pid[on_team])
+        for t, p in zip(*np.divmod(pairs, len(self.players))):
+            self._join(self._members, "all", self.teams[t], self.players[p])
+
+        latest_pid, latest = latest_rows(pid[on_team], day[on_team])
+        for p, i in zip(latest_pid.tolist(), latest.tolist()):
+            key = (int(day[on_team[i]]), int(rows[on_team[i]]), int(tid[i]))
+            current = self._current[p]
+            if current is not None and key[0] < current[0]:
+                continue
+            self._current[p] = key
+            if current is None or current[2] != key[2]:
+                name = self.players[p]
+                if current is not None:
+                    self._leave(self.teams[current[2]], name)
+                self._join(self._roster, "current", self.teams[key[2]], name)
+
+    def _add_rows(self, p, rows, days):
+        old_rows, old_days = self._rows[p], self._days[p]
+        if old_days and days[0] < old_days[-1]:
+            # A line older than one already indexed: merge this player's rows.
+            all_days = np.concatenate((np.frombuffer(old_days, dtype=np.int32), days))
+            all_rows = np.concatenate((np.frombuffer(old_rows, dtype=np.int64), rows))
+            order = np.lexsort((all_rows, all_days))
+            self._rows[p] = array('q', all_rows[order].tolist())
+            self._days[p] = array('i', all_days[order].tolist())
+        else:
+            old_rows.extend(rows.tolist())
+            old_days.extend(days.tolist())
+
+    def _join(self, groups, kind, team, player):
+        members = groups.setdefault(team, set())
+        if player not in members:
+            members.add(player)
+            self._sorted.pop((kind, team), None)
+
+    def _leave(self, team, player):
+        self._roster[team].discard(player)
+        self._sorted.pop(("current", team), None)
+
+    def _names(self, groups, kind, team):
+        names = self._sorted.get((kind, team))
+        if names is None:
+            if team not in groups:
+                return []
+            names = self._sorted[(kind, team)] = sorted(groups[team])
+        return names
+
+    def team_players(self, team: str | None = None):
+        """Everyone who has played for ``team``, sorted; all teams as a dict if ``None``.
+
+        The dict form matches ``predictor.compute_team_players``.
+        """
+        if team is None:
+            return {t: list(self._names(self._members, "all", t)) for t in self._members}
+        return self._names(self._members, "all", team)
+
+    def roster(self, team: str) -> list:
+        """Players whose latest line is with ``team``, sorted."""
+        return self._names(self._roster, "current", team)
+
+    def current_team(self, player: str) -> str | None:
+        p = self.player_index.get(player)
+        current = self._current[p] if p is not None else None
+        return self.teams[current[2]] if current else None
+
+    def player_rows(self, player: str) -> np.ndarray:
+        """Row numbers of ``player``'s lines, oldest first."""
+        p = self.player_index.get(player)
+        if p is None:
+            return np.zeros(0, dtype=np.int64)
+        return np.array(self._rows[p], dtype=np.int64)
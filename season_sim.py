@@ -0,0 +1,192 @@
+"""Monte Carlo season simulator built on the team ratings and logistic model.
+
+Every remaining game is an independent Bernoulli draw with the home win
+probability from ``predict_batch``. Simulations run in fixed-size batches,
+each seeded from its own ``SeedSequence`` child, and batches are spread over
+a process pool. Because the batch layout does not depend on the number of
+workers, a given seed gives the same result on one core or many.
+"""
+
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from game_table import as_game_table
+from predictor import HOME_WEIGHT, compute_team_ratings, load_games, predict_batch
+from teams import ALL_TEAMS, EASTERN_CONFERENCE, WESTERN_CONFERENCE
+from tuning import RATING_PARAMS, load_params
+
+BATCH_SIZE = 5000
+CONFERENCE_SIZE = 15
+PLAYOFF_SEEDS = 6
+PLAY_IN_SEEDS = 10
+
+
+def load_schedule(path):
+    """Return ``(home_team, away_team)`` pairs for games without a final score."""
+    pairs = []
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            if not (row.get('home_points') and row.get('away_points')):
+                pairs.append((row['home_team'], row['away_team']))
+    return pairs
+
+
+def current_wins(games, teams=ALL_TEAMS):
+    """Return wins so far for each of ``teams`` from played ``games``."""
+    table = as_game_table(games)
+    winners = np.where(table.home_points > table.away_points, table.home, table.away)
+    by_id = np.bincount(winners, minlength=len(table.teams))
+    return np.array([by_id[table.team_id(t)] if t in table.team_index else 0 for t in teams], dtype=np.int32)
+
+
+def _simulate_batch(task):
+    """Run one batch of seasons; a top-level function so workers can pickle it."""
+    probs, home, away, base_wins, conferences, n_sims, seed = task
+    rng = np.random.Generator(np.random.PCG64(seed))
+    n_teams = len(base_wins)
+    n_games = len(probs)
+    max_wins = int(base_wins.max()) + n_games + 1
+
+    # (games x teams) incidence matrices turn per-game results into win totals
+    # with one matrix product per batch.
+    home_onehot = np.zeros((n_games, n_teams), dtype=np.float32)
+    home_onehot[np.arange(n_games), home] = 1
+    away_onehot = np.zeros((n_games, n_teams), dtype=np.float32)
+    away_onehot[np.arange(n_games), away] = 1
+
+    home_won = (rng.random((n_sims, n_games), dtype=np.float32) < probs).astype(np.float32)
+    wins = home_won @ home_onehot + (1 - home_won) @ away_onehot
+    wins = wins.astype(np.int32) + base_wins
+
+    win_counts = np.zeros((n_teams, max_wins), dtype=np.int64)
+    for t in range(n_teams):
+        win_counts[t] = np.bincount(wins[:, t], minlength=max_wins)[:max_wins]
+
+    # Rank within each conference; a random fraction breaks ties.
+    seed_counts = np.zeros((n_teams, CONFERENCE_SIZE), dtype=np.int64)
+    noisy = wins + rng.random(wins.shape)
+    for members in conferences:
+        order = np.argsort(-noisy[:, members], axis=1)
+        for seed_pos in range(len(members)):
+            seed_counts[members, seed_pos] += np.bincount(order[:, seed_pos], minlength=len(members))
+    return win_counts, seed_counts
+
+
+def simulate_season(
+    schedule,
+    ratings,
+    base_wins=None,
+    n_sims: int = 100_000,
+    seed: int = 0,
+    workers: int | None = None,
+    k: float = 0.1,
+    home_weight: float = HOME_WEIGHT,
+    batch_size: int = BATCH_SIZE,
+    teams=ALL_TEAMS,
+):
+    """Simulate the rest of the season ``n_sims`` times.
+
+    Returns a dict with ``teams``, ``win_counts`` (teams x final wins),
+    ``seed_counts`` (teams x conference seed) and ``n_sims``.
+    """
+    index = {t: i for i, t in enumerate(teams)}
+    schedule = [(h, a) for h, a in schedule if h in index and a in index]
+    probs = np.zeros(0, dtype=np.float32)
+    if schedule:
+        probs = predict_batch(schedule, ratings, {}, k=k, home_weight=home_weight)[0].astype(np.float32)
+    home = np.array([index[h] for h, _ in schedule], dtype=np.intp)
+    away = np.array([index[a] for _, a in schedule], dtype=np.intp)
+    if base_wins is None:
+        base_wins = np.zeros(len(teams), dtype=np.int32)
+    base_wins = np.asarray(base_wins, dtype=np.int32)
+    conferences = [
+        np.array([index[t] for t in conf if t in index], dtype=np.intp)
+        for conf in (EASTERN_CONFERENCE, WESTERN_CONFERENCE)
+    ]
+
+    sizes = [batch_size] * (n_sims // batch_size)
+    if n_sims % batch_size:
+        sizes.append(n_sims % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [
+        (probs, home, away, base_wins, conferences, size, child)
+        for size, child in zip(sizes, seeds)
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        results = map(_simulate_batch, tasks)
+        return _combine(teams, results, n_sims)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return _combine(teams, pool.map(_simulate_batch, tasks), n_sims)
+
+
+def _combine(teams, results, n_sims):
+    win_counts = 0
+    seed_counts = 0
+    for wc, sc in results:
+        win_counts = win_counts + wc
+        seed_counts = seed_counts + sc
+    return {
+        'teams': list(teams),
+        'win_counts': win_counts,
+        'seed_counts': seed_counts,
+        'n_sims': n_sims,
+    }
+
+
+def summarize(result):
+    """Return per-team mean wins, playoff, play-in and seed probabilities."""
+    n = result['n_sims']
+    wins = np.arange(result['win_counts'].shape[1])
+    summary = {}
+    for i, team in enumerate(result['teams']):
+        seeds = result['seed_counts'][i] / n
+        summary[team] = {
+            'mean_wins': float(result['win_counts'][i] @ wins / n),
+            'playoff_prob': float(seeds[:PLAYOFF_SEEDS].sum()),
+            'play_in_prob': float(seeds[PLAYOFF_SEEDS:PLAY_IN_SEEDS].sum()),
+            'seed_probs': seeds.tolist(),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the rest of the NBA season")
+    parser.add_argument('--data', default='data/sample_games.csv', help='Path to games CSV data')
+    parser.add_argument('--schedule', required=True, help='CSV of remaining games (rows without scores)')
+    parser.add_argument('--since', help='First date of the current season, for the standings')
+    parser.add_argument('--sims', type=int, default=100_000, help='Number of simulated seasons')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: all cores)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    params = load_params()
+    games = load_games(args.data)
+    ratings = compute_team_ratings(games, **{name: params[name] for name in RATING_PARAMS})
+    played = load_games(args.data, since=args.since) if args.since else games
+    result = simulate_season(
+        load_schedule(args.schedule),
+        ratings,
+        base_wins=current_wins(played),
+        n_sims=args.sims,
+        seed=args.seed,
+        workers=args.workers,
+        k=params['k'],
+        home_weight=params['home_weight'],
+    )
+    summary = summarize(result)
+    print(f"{'Team':<24} {'Wins':>6} {'Playoff':>8} {'Play-in':>8} {'#1 seed':>8}")
+    for team, s in sorted(summary.items(), key=lambda kv: -kv[1]['mean_wins']):
+        print(
+            f"{team:<24} {s['mean_wins']:6.1f} {s['playoff_prob']:8.1%} "
+            f"{s['play_in_prob']:8.1%} {s['seed_probs'][0]:8.1%}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,298 @@
+"""Precomputed model published once and memory-mapped by every process.
+
+``publish`` builds the model (ratings, point averages, rosters, player
+averages and the head-to-head layout) and writes it as ``.npy`` arrays
+plus a small JSON name table into a new version directory under
+``data/.cache/shared-<id>/``. A ``CURRENT`` file names the live version
+and is replaced atomically, so readers switch from one complete version
+to the next and never see a half-written one.
+
+``SharedModel`` attaches a version read-only with ``mmap_mode='r'``:
+processes and sessions on one machine share the same page-cached arrays
+instead of each holding a pickled copy. It offers the ``Model`` attributes
+the predictors use (``ratings``, ``team_avgs``, ``team_players``,
+``player_avgs``, ``k``, ``home_weight``) plus ``matchups``.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Mapping
+
+import numpy as np
+
+from game_table import day_string
+from tuning import PARAMS_FILE, load_params
+
+CURRENT = "CURRENT"
+KEEP_VERSIONS = 2  # the live version and the one readers may still have mapped
+AVG_FIELDS = ("scored", "allowed")
+
+
+def shared_dir(games_path: str, stats_path: str, engine: str = "average") -> str:
+    """Return the directory holding the published versions for these inputs."""
+    ident = repr((os.path.abspath(games_path), os.path.abspath(stats_path), engine))
+    name = "shared-" + hashlib.sha1(ident.encode()).hexdigest()[:12]
+    return os.path.join(os.path.dirname(os.path.abspath(games_path)), ".cache", name)
+
+
+def current_version(root: str) -> str | None:
+    try:
+        with open(os.path.join(root, CURRENT)) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _version_id(sources, params: dict) -> str:
+    keys = []
+    for path in sources:
+        st = os.stat(path) if os.path.exists(path) else None
+        keys.append((os.path.abspath(path), st and st.st_mtime_ns, st and st.st_size))
+    ident = repr((keys, sorted(params.items())))
+    return "v-" + hashlib.sha1(ident.encode()).hexdigest()[:16]
+
+
+class _Rows(Mapping):
+    """Read-only ``name -> dict`` view over the rows of a 2-D array."""
+
+    def __init__(self, names, fields, values, present):
+        self._index = {name: i for i, name in enumerate(names) if present[i]}
+        self._fields = fields
+        self._values = values
+
+    def __getitem__(self, name):
+        return dict(zip(self._fields, self._values[self._index[name]].tolist()))
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+
+class _Rosters(Mapping):
+    """Read-only ``team -> [player, ...]`` view over a flat index array."""
+
+    def __init__(self, teams, players, members, starts):
+        self._bounds = {
+            team: (int(starts[i]), int(starts[i + 1]))
+            for i, team in enumerate(teams) if starts[i + 1] > starts[i]
+        }
+        self._players = players
+        self._members = members
+
+    def __getitem__(self, team):
+        start, stop = self._bounds[team]
+        return [self._players[i] for i in self._members[start:stop].tolist()]
+
+    def __iter__(self):
+        return iter(self._bounds)
+
+    def __len__(self):
+        return len(self._bounds)
+
+
+class SharedModel:
+    """One published model version, attached read-only."""
+
+    def __init__(self, root: str, version: str | None = None):
+        version = version or current_version(root)
+        if version is None:
+            raise FileNotFoundError(f"no model published in {root}")
+        self.root = root
+        self.version = version
+        directory = os.path.join(root, version)
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        arrays = {
+            name[:-4]: np.load(os.path.join(directory, name), mmap_mode="r")
+            for name in os.listdir(directory) if name.endswith(".npy")
+        }
+        self._arrays = arrays
+
+        teams, players = meta["teams"], meta["players"]
+        self.teams = teams
+        self.players = meta["player_order"]
+        self.params = meta["params"]
+        self.k = meta["k"]
+        self.home_weight = meta["home_weight"]
+        self.latest_day = meta["latest_day"]
+        self.sources = meta["sources"]
+
+        # Thirty teams: plain dicts are cheapest to read.
+        ratings = arrays["ratings"].tolist()
+        self.ratings = {t: r for t, r in zip(teams, ratings) if r == r}
+        avgs = arrays["team_avgs"].tolist()
+        self.team_avgs = {t: dict(zip(AVG_FIELDS, a)) for t, a in zip(teams, avgs) if a[0] == a[0]}
+        self.team_players = _Rosters(teams, players, arrays["roster"], arrays["roster_starts"])
+        self.player_avgs = _Rows(players, meta["player_fields"], arrays["player_avgs"], arrays["has_avgs"])
+
+        self._team_index = {t: i for i, t in enumerate(teams)}
+        self._pair_n = meta["pair_n"]
+        starts = arrays["pair_starts"].tolist()
+        stops = starts[1:] + [len(arrays["m_day"])]
+        self._pairs = dict(zip(arrays["pair_keys"].tolist(), zip(starts, stops)))
+
+    def is_current(self) -> bool:
+        """False once a newer version has been published."""
+        return current_version(self.root) == self.version
+
+    def matchup_count(self, team_a: str, team_b: str) -> int:
+        start, stop = self._pair_bounds(team_a, team_b)
+        return stop - start
+
+    def _pair_bounds(self, team_a: str, team_b: str):
+        a = self._team_index.get(team_a)
+        b = self._team_index.get(team_b)
+        if a is None or b is None:
+            return 0, 0
+        return self._pairs.get(min(a, b) * self._pair_n + max(a, b), (0, 0))
+
+    def matchups(self, team_a: str, team_b: str):
+        """Return the two teams' meetings as a DataFrame, most recent first."""
+        import pandas as pd
+
+        from matchup_index import MATCHUP_COLUMNS
+
+        start, stop = self._pair_bounds(team_a, team_b)
+        a = self._arrays
+        teams = self.teams
+        return pd.DataFrame({
+            "date": [day_string(d) for d in a["m_day"][start:stop].tolist()],
+            "home_team": [teams[i] for i in a["m_home"][start:stop].tolist()],
+            "away_team": [teams[i] for i in a["m_away"][start:stop].tolist()],
+            "home_points": a["m_home_points"][start:stop].astype(int),
+            "away_points": a["m_away_points"][start:stop].astype(int),
+        }, columns=MATCHUP_COLUMNS)
+
+
+def _model_arrays(model, games):
+    """Lay a ``Model`` and its games out as named arrays plus JSON metadata."""
+    from matchup_index import pair_layout
+
+    teams = list(games.teams)
+    for name in list(model.ratings) + list(model.team_avgs) + list(model.team_players):
+        if name not in games.team_index and name not in teams:
+            teams.append(name)
+    team_index = {t: i for i, t in enumerate(teams)}
+
+    ratings = np.full(len(teams), np.nan)
+    for team, rating in model.ratings.items():
+        ratings[team_index[team]] = rating
+    team_avgs = np.full((len(teams), len(AVG_FIELDS)), np.nan)
+    for team, avgs in model.team_avgs.items():
+        team_avgs[team_index[team]] = [avgs[f] for f in AVG_FIELDS]
+
+    players = sorted(set(model.player_avgs).union(*model.team_players.values()))
+    player_index = {p: i for i, p in enumerate(players)}
+    fields = list(next(iter(model.player_avgs.values()), {}))
+    player_avgs = np.zeros((len(players), len(fields)))
+    has_avgs = np.zeros(len(players), dtype=bool)
+    for name, avgs in model.player_avgs.items():
+        i = player_index[name]
+        player_avgs[i] = [avgs[f] for f in fields]
+        has_avgs[i] = True
+
+    roster, starts = [], [0]
+    for team in teams:
+        roster.extend(player_index[p] for p in model.team_players.get(team, []))
+        starts.append(len(roster))
+
+    order, keys, pair_starts, pair_n = pair_layout(games)
+    arrays = {
+        "ratings": ratings,
+        "team_avgs": team_avgs,
+        "player_avgs": player_avgs,
+        "has_avgs": has_avgs,
+        "roster": np.array(roster, dtype=np.int32),
+        "roster_starts": np.array(starts, dtype=np.int64),
+        "m_day": games.day[order],
+        "m_home": games.home[order],
+        "m_away": games.away[order],
+        "m_home_points": games.home_points[order],
+        "m_away_points": games.away_points[order],
+        "pair_keys": keys,
+        "pair_starts": pair_starts,
+    }
+    meta = {
+        "teams": teams,
+        "players": players,
+        "player_order": sorted(model.player_avgs),
+        "player_fields": fields,
+        "pair_n": pair_n,
+        "params": model.params,
+        "k": model.k,
+        "home_weight": model.home_weight,
+        "latest_day": int(games.day.max()) if len(games) else None,
+    }
+    return arrays, meta
+
+
+def publish(games_path: str, stats_path: str, params_path: str = PARAMS_FILE,
+            engine: str = "average", root: str | None = None) -> str:
+    """Publish the model for these inputs unless it already is; return its version.
+
+    The version id is derived from the source files' size and mtime and
+    the parameters, so checking an up-to-date model costs a few ``stat``
+    calls. Concurrent publishers of the same version are harmless: the
+    first rename wins and the others discard their copy.
+    """
+    from model_snapshot import load_model
+    from predictor import load_games
+
+    root = root or shared_dir(games_path, stats_path, engine)
+    sources = [games_path, stats_path, params_path]
+    params = dict(load_params(params_path), engine=engine)
+    version = _version_id(sources, params)
+    final = os.path.join(root, version)
+    if current_version(root) == version and os.path.isdir(final):
+        return version
+
+    if not os.path.isdir(final):
+        model = load_model(games_path, stats_path, params_path=params_path, engine=engine)
+        games = load_games(games_path)
+        arrays, meta = _model_arrays(model, games)
+        meta["sources"] = [os.path.abspath(p) for p in sources]
+
+        tmp = os.path.join(root, f".{version}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        for name, values in arrays.items():
+            np.save(os.path.join(tmp, name + ".npy"), np.ascontiguousarray(values))
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump(meta, f)
+        try:
+            os.rename(tmp, final)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.isdir(final):
+                raise
+
+    pointer = os.path.join(root, f".{CURRENT}.{os.getpid()}.tmp")
+    with open(pointer, "w") as f:
+        f.write(version)
+    previous = current_version(root)
+    os.replace(pointer, os.path.join(root, CURRENT))
+    _prune(root, keep={version, previous})
+    return version
+
+
+def _prune(root: str, keep) -> None:
+    """Delete all but the newest ``KEEP_VERSIONS`` versions, never ``keep``."""
+    versions = [
+        name for name in os.listdir(root)
+        if name.startswith("v-") and os.path.isdir(os.path.join(root, name))
+    ]
+    versions.sort(key=lambda name: os.path.getmtime(os.path.join(root, name)), reverse=True)
+    for name in versions[KEEP_VERSIONS:]:
+        if name not in keep:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+def attach(games_path: str, stats_path: str, params_path: str = PARAMS_FILE,
+           engine: str = "average") -> SharedModel:
+    """Publish if needed, then attach the current version."""
+    version = publish(games_path, stats_path, params_path, engine)
+    return SharedModel(shared_dir(games_path, stats_path, engine), version)
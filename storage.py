@@ -0,0 +1,240 @@
+"""SQLite storage backend for games and player box scores.
+
+The CSV files remain the interchange format; ``import_csv`` and
+``export_csv`` move data between the two. ``predictor.load_games`` and
+``player_predictor.load_player_stats`` accept a ``.sqlite`` path and push
+their filters down into indexed SQL queries.
+"""
+
+import csv
+import os
+import sqlite3
+from typing import Dict, Iterable, List
+
+from game_table import CHUNK_ROWS, GameTable, GameTableBuilder
+from player_table import STAT_KEYS, PlayerStatTableBuilder
+
+DB_FILE = os.path.join("data", "nba.sqlite")
+SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+
+GAME_COLUMNS = ["id", "date", "home_team", "away_team", "home_points", "away_points"]
+STAT_COLUMNS = [
+    "game_id", "player_id", "date", "player", "team", "opponent",
+    "points", "rebounds", "assists", "steals", "fgm", "fga", "ftm", "fta",
+]
+# Box-score columns not every updater provides; read back as 0 when missing.
+STAT_NUMBERS = ["points", "rebounds", "assists", "steals", "fgm", "fga", "ftm", "fta"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER,
+    date TEXT NOT NULL,
+    home_team TEXT NOT NULL,
+    away_team TEXT NOT NULL,
+    home_points INTEGER,
+    away_points INTEGER
+);
+CREATE UNIQUE INDEX IF NOT EXISTS games_id ON games (id);
+CREATE UNIQUE INDEX IF NOT EXISTS games_no_id
+    ON games (date, home_team, away_team) WHERE id IS NULL;
+CREATE INDEX IF NOT EXISTS games_date ON games (date);
+CREATE INDEX IF NOT EXISTS games_home ON games (home_team, date);
+CREATE INDEX IF NOT EXISTS games_away ON games (away_team, date);
+
+CREATE TABLE IF NOT EXISTS player_stats (
+    game_id INTEGER,
+    player_id INTEGER,
+    date TEXT,
+    player TEXT NOT NULL,
+    team TEXT,
+    opponent TEXT,
+    points INTEGER,
+    rebounds INTEGER,
+    assists INTEGER,
+    steals INTEGER,
+    fgm INTEGER,
+    fga INTEGER,
+    ftm INTEGER,
+    fta INTEGER
+);
+CREATE UNIQUE INDEX IF NOT EXISTS player_stats_key ON player_stats (game_id, player);
+CREATE UNIQUE INDEX IF NOT EXISTS player_stats_no_game
+    ON player_stats (date, player, COALESCE(team, '')) WHERE game_id IS NULL;
+CREATE INDEX IF NOT EXISTS player_stats_player ON player_stats (player, date);
+CREATE INDEX IF NOT EXISTS player_stats_team ON player_stats (team, date);
+CREATE INDEX IF NOT EXISTS player_stats_date ON player_stats (date);
+"""
+
+# SQLite treats NULLs as distinct in a UNIQUE index, so rows without a game
+# id get their own partial keys above. Stores written before those keys
+# existed may hold repeats; keep the first copy so the index can be built.
+_DEDUPE_NULL_KEYS = """
+DELETE FROM games WHERE id IS NULL AND rowid NOT IN (
+    SELECT MIN(rowid) FROM games WHERE id IS NULL
+    GROUP BY date, home_team, away_team);
+DELETE FROM player_stats WHERE game_id IS NULL AND rowid NOT IN (
+    SELECT MIN(rowid) FROM player_stats WHERE game_id IS NULL
+    GROUP BY date, player, COALESCE(team, ''));
+"""
+
+
+def is_sqlite_path(path) -> bool:
+    return str(path).endswith(SQLITE_SUFFIXES)
+
+
+def _where(clauses: List[str]) -> str:
+    return " WHERE " + " AND ".join(clauses) if clauses else ""
+
+
+class SQLiteStore:
+    """Games and player stats in one SQLite file with indexed lookups."""
+
+    def __init__(self, path: str = DB_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        with self.conn:
+            names = {r[0] for r in self.conn.execute("SELECT name FROM sqlite_master")}
+            if "player_stats" in names and "player_stats_no_game" not in names:
+                self.conn.executescript(_DEDUPE_NULL_KEYS)
+            self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- writes ---
+
+    def insert_games(self, rows: Iterable[Dict]) -> int:
+        """Bulk-insert game rows, ignoring games already stored.
+
+        A game is keyed on its id, or on ``(date, home_team, away_team)``
+        when it has none.
+        """
+        with self.conn:
+            cur = self.conn.executemany(
+                f"INSERT OR IGNORE INTO games ({', '.join(GAME_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(GAME_COLUMNS))})",
+                ([r.get(c) if r.get(c) != "" else None for c in GAME_COLUMNS] for r in rows),
+            )
+        return cur.rowcount
+
+    def insert_player_stats(self, rows: Iterable[Dict]) -> int:
+        """Bulk-insert box-score rows, ignoring ``(game_id, player)`` repeats.
+
+        Rows without a game id are keyed on ``(date, player, team)``.
+        """
+        with self.conn:
+            cur = self.conn.executemany(
+                f"INSERT OR IGNORE INTO player_stats ({', '.join(STAT_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(STAT_COLUMNS))})",
+                ([r.get(c) if r.get(c) != "" else None for c in STAT_COLUMNS] for r in rows),
+            )
+        return cur.rowcount
+
+    # --- queries ---
+
+    def query_games(self, team: str | None = None, since: str | None = None,
+                    until: str | None = None, played_only: bool = True):
+        """Return game rows in date order, filtered inside SQLite."""
+        clauses, args = [], []
+        if played_only:
+            clauses.append("home_points IS NOT NULL AND away_points IS NOT NULL")
+        if since:
+            clauses.append("date >= ?")
+            args.append(since)
+        if until:
+            clauses.append("date <= ?")
+            args.append(until)
+        if team:
+            # SQLite answers this OR with one lookup per (team, date) index.
+            clauses.append("(home_team = ? OR away_team = ?)")
+            args += [team, team]
+        sql = f"SELECT {', '.join(GAME_COLUMNS)} FROM games" + _where(clauses)
+        return self.conn.execute(sql + " ORDER BY date, rowid", args)
+
+    def load_game_table(self, team: str | None = None, since: str | None = None,
+                        until: str | None = None) -> GameTable:
+        builder = GameTableBuilder()
+        for r in self.query_games(team, since, until):
+            builder.add(r["date"], r["home_team"], r["away_team"],
+                        r["home_points"], r["away_points"], r["id"] if r["id"] is not None else -1)
+        return builder.build()
+
+    def iter_game_tables(self, chunk_rows: int = CHUNK_ROWS, team: str | None = None,
+                         since: str | None = None, until: str | None = None):
+        """Yield the matching games as ``GameTable`` chunks with shared team ids."""
+        cur = self.query_games(team, since, until)
+        builder = GameTableBuilder()
+        while True:
+            rows = cur.fetchmany(chunk_rows)
+            if not rows:
+                return
+            for r in rows:
+                builder.add(r["date"], r["home_team"], r["away_team"],
+                            r["home_points"], r["away_points"], r["id"] if r["id"] is not None else -1)
+            yield builder.build()
+            builder = builder.fresh()
+
+    def iter_player_tables(self, chunk_rows: int = CHUNK_ROWS, player: str | None = None,
+                           team: str | None = None, since: str | None = None):
+        """Yield the matching box scores as ``PlayerStatTable`` chunks."""
+        cur = self.query_player_stats(player, team, since)
+        builder = PlayerStatTableBuilder()
+        while True:
+            rows = cur.fetchmany(chunk_rows)
+            if not rows:
+                return
+            for r in rows:
+                builder.add(r["player"], [r[k] for k in STAT_KEYS], r["team"], r["date"],
+                            r["game_id"] if r["game_id"] is not None else -1)
+            yield builder.build()
+            builder = builder.fresh()
+
+    def query_player_stats(self, player: str | None = None, team: str | None = None,
+                           since: str | None = None, until: str | None = None,
+                           last: int | None = None):
+        """Return box-score rows in date order; ``last`` keeps the most recent N."""
+        clauses, args = [], []
+        for column, value in (("player", player), ("team", team)):
+            if value:
+                clauses.append(f"{column} = ?")
+                args.append(value)
+        if since:
+            clauses.append("date >= ?")
+            args.append(since)
+        if until:
+            clauses.append("date <= ?")
+            args.append(until)
+        numbers = ", ".join(f"COALESCE({c}, 0) AS {c}" for c in STAT_NUMBERS)
+        sql = f"SELECT game_id, player_id, date, player, team, opponent, {numbers} FROM player_stats"
+        sql += _where(clauses)
+        if last:
+            sql = f"SELECT * FROM ({sql} ORDER BY date DESC, rowid DESC LIMIT ?) ORDER BY date"
+            args.append(last)
+        else:
+            sql += " ORDER BY date, rowid"
+        return self.conn.execute(sql, args)
+
+    # --- CSV compatibility ---
+
+    def import_csv(self, kind: str, path: str) -> int:
+        """Load a ``games`` or ``player_stats`` CSV into the store."""
+        insert = {"games": self.insert_games, "player_stats": self.insert_player_stats}[kind]
+        with open(path, newline="") as f:
+            return insert(csv.DictReader(f))
+
+    def export_csv(self, kind: str, path: str) -> None:
+        """Write a ``games`` or ``player_stats`` table back out as CSV."""
+        columns = {"games": GAME_COLUMNS, "player_stats": STAT_COLUMNS}[kind]
+        cur = self.conn.execute(f"SELECT {', '.join(columns)} FROM {kind} ORDER BY date, rowid")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(tuple(row) for row in cur)
@@ -1,21 +1,21 @@
+import argparse
 import math
+from datetime import date
 import streamlit as st
-import pandas as pd
-from predictor import (
-    load_games,
-    compute_team_ratings,
-    compute_team_point_avgs,
-
-    compute_team_players,
-
-
-    predict_final_score,
-)
-from player_predictor import load_player_stats, compute_averages
+from elo import EloRatings
+from model_refresh import ModelRefresher
+from predictor import load_games, predict_final_score
+from shared_model import publish, shared_dir, SharedModel
 from teams import ALL_TEAMS
+from tuning import PARAMS_FILE
 
-GAMES_PATH = 'data/sample_games.csv'
-STATS_PATH = 'data/sample_player_stats.csv'
+# Options go after a "--": streamlit run streamlit_app.py -- --data data/nba_games.csv
+_parser = argparse.ArgumentParser(description='NBA Predictor web app')
+_parser.add_argument('--data', default='data/sample_games.csv', help='Games CSV to load and watch')
+_parser.add_argument('--stats', default='data/sample_player_stats.csv', help='Player stats CSV to load and watch')
+_args, _ = _parser.parse_known_args()
+GAMES_PATH = _args.data
+STATS_PATH = _args.stats
 
 
 def logistic(x, k=0.1):
@@ -23,26 +23,35 @@ def logistic(x, k=0.1):
 
 
 # === CACHED LOADERS ===
-@st.cache_data
-def get_games_and_ratings():
-    games = load_games(GAMES_PATH)
-
-    # ❌ Remove or comment this
-    # ratings = compute_team_ratings(games, trade_date=None)
-    # avgs = compute_team_point_avgs(games, trade_date=None)
-
-    # ✅ Use this version instead
-    ratings = compute_team_ratings(games)
-    avgs = compute_team_point_avgs(games)
-
-    return games, ratings, avgs
-
-@st.cache_data
-def get_player_stats():
-    stats = load_player_stats(STATS_PATH)
-    averages = compute_averages(stats)
-    team_players = compute_team_players(stats)
-    return stats, averages, team_players
+# The model is published once to memory-mapped files (see shared_model) and
+# every session of every server process attaches the same read-only copy;
+# st.cache_resource hands out that object instead of pickling a new one.
+@st.cache_resource(max_entries=2)
+def attach_model(version):
+    return SharedModel(shared_dir(GAMES_PATH, STATS_PATH), version)
+
+@st.cache_resource
+def get_refresher():
+    # One watcher thread per server process republishes the model when the
+    # data files change, e.g. after update_data's scheduled job, so no
+    # request ever waits on a rebuild except the very first one.
+    paths = [GAMES_PATH, STATS_PATH, PARAMS_FILE]
+    return ModelRefresher(paths, lambda: publish(GAMES_PATH, STATS_PATH)).start()
+
+def get_model():
+    refresher = get_refresher()
+    version = refresher.model
+    if version is None:
+        with st.spinner('Loading data...'):
+            version = refresher.wait()
+    if version is None:
+        st.error(f'Could not load the data: {refresher.error}')
+        st.stop()
+    return attach_model(version)
+
+@st.cache_resource(max_entries=2)
+def get_elo(version):
+    return EloRatings.from_games(load_games(GAMES_PATH))
 
 
 # === PAGE SETUP ===
@@ -53,22 +62,23 @@ mode = st.selectbox('Prediction Type', ['Game Outcome', 'Player Averages'])
 
 # === GAME OUTCOME ===
 if mode == 'Game Outcome':
-    games, ratings, team_avgs = get_games_and_ratings()
-
-    _, _, team_players = get_player_stats()
-
+    # Elo history is only replayed once a prediction is asked for.
+    model = get_model()
+    ratings, team_avgs = model.ratings, model.team_avgs
 
     teams = sorted(ALL_TEAMS)
 
     home_team = st.selectbox('🏠 Home Team', teams)
     away_team = st.selectbox('🚌 Away Team', teams, index=1)
+    latest = date.fromordinal(model.latest_day) if model.latest_day else date.today()
+    as_of = st.date_input('📅 Elo ratings as of', value=latest)
 
     if st.button('🔮 Predict', use_container_width=True):
         if home_team == away_team:
             st.warning('Choose two different teams.')
         else:
-            diff = ratings.get(home_team, 0) - ratings.get(away_team, 0)
-            prob = logistic(diff)
+            diff = ratings.get(home_team, 0) * model.home_weight - ratings.get(away_team, 0)
+            prob = logistic(diff, model.k)
             home_score, away_score = predict_final_score(home_team, away_team, team_avgs)
             winner = home_team if prob >= 0.5 else away_team
             explanation = (
@@ -76,8 +86,8 @@ if mode == 'Game Outcome':
                 f"than the opponent's by {abs(diff):.2f} points, based on season performance."
             )
 
-            home_players = ", ".join(team_players.get(home_team, []))
-            away_players = ", ".join(team_players.get(away_team, []))
+            home_players = ", ".join(model.team_players.get(home_team, []))
+            away_players = ", ".join(model.team_players.get(away_team, []))
             st.markdown(
                 f"<div style='margin-top:20px; padding:20px; text-align:center; "
                 f"background-color:#f2f2f2; border-radius:10px; color:black;'>"
@@ -94,23 +104,27 @@ if mode == 'Game Outcome':
                 unsafe_allow_html=True,
             )
 
-            past_games = [
-                g for g in games
-                if {g['home_team'], g['away_team']} == {home_team, away_team}
-            ]
-            if past_games:
+            elo = get_elo(model.version)
+            elo_home = elo.rating_on(home_team, as_of.isoformat())
+            elo_away = elo.rating_on(away_team, as_of.isoformat())
+            elo_prob, _ = elo.predict(home_team, away_team, as_of.isoformat())
+            st.caption(
+                f"Elo on {as_of}: {home_team} {elo_home:.0f}, {away_team} {elo_away:.0f} "
+                f"(Elo win probability for {home_team}: {elo_prob:.1%})"
+            )
+
+            past_games = model.matchups(home_team, away_team)
+            if not past_games.empty:
                 st.subheader("📊 Past Matchups Between These Teams")
-                st.dataframe(
-                    pd.DataFrame(past_games).sort_values("date", ascending=False).reset_index(drop=True),
-                    use_container_width=True
-                )
+                st.dataframe(past_games, use_container_width=True)
             else:
                 st.info("No past matchups between these teams found in the data.")
 
 # === PLAYER AVERAGES ===
 elif mode == 'Player Averages':
-    stats, player_avgs, _ = get_player_stats()
-    players = sorted(player_avgs.keys())
+    model = get_model()
+    player_avgs = model.player_avgs
+    players = model.players
     player = st.selectbox('Player', players)
 
     if st.button('🔮 Predict', use_container_width=True):
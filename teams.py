@@ -31,3 +31,39 @@ ALL_TEAMS = [
     "Utah Jazz",
     "Washington Wizards",
 ]
+
+EASTERN_CONFERENCE = [
+    "Atlanta Hawks",
+    "Boston Celtics",
+    "Brooklyn Nets",
+    "Charlotte Hornets",
+    "Chicago Bulls",
+    "Cleveland Cavaliers",
+    "Detroit Pistons",
+    "Indiana Pacers",
+    "Miami Heat",
+    "Milwaukee Bucks",
+    "New York Knicks",
+    "Orlando Magic",
+    "Philadelphia 76ers",
+    "Toronto Raptors",
+    "Washington Wizards",
+]
+
+WESTERN_CONFERENCE = [
+    "Dallas Mavericks",
+    "Denver Nuggets",
+    "Golden State Warriors",
+    "Houston Rockets",
+    "LA Clippers",
+    "Los Angeles Lakers",
+    "Memphis Grizzlies",
+    "Minnesota Timberwolves",
+    "New Orleans Pelicans",
+    "Oklahoma City Thunder",
+    "Phoenix Suns",
+    "Portland Trail Blazers",
+    "Sacramento Kings",
+    "San Antonio Spurs",
+    "Utah Jazz",
+]
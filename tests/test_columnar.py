@@ -0,0 +1,52 @@
+"""Binary copies stay consistent with CSVs written while they are exported."""
+
+import columnar
+from columnar import load_game_binary, update_binary
+from predictor import load_games
+
+HEADER = "id,date,home_team,away_team,home_points,away_points\n"
+
+
+def game(i):
+    return f"{i},2024-01-{i:02d},Celtics,Jazz,{100 + i},99\n"
+
+
+def test_row_appended_during_export_is_not_counted_twice(tmp_path, monkeypatch):
+    path = tmp_path / "games.csv"
+    path.write_text(HEADER + game(1))
+    assert update_binary(str(path))
+
+    with open(path, "a") as f:
+        f.write(game(2))
+    parse = columnar._parse_games
+    appended = []
+
+    def append_then_parse(*args):
+        # Another writer appends after the export stat'ed the file.
+        if not appended:
+            with open(path, "a") as f:
+                f.write(game(3))
+            appended.append(True)
+        return parse(*args)
+
+    monkeypatch.setattr(columnar, "_parse_games", append_then_parse)
+    assert update_binary(str(path))
+    monkeypatch.undo()
+
+    update_binary(str(path))
+    games = load_games(str(path))
+    assert sorted(games.game_id.tolist()) == [1, 2, 3]
+    assert load_game_binary(str(path)) is not None
+
+
+def test_binary_swapped_out_mid_load_falls_back_to_csv(tmp_path, monkeypatch):
+    path = tmp_path / "games.csv"
+    path.write_text(HEADER + game(1) + game(2))
+    assert update_binary(str(path))
+
+    def vanished(directory, mmap_mode):
+        raise FileNotFoundError(directory)
+
+    monkeypatch.setattr(columnar, "_games_from", vanished)
+    assert load_game_binary(str(path)) is None
+    assert load_games(str(path)).game_id.tolist() == [1, 2]
@@ -0,0 +1,33 @@
+"""EloRatings updates from the rows update_nba_data hands back."""
+
+from elo import EloRatings, refresh
+
+PLAYED = [
+    {"date": "2024-01-02", "home_team": "A", "away_team": "B", "home_points": 110, "away_points": 100},
+    {"date": "2024-01-03", "home_team": "B", "away_team": "C", "home_points": "98", "away_points": "101"},
+]
+SCHEDULED = [
+    {"date": "2024-01-04", "home_team": "A", "away_team": "C", "home_points": None, "away_points": None},
+    {"date": "2024-01-04", "home_team": "B", "away_team": "A", "home_points": "", "away_points": ""},
+]
+
+
+def test_unscored_games_are_skipped():
+    expected = EloRatings.from_games(PLAYED)
+    elo = EloRatings()
+    assert elo.update(PLAYED + SCHEDULED) == len(PLAYED)
+    assert elo.ratings == expected.ratings
+    assert elo.last_day == expected.last_day
+    assert elo.update(SCHEDULED) == 0
+    assert elo.ratings == expected.ratings
+
+
+def test_refresh_with_unscored_new_games(tmp_path):
+    games_path = tmp_path / "games.csv"
+    games_path.write_text("id,date,home_team,away_team,home_points,away_points\n")
+    path = str(tmp_path / "elo.pkl")
+    EloRatings.from_games(PLAYED[:1]).save(path)
+
+    elo = refresh(str(games_path), PLAYED[1:] + SCHEDULED, path)
+    assert elo.n_games == len(PLAYED)
+    assert elo.ratings == EloRatings.from_games(PLAYED).ratings
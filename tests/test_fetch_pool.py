@@ -0,0 +1,149 @@
+"""RateLimitedFetcher and map_concurrent against a local stand-in API."""
+
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from fetch_pool import RateLimitedFetcher, TokenBucket, map_concurrent
+from update_games import fetch_stats_for_game
+
+LINES_PER_GAME = 5
+PAGE_SIZE = 2
+RETRY_AFTER = 0.2
+
+
+class StubAPI(BaseHTTPRequestHandler):
+    """Serves ``/stats`` pages with cursors and fails chosen first requests.
+
+    The first request for a game in ``server.throttle`` gets a 429 with
+    ``Retry-After``; one in ``server.flaky`` gets a 503. Higher game ids
+    answer sooner, so concurrent calls complete out of input order.
+    """
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        game = int(query["game_ids[]"])
+        cursor = int(query.get("cursor", 0))
+        server = self.server
+        with server.lock:
+            server.hits.append((time.monotonic(), game, cursor))
+            first = (game, cursor) not in server.seen
+            server.seen.add((game, cursor))
+        if first and game in server.throttle:
+            self._send(429, {"error": "slow down"}, {"Retry-After": str(RETRY_AFTER)})
+            return
+        if first and game in server.flaky:
+            self._send(503, {"error": "unavailable"})
+            return
+        time.sleep(0.01 * (10 - game % 10))
+        lines = [
+            {"game": game, "line": i}
+            for i in range(cursor, min(cursor + PAGE_SIZE, LINES_PER_GAME))
+        ]
+        meta = {"next_cursor": cursor + PAGE_SIZE} if cursor + PAGE_SIZE < LINES_PER_GAME else {}
+        self._send(200, {"data": lines, "meta": meta})
+
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubAPI)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.hits = []
+    server.seen = set()
+    server.throttle = set()
+    server.flaky = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_port}/stats"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_fetcher(rate_per_minute):
+    return RateLimitedFetcher(
+        limiter=TokenBucket(rate_per_minute), session=requests.Session(), backoff=0.01
+    )
+
+
+def test_pages_are_followed_and_results_keep_input_order(api):
+    fetcher = make_fetcher(6000)
+    games = list(range(10))
+    finished = []
+
+    def fetch(game):
+        lines = fetch_stats_for_game(game, fetcher, api.url)
+        finished.append(game)
+        return lines
+
+    results = list(map_concurrent(fetch, games, max_workers=4))
+
+    assert [item for item, _, _ in results] == games
+    for game, lines, error in results:
+        assert error is None
+        assert lines == [{"game": game, "line": i} for i in range(LINES_PER_GAME)]
+    # The stub answers higher ids sooner, so calls finished out of order.
+    assert finished != games
+
+
+def test_rate_limit_holds_across_workers(api):
+    rate_per_minute = 1200  # 20 requests a second, burst of one
+    fetcher = make_fetcher(rate_per_minute)
+    games = list(range(6))
+    list(map_concurrent(lambda g: fetch_stats_for_game(g, fetcher, api.url), games, max_workers=6))
+
+    times = sorted(t for t, _, _ in api.hits)
+    assert len(times) == len(games) * 3  # three pages per game
+    interval = 60 / rate_per_minute
+    # A request may reach the server late and bunch up with the next one,
+    # but no three requests ever fit inside one interval.
+    assert all(c - a >= interval * 0.95 for a, c in zip(times, times[2:]))
+    assert times[-1] - times[0] >= (len(times) - 1) * interval * 0.95
+
+
+def test_429_and_5xx_are_retried(api):
+    api.throttle = {1}
+    api.flaky = {2, 3}
+    fetcher = make_fetcher(6000)
+    results = list(map_concurrent(lambda g: fetch_stats_for_game(g, fetcher, api.url), range(5), max_workers=3))
+
+    assert all(error is None for _, _, error in results)
+    assert all(len(lines) == LINES_PER_GAME for _, lines, _ in results)
+    # The first request for every page failed once: a 429 for each of
+    # game 1's three pages, a 503 for each of games 2 and 3's.
+    assert fetcher.retries == 3 * 3
+
+    # Each retry after a 429 waited out its Retry-After.
+    for cursor in range(0, LINES_PER_GAME, PAGE_SIZE):
+        first, second = sorted(t for t, g, c in api.hits if (g, c) == (1, cursor))
+        assert second - first >= RETRY_AFTER * 0.9
+
+
+def test_retries_give_up_with_the_error(api):
+    api.flaky = {7}
+    fetcher = RateLimitedFetcher(
+        limiter=TokenBucket(6000), session=requests.Session(), max_retries=0, backoff=0.01
+    )
+    [(game, lines, error)] = list(map_concurrent(lambda g: fetch_stats_for_game(g, fetcher, api.url), [7]))
+    assert game == 7 and lines is None
+    assert isinstance(error, requests.HTTPError)
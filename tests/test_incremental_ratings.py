@@ -0,0 +1,84 @@
+"""IncrementalRatings must match a full recompute however the games arrive."""
+
+import os
+
+import numpy as np
+import pytest
+
+from game_table import day_number, load_game_table
+from rating_engine import IncrementalRatings, compute_ratings_and_avgs
+
+GAMES_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "sample_games.csv")
+TRADE_DATE = "2024-02-08"
+
+
+@pytest.fixture(scope="module")
+def games():
+    table = load_game_table(GAMES_PATH)
+    # The trade-deadline weight must split the sample into both sides.
+    assert table.day.min() < day_number(TRADE_DATE) <= table.day.max()
+    return table
+
+
+def assert_same(actual, expected):
+    ratings, avgs = actual
+    full_ratings, full_avgs = expected
+    assert ratings.keys() == full_ratings.keys()
+    for team, rating in full_ratings.items():
+        assert ratings[team] == pytest.approx(rating, rel=1e-12, abs=1e-12)
+        assert avgs[team]["scored"] == pytest.approx(full_avgs[team]["scored"], rel=1e-12)
+        assert avgs[team]["allowed"] == pytest.approx(full_avgs[team]["allowed"], rel=1e-12)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("params", [
+    {"recency_bias": 0.02},
+    {"recency_bias": 0.05, "trade_date": TRADE_DATE, "post_trade_weight": 1.5},
+])
+def test_shuffled_chunks_match_full_recompute(games, seed, params):
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(games))
+    bounds = np.sort(rng.choice(np.arange(1, len(games)), size=6, replace=False))
+
+    engine = IncrementalRatings(**params)
+    for rows in np.split(order, bounds):
+        engine.add_games(games.select(rows))
+
+    assert len(engine) == len(games)
+    assert_same(engine.ratings_and_avgs(), compute_ratings_and_avgs(games, **params))
+
+
+def test_appending_new_days_matches_full_recompute(games):
+    params = {"recency_bias": 0.02, "trade_date": TRADE_DATE, "post_trade_weight": 2.0}
+    cutoff = np.sort(np.unique(games.day))[-5]
+    engine = IncrementalRatings(**params)
+    engine.add_games(games.select(games.day < cutoff))
+    assert_same(engine.ratings_and_avgs(), compute_ratings_and_avgs(games.select(games.day < cutoff), **params))
+
+    # A later night moves ``latest`` forward, which reweights every old game.
+    engine.add_games(games.select(games.day >= cutoff))
+    assert_same(engine.ratings_and_avgs(), compute_ratings_and_avgs(games, **params))
+
+
+def test_dict_rows_and_empty_batches(games):
+    engine = IncrementalRatings()
+    assert engine.ratings_and_avgs() == ({}, {})
+    engine.add_games([])
+    engine.add_games(list(games)[:50])
+    engine.add_games(games.select(np.arange(50, len(games))))
+    assert_same(engine.ratings_and_avgs(), compute_ratings_and_avgs(games))
+
+
+def test_add_games_skips_unscored_rows(games):
+    # update_nba_data returns scheduled games with None or empty scores.
+    rows = list(games)
+    scheduled = [
+        {"date": "2099-01-01", "home_team": rows[0]["home_team"], "away_team": rows[0]["away_team"],
+         "home_points": None, "away_points": None},
+        {"date": "2099-01-02", "home_team": rows[1]["home_team"], "away_team": rows[1]["away_team"],
+         "home_points": "", "away_points": ""},
+    ]
+    engine = IncrementalRatings()
+    engine.add_games(rows + scheduled)
+    assert len(engine) == len(games)
+    assert_same(engine.ratings_and_avgs(), compute_ratings_and_avgs(games))
@@ -0,0 +1,67 @@
+"""MasseySolver warm starts, directly and across model rebuilds."""
+
+import csv
+import os
+
+import numpy as np
+import pytest
+
+from massey import MasseySolver
+from model_snapshot import load_model
+from predictor import load_games
+
+GAMES_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "sample_games.csv")
+
+
+@pytest.fixture(scope="module")
+def games():
+    return load_games(GAMES_PATH)
+
+
+def assert_same_fit(warm, cold):
+    assert warm.ratings.keys() == cold.ratings.keys()
+    for team, rating in cold.ratings.items():
+        assert warm.ratings[team] == pytest.approx(rating, abs=1e-6)
+    assert warm.home_advantage == pytest.approx(cold.home_advantage, abs=1e-6)
+
+
+def test_refit_after_new_days_starts_from_the_last_solution(games):
+    cutoff = np.unique(games.day)[-3]
+    warm = MasseySolver()
+    warm.fit(games.select(games.day < cutoff))
+    warm.fit(games)
+    cold = MasseySolver()
+    cold.fit(games)
+
+    assert_same_fit(warm, cold)
+    assert warm.iterations < cold.iterations
+
+
+@pytest.mark.parametrize("hold_previous", [False, True])
+def test_model_rebuild_reuses_the_solver(tmp_path, hold_previous):
+    with open(GAMES_PATH, newline="") as f:
+        rows = sorted(csv.DictReader(f), key=lambda r: r["date"])
+    games_path = tmp_path / "games.csv"
+    stats_path = tmp_path / "stats.csv"
+    stats_path.write_text("player,team,date,points,rebounds,assists,steals,fgm,fga,ftm,fta\n")
+
+    def write_games(rows):
+        with open(games_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+    load = dict(engine="massey", params_path=str(tmp_path / "none.json"))
+    write_games(rows[:-30])
+    first = load_model(str(games_path), str(stats_path), **load)
+    write_games(rows)
+    # Without ``previous`` the outdated snapshot's solver is the warm start.
+    second = load_model(
+        str(games_path), str(stats_path), previous=first if hold_previous else None, **load,
+    )
+
+    cold = MasseySolver()
+    cold.fit(load_games(str(games_path)))
+    assert_same_fit(second.solver, cold)
+    assert second.ratings == second.solver.ratings
+    assert second.solver.iterations < cold.iterations
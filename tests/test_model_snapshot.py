@@ -0,0 +1,45 @@
+"""load_model's parameter handling."""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from model_snapshot import load_model
+from player_table import STAT_KEYS
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+@pytest.fixture
+def data(tmp_path):
+    games = tmp_path / "games.csv"
+    shutil.copy(os.path.join(DATA, "sample_games.csv"), games)
+    stats = tmp_path / "stats.csv"
+    stats.write_text(
+        f"player,team,date,{','.join(STAT_KEYS)}\n"
+        "Ann,Boston Celtics,2024-01-02,10,1,1,1,4,8,2,2\n"
+    )
+    params = tmp_path / "model_params.json"
+    params.write_text(json.dumps({"params": {
+        "recency_bias": 0.05, "trade_date": "2024-02-08", "post_trade_weight": 2.0, "k": 0.2,
+    }}))
+    return str(games), str(stats), str(params)
+
+
+def test_unset_parameters_come_from_the_tuned_file(data):
+    games, stats, params = data
+    model = load_model(games, stats, params_path=params)
+    assert model.params["recency_bias"] == 0.05
+    assert model.params["trade_date"] == "2024-02-08"
+    assert model.k == 0.2
+
+
+def test_explicit_none_trade_date_overrides_the_tuned_one(data):
+    games, stats, params = data
+    tuned = load_model(games, stats, params_path=params)
+    plain = load_model(games, stats, trade_date=None, params_path=params)
+    assert plain.params["trade_date"] is None
+    assert plain.params["post_trade_weight"] == 2.0
+    assert plain.ratings != tuned.ratings
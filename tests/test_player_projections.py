@@ -0,0 +1,30 @@
+"""PlayerProjector updates and the player_predictor projection flags."""
+
+import sys
+
+import pytest
+
+import player_predictor
+from player_projections import PlayerProjector
+from player_table import STAT_KEYS
+
+
+def test_none_and_missing_stats_count_as_zero():
+    projector = PlayerProjector(window=2, alpha=0.5)
+    projector.update({"player": "Ann", "points": 10, "rebounds": None})
+    projector.update({"player": "Ann", **{k: None for k in STAT_KEYS}, "points": 20})
+    assert projector.last_n("Ann")["points"] == 15
+    assert projector.last_n("Ann")["rebounds"] == 0
+    assert projector.ewma("Ann")["points"] == 15
+
+
+@pytest.mark.parametrize("argv", [
+    ["--last", "0"], ["--last", "-2"], ["--ewma", "0"], ["--ewma", "1.5"],
+    ["--last", "3", "--ewma", "0.5"],
+])
+def test_bad_projection_flags_are_rejected(monkeypatch, capsys, argv):
+    monkeypatch.setattr(sys, "argv", ["player_predictor.py", *argv, "Ann"])
+    with pytest.raises(SystemExit) as exit_info:
+        player_predictor.main()
+    assert exit_info.value.code == 2
+    assert "error:" in capsys.readouterr().err
@@ -0,0 +1,45 @@
+"""Loading box scores from CSV into a PlayerStatTable."""
+
+import csv
+
+import pytest
+
+from player_table import STAT_KEYS, compute_player_averages, iter_player_tables, load_player_table
+
+HEADER = ["date", "player", "team"] + STAT_KEYS
+
+
+def write_stats(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        for date, player, team, points in rows:
+            writer.writerow([date, player, team, points] + [0] * (len(STAT_KEYS) - 1))
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 100])
+def test_blank_player_name_is_its_own_player(tmp_path, chunk_rows):
+    path = tmp_path / "stats.csv"
+    write_stats(path, [
+        ("2024-01-02", "Ann", "A", 10),
+        ("2024-01-02", "Bob", "B", 20),
+        ("2024-01-03", "", "B", 99),
+        ("2024-01-04", "Bob", "", 30),
+    ])
+    chunks = list(iter_player_tables(str(path), chunk_rows=chunk_rows))
+    table = chunks[-1]
+    assert set(table.players) == {"Ann", "Bob", ""}
+    assert all((c.player >= 0).all() for c in chunks)
+
+    averages = compute_player_averages(load_player_table(str(path)))
+    assert averages["Bob"]["points"] == 25
+    assert averages["Ann"]["points"] == 10
+    assert averages[""]["points"] == 99
+
+
+def test_blank_team_is_no_team(tmp_path):
+    path = tmp_path / "stats.csv"
+    write_stats(path, [("2024-01-02", "Bob", "", 30)])
+    table = load_player_table(str(path))
+    assert table.team.tolist() == [-1]
+    assert "team" not in table.row(0)
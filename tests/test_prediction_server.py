@@ -0,0 +1,148 @@
+"""prediction_server request validation and background reloads."""
+
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+import prediction_server
+from prediction_server import ModelHolder, make_server, request
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+@pytest.fixture
+def paths(tmp_path):
+    games = tmp_path / "games.csv"
+    shutil.copy(os.path.join(DATA, "sample_games.csv"), games)
+    stats = tmp_path / "stats.csv"
+    stats.write_text(
+        "player,team,date,points,rebounds,assists,steals,fgm,fga,ftm,fta\n"
+        "Ann,Boston Celtics,2024-01-02,10,1,1,1,4,8,2,2\n"
+    )
+    return str(games), str(stats), str(tmp_path / "model_params.json")
+
+
+@pytest.fixture
+def server(paths):
+    server = make_server(*paths[:2], port=0, params_path=paths[2])
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    server.holder.close()
+
+
+@pytest.mark.parametrize("body", [
+    [],
+    {"games": "Boston Celtics"},
+    {"games": [["Boston Celtics"]]},
+    {"games": [["Boston Celtics", 7]]},
+    {"games": [{"home": "Boston Celtics", "away": "Utah Jazz"}]},
+    {"players": "Ann"},
+    {"players": [["Ann"]]},
+])
+def test_malformed_batch_bodies_get_400(server, body):
+    status, result = request(server, "/batch", body=body)
+    assert status == 400
+    assert "error" in result
+
+
+def test_valid_batch(server):
+    body = {"games": [["Boston Celtics", "Utah Jazz"]], "players": ["Ann", "Nobody"]}
+    status, result = request(server, "/batch", body=body)
+    assert status == 200
+    assert [g["home"] for g in result["games"]] == ["Boston Celtics"]
+    assert result["players"]["Ann"]["points"] == 10
+    assert result["players"]["Nobody"] is None
+
+
+def test_requests_get_the_old_model_during_a_rebuild(paths, monkeypatch):
+    holder = ModelHolder(*paths[:2], params_path=paths[2], interval=0.05)
+    try:
+        old = holder.get()
+        release = threading.Event()
+        load_model = prediction_server.load_model
+
+        def slow_load(*args, **kwargs):
+            release.wait(5)
+            return load_model(*args, **kwargs)
+
+        monkeypatch.setattr(prediction_server, "load_model", slow_load)
+        with open(paths[1], "a") as f:
+            f.write("Bob,Utah Jazz,2024-01-03,20,1,1,1,8,16,4,4\n")
+        deadline = time.monotonic() + 5
+        while not holder.refresher.building and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert holder.refresher.building
+
+        start = time.monotonic()
+        assert holder.get() is old
+        assert time.monotonic() - start < 0.1
+
+        release.set()
+        while holder.get() is old and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert "Bob" in holder.get().player_avgs
+    finally:
+        holder.close()
+
+
+def test_game_prediction_works_on_a_shared_model(paths):
+    from model_snapshot import load_model
+    from prediction_server import game_prediction
+    from shared_model import attach
+
+    games, stats, params = paths
+    model = load_model(games, stats, params_path=params)
+    shared = attach(games, stats, params_path=params)
+    expected = game_prediction(model, "Boston Celtics", "Utah Jazz")
+    result = game_prediction(shared, "Boston Celtics", "Utah Jazz")
+    assert result["home_players"] == expected["home_players"] == ["Ann"]
+    assert result["prob_home"] == pytest.approx(expected["prob_home"])
+
+
+def test_request_turns_a_non_json_error_body_into_an_error(monkeypatch):
+    import io
+    import urllib.error
+
+    def fail(req, timeout):
+        raise urllib.error.HTTPError(req.full_url, 502, "Bad Gateway", {}, io.BytesIO(b"<html>"))
+
+    monkeypatch.setattr(prediction_server.urllib.request, "urlopen", fail)
+    assert request("http://proxy", "/game") == (502, {"error": "HTTP 502 Bad Gateway"})
+
+
+@pytest.mark.parametrize("argv", [
+    ["predictor.py", "Boston Celtics", "Utah Jazz"],
+    ["player_predictor.py", "Ann"],
+])
+def test_cli_exits_cleanly_when_no_server_is_running(argv, monkeypatch, capsys):
+    import socket
+
+    import player_predictor
+    import predictor
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+    monkeypatch.setattr("sys.argv", argv + ["--server", url])
+    main = predictor.main if argv[0] == "predictor.py" else player_predictor.main
+    with pytest.raises(SystemExit) as exc:
+        main()
+    assert exc.value.code == 1
+    err = capsys.readouterr().err
+    assert err.startswith(f"Could not reach {url}") and err.count("\n") == 1
+
+
+def test_predictor_rejects_local_options_with_server(monkeypatch, capsys):
+    import predictor
+
+    monkeypatch.setattr("sys.argv", ["predictor.py", "A", "B", "--server", "http://x", "--engine", "average"])
+    with pytest.raises(SystemExit) as exc:
+        predictor.main()
+    assert exc.value.code == 2
+    assert "--engine" in capsys.readouterr().err
@@ -0,0 +1,114 @@
+"""RosterIndex lookups, unnamed lines, and the index kept on the model."""
+
+import update_data
+from game_table import day_number
+from key_index import KeyIndex
+from model_snapshot import build_model
+from player_table import STAT_KEYS, PlayerAccumulator, PlayerStatTable
+from roster_index import RosterIndex
+from tuning import DEFAULT_PARAMS
+
+LINES = [
+    ("Ann", "Celtics", "2024-01-02", 10),
+    ("Bob", "Jazz", "2024-01-02", 20),
+    ("Bob", "Celtics", "2024-02-10", 30),  # traded
+    ("Cy", "Jazz", "2024-02-11", 5),
+]
+
+
+def table_with_unnamed_lines():
+    """LINES plus lines whose player id is -1, i.e. no player at all."""
+    players = ["Ann", "Bob", "Cy"]
+    teams = ["Celtics", "Jazz"]
+    rows = LINES + [(None, "Jazz", "2024-03-01", 99), (None, "Celtics", "2024-03-02", 99)]
+    player = [players.index(p) if p else -1 for p, _, _, _ in rows]
+    team = [teams.index(t) for _, t, _, _ in rows]
+    day = [day_number(d) for _, _, d, _ in rows]
+    stats = [[pts] + [0] * (len(STAT_KEYS) - 1) for *_, pts in rows]
+    return PlayerStatTable(players, player, stats, teams, team, day)
+
+
+def dicts(lines):
+    return [
+        {"player": p, "team": t, "date": d, "points": pts, **{k: 0 for k in STAT_KEYS[1:]}}
+        for p, t, d, pts in lines
+    ]
+
+
+def test_lookups_follow_a_trade():
+    index = RosterIndex(dicts(LINES))
+    assert index.team_players("Celtics") == ["Ann", "Bob"]
+    assert index.roster("Jazz") == ["Cy"]
+    assert index.current_team("Bob") == "Celtics"
+    assert index.player_rows("Bob").tolist() == [1, 2]
+    assert index.team_players("Lakers") == []
+    assert index.current_team("Nobody") is None
+
+
+def test_unnamed_lines_never_touch_another_player():
+    table = table_with_unnamed_lines()
+    index = RosterIndex(table)
+    expected = RosterIndex(dicts(LINES))
+    assert index.team_players() == expected.team_players()
+    for team in ("Celtics", "Jazz"):
+        assert index.roster(team) == expected.roster(team)
+    for player in ("Ann", "Bob", "Cy"):
+        assert index.current_team(player) == expected.current_team(player)
+        assert index.player_rows(player).tolist() == expected.player_rows(player).tolist()
+    assert index.n_rows == len(table)
+
+    accumulator = PlayerAccumulator()
+    accumulator.add(table)
+    assert accumulator.averages()["Cy"]["points"] == 5
+    assert accumulator.team_players() == expected.team_players()
+
+
+def test_blank_player_name_is_its_own_player():
+    index = RosterIndex(dicts(LINES + [("", "Jazz", "2024-03-01", 99)]))
+    assert index.current_team("Cy") == "Jazz"
+    assert index.current_team("") == "Jazz"
+    assert index.roster("Jazz") == ["", "Cy"]
+
+
+def test_model_keeps_one_index(tmp_path):
+    games = tmp_path / "games.csv"
+    games.write_text(
+        "id,date,home_team,away_team,home_points,away_points\n"
+        "1,2024-01-02,Celtics,Jazz,110,100\n"
+    )
+    stats = tmp_path / "stats.csv"
+    stats.write_text(f"player,team,date,{','.join(STAT_KEYS)}\n" + "".join(
+        f"{p},{t},{d},{pts}{',0' * (len(STAT_KEYS) - 1)}\n" for p, t, d, pts in LINES
+    ))
+    model = build_model(str(games), str(stats), dict(DEFAULT_PARAMS))
+    assert isinstance(model.roster, RosterIndex)
+    assert model.team_players == {"Celtics": ["Ann", "Bob"], "Jazz": ["Bob", "Cy"]}
+    assert model.current_team("Bob") == "Celtics"
+
+    model.roster.extend(dicts([("Ann", "Jazz", "2024-03-01", 12)]))
+    assert model.current_team("Ann") == "Jazz"
+    assert model.team_players["Jazz"] == ["Ann", "Bob", "Cy"]
+
+
+def test_commit_batch_extends_the_roster(tmp_path, monkeypatch):
+    monkeypatch.setattr(update_data, "GAME_FILE", str(tmp_path / "games.csv"))
+    monkeypatch.setattr(update_data, "STAT_FILE", str(tmp_path / "stats.csv"))
+    index = KeyIndex(update_data.GAME_FILE, update_data.STAT_FILE, str(tmp_path / "keys.sqlite"))
+    roster = RosterIndex(dicts(LINES))
+    games = [{"id": 9, "date": "2024-03-05", "home_team": "Jazz", "away_team": "Celtics",
+              "home_points": 101, "away_points": 99}]
+    stats = [
+        {"game_id": 9, "player_id": 1, "player": "Ann", "team": "Jazz", "points": 8,
+         "assists": None, "rebounds": 3},
+        {"game_id": 9, "player_id": 3, "player": "Cy", "team": "Jazz", "points": None,
+         "assists": 1, "rebounds": 0},
+    ]
+    try:
+        moves = update_data._commit_batch(
+            games, stats, index, None, str(tmp_path / "checkpoint.json"), {}, roster,
+        )
+    finally:
+        index.close()
+    assert moves == [("Ann", "Celtics", "Jazz")]
+    assert roster.roster("Jazz") == ["Ann", "Cy"]
+    assert roster.player_rows("Ann").tolist() == [0, len(LINES)]
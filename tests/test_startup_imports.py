@@ -0,0 +1,27 @@
+"""Entry points must not pull heavy libraries in at import time."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from bench_startup import HEAVY
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+@pytest.mark.parametrize("module", [
+    "predictor", "player_predictor", "app", "gui_app", "prediction_server",
+    "backtest", "update_games", "update_data",
+])
+def test_entry_point_imports_stay_light(module):
+    code = (
+        f"import sys, {module}\n"
+        f"heavy = {HEAVY!r}\n"
+        "print(' '.join(sorted({n.split('.')[0] for n in sys.modules} & set(heavy))))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    assert proc.stdout.split() == []
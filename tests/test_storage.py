@@ -0,0 +1,59 @@
+"""SQLiteStore re-imports must not duplicate rows, with or without game ids."""
+
+import csv
+import sqlite3
+
+from storage import STAT_COLUMNS, SQLiteStore
+
+STATS = [
+    {"game_id": 7, "date": "2024-01-02", "player": "Ann", "team": "A", "points": 10},
+    {"game_id": "", "date": "2024-01-02", "player": "Bob", "team": "A", "points": 12},
+    {"game_id": "", "date": "2024-01-02", "player": "Cy", "team": "", "points": 3},
+    {"game_id": "", "date": "2024-01-03", "player": "Bob", "team": "A", "points": 20},
+]
+GAMES = [
+    {"id": 7, "date": "2024-01-02", "home_team": "A", "away_team": "B",
+     "home_points": 99, "away_points": 90},
+    {"id": "", "date": "2024-01-03", "home_team": "A", "away_team": "C",
+     "home_points": 101, "away_points": 100},
+]
+
+
+def count(store, table):
+    return store.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_reimport_without_game_ids_adds_nothing(tmp_path):
+    path = tmp_path / "stats.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, STAT_COLUMNS, restval="")
+        writer.writeheader()
+        writer.writerows(STATS)
+
+    with SQLiteStore(str(tmp_path / "nba.sqlite")) as store:
+        assert store.import_csv("player_stats", str(path)) == len(STATS)
+        assert store.import_csv("player_stats", str(path)) == 0
+        assert store.insert_games(GAMES) == len(GAMES)
+        assert store.insert_games(GAMES) == 0
+        assert count(store, "player_stats") == len(STATS)
+        assert count(store, "games") == len(GAMES)
+
+
+def test_opening_an_old_store_drops_repeated_null_keys(tmp_path):
+    db = str(tmp_path / "nba.sqlite")
+    with SQLiteStore(db) as store:
+        pass
+    # Simulate a store written before rows without ids had a key.
+    conn = sqlite3.connect(db)
+    with conn:
+        conn.execute("DROP INDEX player_stats_no_game")
+        conn.execute("DROP INDEX games_no_id")
+        for _ in range(3):
+            conn.execute("INSERT INTO player_stats (date, player, team) VALUES ('2024-01-02', 'Bob', 'A')")
+            conn.execute("INSERT INTO games (date, home_team, away_team) VALUES ('2024-01-03', 'A', 'C')")
+    conn.close()
+
+    with SQLiteStore(db) as store:
+        assert count(store, "player_stats") == 1
+        assert count(store, "games") == 1
+        assert store.insert_player_stats([STATS[1]]) == 0
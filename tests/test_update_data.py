@@ -0,0 +1,83 @@
+"""update_nba_data must not lose a box score when its fetch fails."""
+
+import csv
+
+import pytest
+
+import update_data
+
+
+def api_game(gid):
+    return {
+        "id": gid, "date": f"2024-01-{gid - 897:02d}T00:00:00",
+        "home_team": {"full_name": "Celtics"}, "visitor_team": {"full_name": "Jazz"},
+        "home_team_score": 100 + gid % 10, "visitor_team_score": 99,
+    }
+
+
+def api_stat(gid, pid):
+    return {
+        "player": {"id": pid, "full_name": f"P{pid}"}, "team": {"full_name": "Celtics"},
+        "pts": 10, "ast": 2, "reb": 3,
+    }
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    monkeypatch.setattr(update_data, "GAME_FILE", str(tmp_path / "games.csv"))
+    monkeypatch.setattr(update_data, "STAT_FILE", str(tmp_path / "stats.csv"))
+    pages = {1: [api_game(899), api_game(900)], 2: [api_game(901)]}
+    api = {"failing": set(), "stat_calls": []}
+
+    def fetch_games_page(season, page):
+        return pages[page], len(pages)
+
+    def fetch_stats_for_game(gid):
+        api["stat_calls"].append(gid)
+        if gid in api["failing"]:
+            raise ConnectionError("stats fetch died")
+        return [api_stat(gid, 1), api_stat(gid, 2)]
+
+    monkeypatch.setattr(update_data, "fetch_games_page", fetch_games_page)
+    monkeypatch.setattr(update_data, "fetch_stats_for_game", fetch_stats_for_game)
+    api["run"] = lambda: update_data.update_nba_data(
+        batch_size=1, checkpoint_path=str(tmp_path / "checkpoint.json"),
+        index_path=str(tmp_path / "keys.sqlite"), db_path=None,
+    )
+    return api
+
+
+def read(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_failed_stats_fetch_is_retried_on_the_next_run(api):
+    api["failing"] = {900}
+    added = api["run"]()
+    assert [g["id"] for g in added] == [899, 901]
+    assert [r["id"] for r in read(update_data.GAME_FILE)] == ["899", "901"]
+
+    api["failing"] = set()
+    api["stat_calls"].clear()
+    added = api["run"]()
+    assert [g["id"] for g in added] == [900]
+    assert api["stat_calls"] == [900]
+    stats = read(update_data.STAT_FILE)
+    assert sorted({r["game_id"] for r in stats}) == ["899", "900", "901"]
+    assert len(stats) == 6
+
+
+def test_checkpoint_stays_at_the_page_of_a_failed_game(api, tmp_path, monkeypatch):
+    api["failing"] = {900}
+    fetch_page = update_data.fetch_games_page
+
+    def dies_on_page_2(season, page):
+        if page == 2:
+            raise ConnectionError("games fetch died")
+        return fetch_page(season, page)
+
+    monkeypatch.setattr(update_data, "fetch_games_page", dies_on_page_2)
+    api["run"]()
+    checkpoint = update_data.load_checkpoint(str(tmp_path / "checkpoint.json"), 2023)
+    assert checkpoint["next_page"] == 1
@@ -0,0 +1,179 @@
+"""Hyperparameter search for the rating model, scored by walk-forward log-loss.
+
+Candidates are grouped by their rating parameters (recency bias, trade
+date, post-trade weight). Each group computes its per-day weighted totals
+once and then scores every ``k`` / ``home_weight`` pair against them, which
+is nearly free. Groups run in a process pool; the per-day aggregates are
+written once as ``.npy`` files and memory-mapped read-only by every worker,
+so the game history is neither pickled nor copied per process.
+
+The best parameter set is written to ``data/model_params.json``;
+``load_params`` reads it back for ``model_snapshot.load_model`` and the
+other tools.
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import random
+import tempfile
+from collections import defaultdict
+
+from predictor import HOME_WEIGHT, load_games
+
+# Written by ``write_params``; missing keys fall back to DEFAULT_PARAMS.
+PARAMS_FILE = os.path.join('data', 'model_params.json')
+DEFAULT_PARAMS = {
+    'recency_bias': 0.02,
+    'trade_date': None,
+    'post_trade_weight': 1.5,
+    'k': 0.1,
+    'home_weight': HOME_WEIGHT,
+}
+RATING_PARAMS = ('recency_bias', 'trade_date', 'post_trade_weight')
+
+# Ranges sampled by random search: (low, high) for uniform floats.
+DEFAULT_SPACE = {
+    'recency_bias': (0.0, 0.1),
+    'post_trade_weight': (1.0, 3.0),
+    'k': (0.02, 0.3),
+    'home_weight': (0.9, 1.5),
+}
+
+_walks = {}  # per-process cache of memory-mapped WalkForward instances
+
+
+def load_params(path=PARAMS_FILE):
+    """Return the tuned model parameters, or the defaults if none are saved."""
+    params = dict(DEFAULT_PARAMS)
+    try:
+        with open(path) as f:
+            saved = json.load(f).get('params', {})
+    except (OSError, ValueError):
+        return params
+    params.update((k, v) for k, v in saved.items() if k in params)
+    return params
+
+
+def random_candidates(n: int, space: dict | None = None, seed: int = 0, fixed: dict | None = None):
+    """Return ``n`` parameter dicts drawn uniformly from ``space``."""
+    rng = random.Random(seed)
+    space = space or DEFAULT_SPACE
+    candidates = []
+    for _ in range(n):
+        params = dict(DEFAULT_PARAMS)
+        params.update(fixed or {})
+        for name, (low, high) in space.items():
+            params[name] = rng.uniform(low, high)
+        candidates.append(params)
+    return candidates
+
+
+def group_candidates(candidates):
+    """Group candidates that share rating parameters, keeping first-seen order."""
+    groups = defaultdict(list)
+    for params in candidates:
+        groups[tuple(params[name] for name in RATING_PARAMS)].append(params)
+    return list(groups.values())
+
+
+def _score_group(task):
+    """Score one group of candidates; a top-level function so workers can pickle it."""
+    # Imported here because backtest builds on this module's parameters.
+    from backtest import WalkForward
+
+    directory, group = task
+    walk = _walks.get(directory)
+    if walk is None:
+        walk = _walks[directory] = WalkForward.load(directory)
+    results = [(params, walk.evaluate(**params)) for params in group]
+    walk._totals.clear()  # each group's rating parameters are only used once
+    return results
+
+
+def search(games, candidates, workers: int | None = None):
+    """Score ``candidates`` by walk-forward log-loss; best first.
+
+    Returns a list of ``(params, metrics)`` pairs.
+    """
+    # Imported here because backtest builds on this module's parameters.
+    from backtest import WalkForward
+
+    walk = games if isinstance(games, WalkForward) else WalkForward(games)
+    groups = group_candidates(candidates)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(groups) == 1:
+        results = [(params, walk.evaluate(**params)) for group in groups for params in group]
+    else:
+        with tempfile.TemporaryDirectory(prefix='tuning-') as directory:
+            walk.save(directory)
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                tasks = [(directory, group) for group in groups]
+                results = [r for batch in pool.map(_score_group, tasks) for r in batch]
+    return sorted(results, key=lambda r: r[1]['log_loss'])
+
+
+def write_params(params: dict, metrics: dict, path: str = PARAMS_FILE) -> None:
+    """Save the chosen parameters (and how they scored) for the predictors."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump({'params': params, 'metrics': metrics}, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _floats(text):
+    return [float(v) for v in text.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune the rating model by walk-forward log-loss")
+    parser.add_argument('--data', default='data/sample_games.csv', help='Path to games CSV or SQLite data')
+    parser.add_argument('--since', help='Only use games on or after this date')
+    parser.add_argument('--trade-date', help='Trade deadline; post_trade_weight is only searched with one')
+    parser.add_argument('--random', type=int, metavar='N', help='Random search with N candidates instead of a grid')
+    parser.add_argument('--seed', type=int, default=0, help='Random search seed')
+    parser.add_argument('--recency-bias', type=_floats, default=[0, 0.01, 0.02, 0.03, 0.05, 0.08])
+    parser.add_argument('--post-trade-weight', type=_floats, default=[1.0, 1.5, 2.0])
+    parser.add_argument('--k', type=_floats, default=[0.05, 0.075, 0.1, 0.125, 0.15, 0.2])
+    parser.add_argument('--home-weight', type=_floats, default=[1.0, 1.05, 1.1, 1.2, 1.3])
+    parser.add_argument('--workers', type=int, help='Worker processes (default: all cores)')
+    parser.add_argument('--top', type=int, default=10, help='How many results to print')
+    parser.add_argument('--output', default=PARAMS_FILE, help='Where to write the best parameters')
+    parser.add_argument('--dry-run', action='store_true', help='Print results without writing them')
+    args = parser.parse_args()
+    from backtest import expand_grid
+
+    fixed = {'trade_date': args.trade_date}
+    if args.random:
+        space = dict(DEFAULT_SPACE)
+        if not args.trade_date:
+            del space['post_trade_weight']
+        candidates = random_candidates(args.random, space, args.seed, fixed)
+    else:
+        grid = {
+            'recency_bias': args.recency_bias,
+            'trade_date': [args.trade_date],
+            'post_trade_weight': args.post_trade_weight if args.trade_date else [DEFAULT_PARAMS['post_trade_weight']],
+            'k': args.k,
+            'home_weight': args.home_weight,
+        }
+        candidates = expand_grid(grid)
+
+    results = search(load_games(args.data, since=args.since), candidates, args.workers)
+    print(f"{len(candidates)} candidates in {len(group_candidates(candidates))} rating groups")
+    print(f"{'bias':>6} {'ptw':>5} {'k':>6} {'home_w':>6} {'logloss':>8} {'brier':>7} {'acc':>6}")
+    for p, m in results[: args.top]:
+        print(
+            f"{p['recency_bias']:6.3f} {p['post_trade_weight']:5.2f} {p['k']:6.3f} "
+            f"{p['home_weight']:6.2f} {m['log_loss']:8.4f} {m['brier']:7.4f} {m['accuracy']:6.1%}"
+        )
+    if results and not args.dry_run:
+        best, metrics = results[0]
+        write_params(best, metrics, args.output)
+        print(f"Saved best parameters to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
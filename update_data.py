@@ -1,38 +1,51 @@
 """Daily updater for NBA games and player stats from balldontlie.io."""
 
 import csv
+import json
 import os
-import requests
 from typing import List, Dict, Set, Tuple
-from tqdm import tqdm
+
+from columnar import refresh as refresh_binaries
+from elo import refresh as refresh_elo
+from http_client import get_session
+from key_index import INDEX_FILE, KeyIndex
+from player_predictor import load_player_stats
+from roster_index import RosterIndex
+from storage import DB_FILE, SQLiteStore
 
 GAMES_URL = "https://www.balldontlie.io/api/v1/games"
 STATS_URL = "https://www.balldontlie.io/api/v1/stats"
 GAME_FILE = os.path.join("data", "nba_games.csv")
 STAT_FILE = os.path.join("data", "player_stats.csv")
+CHECKPOINT_FILE = os.path.join("data", "update_checkpoint.json")
+BATCH_SIZE = 25  # games written per commit during a backfill
+GAME_FIELDS = ["id", "date", "home_team", "away_team", "home_points", "away_points"]
+STAT_FIELDS = ["game_id", "player_id", "player", "team", "points", "assists", "rebounds"]
+
+
+def fetch_games_page(season: int, page: int) -> Tuple[List[Dict], int]:
+    """Return one page of a season's games and the total page count."""
+    params = {"seasons[]": season, "per_page": 100, "page": page}
+    resp = get_session().get(GAMES_URL, params=params)
+    resp.raise_for_status()
+    body = resp.json()
+    return body["data"], body["meta"]["total_pages"]
 
 
 def fetch_all_games(season: int) -> List[Dict]:
     """Return all game objects for a season."""
-    params = {"seasons[]": season, "per_page": 100, "page": 1}
-    resp = requests.get(GAMES_URL, params=params)
-    resp.raise_for_status()
-    first = resp.json()
-    total_pages = first["meta"]["total_pages"]
-    games = first["data"]
+    from tqdm import tqdm
 
+    games, total_pages = fetch_games_page(season, 1)
     for page in tqdm(range(2, total_pages + 1), desc="Games", unit="page"):
-        params["page"] = page
-        resp = requests.get(GAMES_URL, params=params)
-        resp.raise_for_status()
-        games.extend(resp.json()["data"])
+        games.extend(fetch_games_page(season, page)[0])
     return games
 
 
 def fetch_stats_for_game(game_id: int) -> List[Dict]:
     """Return all player stats for a given game."""
     params = {"game_ids[]": game_id, "per_page": 100, "page": 1}
-    resp = requests.get(STATS_URL, params=params)
+    resp = get_session().get(STATS_URL, params=params)
     resp.raise_for_status()
     first = resp.json()
     total_pages = first["meta"]["total_pages"]
@@ -40,105 +53,225 @@ def fetch_stats_for_game(game_id: int) -> List[Dict]:
 
     for page in range(2, total_pages + 1):
         params["page"] = page
-        resp = requests.get(STATS_URL, params=params)
+        resp = get_session().get(STATS_URL, params=params)
         resp.raise_for_status()
         stats.extend(resp.json()["data"])
     return stats
 
 
-def load_existing_ids(game_path: str, stat_path: str) -> Tuple[Set[int], Set[Tuple[int, int]]]:
-    """Load existing game ids and (game_id, player_id) keys."""
-    game_ids: Set[int] = set()
-    stat_keys: Set[Tuple[int, int]] = set()
-
-    if os.path.exists(game_path):
-        with open(game_path, newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row.get("id"):
-                    game_ids.add(int(row["id"]))
-    if os.path.exists(stat_path):
-        with open(stat_path, newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                key = (int(row["game_id"]), int(row.get("player_id", 0)))
-                stat_keys.add(key)
-    return game_ids, stat_keys
-
-
-def append_rows(path: str, fieldnames: List[str], rows: List[Dict]):
+def append_rows(path: str, fieldnames: List[str], rows: List[Dict], index: KeyIndex | None = None):
+    """Append ``rows`` to a CSV and, if given, record their keys in ``index``."""
     new_file = not os.path.exists(path)
     with open(path, "a", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         if new_file:
             writer.writeheader()
         writer.writerows(rows)
+    if index is not None:
+        index.add_rows(path, rows)
+
+
+def load_checkpoint(path: str, season: int) -> Dict:
+    """Return the saved backfill position for ``season``, or ``{}``."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        checkpoint = json.load(f)
+    return checkpoint if checkpoint.get("season") == season else {}
+
+
+def save_checkpoint(path: str, checkpoint: Dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp, path)
+
+
+def _commit_batch(game_rows: List[Dict], stat_rows: List[Dict], index: KeyIndex,
+                  store: SQLiteStore | None, checkpoint_path: str, checkpoint: Dict,
+                  roster: RosterIndex | None = None) -> List[Tuple[str, str, str]]:
+    """Append a batch and record how far the backfill got.
 
+    Stats are written before their games: if the process dies in between,
+    the games are fetched again on resume and their stat rows are skipped as
+    duplicates, rather than games being kept with their stats missing.
+    Returns ``(player, old team, new team)`` for players ``roster`` now
+    places on a different team.
+    """
+    if stat_rows:
+        append_rows(STAT_FILE, STAT_FIELDS, stat_rows, index)
+    if game_rows:
+        append_rows(GAME_FILE, GAME_FIELDS, game_rows, index)
+    dates = {g["id"]: g["date"] for g in game_rows}
+    dated = [{**r, "date": dates.get(r["game_id"])} for r in stat_rows]
+    if store is not None:
+        store.insert_player_stats(dated)
+        store.insert_games(game_rows)
+    save_checkpoint(checkpoint_path, checkpoint)
+
+    moves = []
+    if roster is not None and dated:
+        before = {r["player"]: roster.current_team(r["player"]) for r in dated}
+        roster.extend(dated)
+        for player, old in before.items():
+            new = roster.current_team(player)
+            if old and new != old:
+                moves.append((player, old, new))
+    return moves
+
+
+def update_nba_data(season: int = 2023, batch_size: int = BATCH_SIZE,
+                    checkpoint_path: str = CHECKPOINT_FILE, index_path: str = INDEX_FILE,
+                    db_path: str | None = DB_FILE, roster: RosterIndex | None = None) -> List[Dict]:
+    """Fetch and append new NBA games and player stats.
+
+    Rows are committed every ``batch_size`` games together with a checkpoint
+    of the current page and last game id, so an interrupted backfill resumes
+    at that page instead of starting over. The checkpoint is removed once
+    the season has been walked to the end. Each batch is also bulk-inserted
+    into the SQLite store at ``db_path`` unless it is ``None``, and
+    extends ``roster`` (for example a loaded model's ``RosterIndex``) so its
+    team lookups stay current without a rebuild. A game whose box score
+    fails to fetch is left out of the batch, and the checkpoint stays at
+    its page, so the next run fetches the game and its stats again.
+
+    Returns the newly appended game rows so long-running consumers can feed
+    them to ``rating_engine.IncrementalRatings.add_games``.
+    """
+    from tqdm import tqdm
 
-def update_nba_data(season: int = 2023) -> None:
-    """Fetch and append new NBA games and player stats."""
     try:
-        game_ids, stat_keys = load_existing_ids(GAME_FILE, STAT_FILE)
-        games = fetch_all_games(season)
+        index = KeyIndex(GAME_FILE, STAT_FILE, index_path)
+        store = SQLiteStore(db_path) if db_path else None
     except Exception as exc:
-        print(f"Error fetching games: {exc}")
-        return
-
-    new_game_rows = []
-    new_stat_rows = []
-
-    for game in tqdm(games, desc="Processing games", unit="game"):
-        gid = game["id"]
-        if gid in game_ids:
-            continue
-        new_game_rows.append({
-            "id": gid,
-            "date": game["date"][:10],
-            "home_team": game["home_team"]["full_name"],
-            "away_team": game["visitor_team"]["full_name"],
-            "home_points": game["home_team_score"],
-            "away_points": game["visitor_team_score"],
-        })
-        game_ids.add(gid)
-
-        try:
-            stats = fetch_stats_for_game(gid)
-        except Exception as exc:
-            print(f"Failed to fetch stats for game {gid}: {exc}")
-            continue
-        for s in stats:
-            key = (gid, s["player"]["id"])
-            if key in stat_keys:
-                continue
-            new_stat_rows.append({
-                "game_id": gid,
-                "player_id": s["player"]["id"],
-                "player": s["player"]["full_name"],
-                "team": s["team"]["full_name"],
-                "points": s["pts"],
-                "assists": s["ast"],
-                "rebounds": s["reb"],
-            })
-            stat_keys.add(key)
-
-    if new_game_rows:
-        append_rows(GAME_FILE, ["id", "date", "home_team", "away_team", "home_points", "away_points"], new_game_rows)
-        print(f"✅ {len(new_game_rows)} new games added")
+        print(f"Error loading existing data: {exc}")
+        return []
+    # Keys queued in this run but not yet committed to the CSVs and index.
+    seen_games: Set[int] = set()
+    seen_stats: Set[Tuple[int, int]] = set()
+
+    checkpoint = load_checkpoint(checkpoint_path, season)
+    page = checkpoint.get("next_page", 1)
+    if page > 1:
+        print(f"↩️ Resuming season {season} from page {page} (last game {checkpoint.get('last_game_id')})")
+
+    added_games = []
+    moves = []
+    stats_added = 0
+    pending_games = []
+    pending_stats = []
+    total_pages = page
+    retry_page = None  # first page with a game whose stats failed to fetch
+    finished = False
+
+    with tqdm(desc="Games", unit="page", initial=page - 1) as bar:
+        while page <= total_pages:
+            try:
+                games, total_pages = fetch_games_page(season, page)
+            except Exception as exc:
+                print(f"Error fetching games: {exc}")
+                break
+            bar.total = total_pages
+            bar.refresh()
+
+            last_gid = checkpoint.get("last_game_id")
+            for game in games:
+                gid = game["id"]
+                if gid in seen_games or index.has_game(gid):
+                    continue
+                try:
+                    stats = fetch_stats_for_game(gid)
+                except Exception as exc:
+                    # Leave the game uncommitted, and keep the checkpoint at
+                    # or before its page, so a later run fetches it again.
+                    print(f"Failed to fetch stats for game {gid}, will retry: {exc}")
+                    retry_page = retry_page or page
+                    continue
+                pending_games.append({
+                    "id": gid,
+                    "date": game["date"][:10],
+                    "home_team": game["home_team"]["full_name"],
+                    "away_team": game["visitor_team"]["full_name"],
+                    "home_points": game["home_team_score"],
+                    "away_points": game["visitor_team_score"],
+                })
+                seen_games.add(gid)
+                last_gid = gid
+
+                for s in stats:
+                    key = (gid, s["player"]["id"])
+                    if key in seen_stats or index.has_stat(key):
+                        continue
+                    pending_stats.append({
+                        "game_id": gid,
+                        "player_id": s["player"]["id"],
+                        "player": s["player"]["full_name"],
+                        "team": s["team"]["full_name"],
+                        "points": s["pts"],
+                        "assists": s["ast"],
+                        "rebounds": s["reb"],
+                    })
+                    seen_stats.add(key)
+
+                if len(pending_games) >= batch_size:
+                    checkpoint = {"season": season, "next_page": retry_page or page, "last_game_id": gid}
+                    moves += _commit_batch(pending_games, pending_stats, index, store,
+                                           checkpoint_path, checkpoint, roster)
+                    added_games.extend(pending_games)
+                    stats_added += len(pending_stats)
+                    pending_games, pending_stats = [], []
+
+            page += 1
+            checkpoint = {"season": season, "next_page": retry_page or page, "last_game_id": last_gid}
+            moves += _commit_batch(pending_games, pending_stats, index, store,
+                                   checkpoint_path, checkpoint, roster)
+            added_games.extend(pending_games)
+            stats_added += len(pending_stats)
+            pending_games, pending_stats = [], []
+            bar.update(1)
+        else:
+            finished = True
+
+    index.close()
+    if store is not None:
+        store.close()
+    if finished and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    refresh_binaries(GAME_FILE, STAT_FILE)
+
+    if added_games:
+        print(f"✅ {len(added_games)} new games added")
     else:
         print("No new games found")
 
-    if new_stat_rows:
-        append_rows(STAT_FILE, ["game_id", "player_id", "player", "team", "points", "assists", "rebounds"], new_stat_rows)
-        print(f"✅ {len(new_stat_rows)} new player stat lines added")
+    if stats_added:
+        print(f"✅ {stats_added} new player stat lines added")
     else:
         print("No new player stats found")
+    for player, old, new in moves:
+        print(f"🔁 {player}: {old} → {new}")
+
+    print(get_session().report())
+    return added_games
+
+
+def daily_update(roster: RosterIndex | None = None) -> List[Dict]:
+    """Fetch new games, then fold just those games into the saved Elo ratings.
+
+    ``roster`` is extended in place with the new box scores.
+    """
+    added = update_nba_data(roster=roster)
+    refresh_elo(GAME_FILE, added)
+    return added
 
 
 def _schedule_loop():
     import schedule
     import time
 
-    schedule.every().day.at("04:00").do(update_nba_data)
+    # Built once; each run only extends it with that night's box scores.
+    roster = RosterIndex(load_player_stats(STAT_FILE) if os.path.exists(STAT_FILE) else ())
+    schedule.every().day.at("04:00").do(daily_update, roster)
     while True:
         schedule.run_pending()
         time.sleep(60)
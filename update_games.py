@@ -1,10 +1,10 @@
+import csv
 import os
-import time
 from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
-import requests
-import pandas as pd
-from tqdm import tqdm
+
+from fetch_pool import DEFAULT_CONCURRENCY, RateLimitedFetcher, map_concurrent
+from http_client import get_session
+from storage import DB_FILE, SQLiteStore
 
 DATA_DIR = "data"
 GAMES_PATH = os.path.join(DATA_DIR, "recent_games.csv")
@@ -16,6 +16,8 @@ STATS_URL = "https://api.balldontlie.io/v1/stats"
 
 # === Fetch Games in Backward Chunks ===
 def fetch_recent_games(limit: int = 500) -> list:
+    from dateutil.relativedelta import relativedelta
+
     games = []
     end = datetime.today()  # ⬅️ Start fetching games FROM this date and go backward
 
@@ -37,7 +39,7 @@ def fetch_recent_games(limit: int = 500) -> list:
             if cursor:
                 params["cursor"] = cursor
 
-            resp = requests.get(GAMES_URL, headers=HEADERS, params=params)
+            resp = get_session().get(GAMES_URL, headers=HEADERS, params=params)
             if resp.status_code != 200:
                 print(f"❌ Error {resp.status_code}: {resp.text}")
                 return games
@@ -78,74 +80,87 @@ def fetch_recent_games(limit: int = 500) -> list:
 
 
 # === Fetch Player Stats for One Game ===
-def fetch_stats_for_game(game_id: int) -> list:
-    stats = []
-    cursor = None
-    while True:
-        params = {"game_ids[]": game_id, "per_page": 100}
-        if cursor:
-            params["cursor"] = cursor
-
-        for _ in range(5):
-            resp = requests.get(STATS_URL, params=params, headers=HEADERS)
-            if resp.status_code == 429:
-                print(f"⏳ Rate limited fetching stats for game {game_id}. Sleeping 10s...")
-                time.sleep(10)
-                continue
-            elif resp.status_code != 200:
-                print(f"❌ Error fetching stats for game {game_id}: {resp.text}")
-                return stats
-            break
-
-        time.sleep(1.2)
-        data = resp.json()
-        stats.extend(data.get("data", []))
-
-        cursor = data.get("meta", {}).get("next_cursor")
-        if not cursor:
-            break
-    return stats
+def fetch_stats_for_game(game_id: int, fetcher: RateLimitedFetcher | None = None,
+                         url: str = STATS_URL) -> list:
+    fetcher = fetcher or RateLimitedFetcher(headers=HEADERS)
+    return fetcher.get_cursor_pages(url, {"game_ids[]": game_id, "per_page": 100})
+
+
+# === Stream Stats for Games ===
+def iter_player_stats(games, max_workers: int = DEFAULT_CONCURRENCY,
+                      fetcher: RateLimitedFetcher | None = None, url: str = STATS_URL):
+    """Yield stat lines game by game as box scores arrive, in ``games`` order.
+
+    Feed the games oldest first to update a ``PlayerProjector`` directly.
+    """
+    from tqdm import tqdm
+
+    fetcher = fetcher or RateLimitedFetcher(headers=HEADERS)
+    results = map_concurrent(
+        lambda game: fetch_stats_for_game(game["id"], fetcher, url), games, max_workers
+    )
+    for game, game_stats, error in tqdm(results, total=len(games), desc="player stats", unit="game"):
+        if error is not None:
+            print(f"❌ Failed to fetch stats for game {game['id']}: {error}")
+            continue
+        if not game_stats:
+            print(f"⚠️ No stats for game {game['id']} ({game['date']})")
+            continue
+        for stat in game_stats:
+            team = stat["team"]["full_name"]
+            opponent = (
+                game["away_team"] if team == game["home_team"] else game["home_team"]
+            )
+            yield {
+                "game_id": game["id"],
+                "date": game["date"],
+                "player": stat["player"]["full_name"],
+                "team": team,
+                "opponent": opponent,
+                "points": stat["pts"],
+                "rebounds": stat["reb"],
+                "assists": stat["ast"],
+                "steals": stat["stl"],
+                "fgm": stat["fgm"],
+                "fga": stat["fga"],
+                "ftm": stat["ftm"],
+                "fta": stat["fta"],
+            }
 
 
 # === Collect Stats for All Games ===
-def collect_player_stats(games):
-    all_stats = []
-    for game in tqdm(games, desc="player stats", unit="game"):
-        try:
-            game_stats = fetch_stats_for_game(game["id"])
-            if not game_stats:
-                print(f"⚠️ No stats for game {game['id']} ({game['date']})")
-                continue
-            for stat in game_stats:
-                team = stat["team"]["full_name"]
-                opponent = (
-                    game["away_team"] if team == game["home_team"] else game["home_team"]
-                )
-                all_stats.append({
-                    "game_id": game["id"],
-                    "date": game["date"],
-                    "player": stat["player"]["full_name"],
-                    "team": team,
-                    "opponent": opponent,
-                    "points": stat["pts"],
-                    "rebounds": stat["reb"],
-                    "assists": stat["ast"],
-                    "steals": stat["stl"],
-                    "fgm": stat["fgm"],
-                    "fga": stat["fga"],
-                    "ftm": stat["ftm"],
-                    "fta": stat["fta"],
-                })
-        except Exception as e:
-            print(f"❌ Failed to fetch stats for game {game['id']}: {e}")
-    return all_stats
+def collect_player_stats(games, max_workers: int = DEFAULT_CONCURRENCY,
+                         fetcher: RateLimitedFetcher | None = None, url: str = STATS_URL):
+    """Fetch box scores for ``games`` concurrently, sharing one rate limit."""
+    return list(iter_player_stats(games, max_workers, fetcher, url))
 
 
 # === Save to CSV ===
-def save_to_csv(path: str, rows: list):
-    os.makedirs(DATA_DIR, exist_ok=True)
-    pd.DataFrame(rows).to_csv(path, index=False)
-    print(f"✅ Saved {len(rows)} rows to {path}")
+def save_to_csv(path: str, rows) -> int:
+    """Write ``rows`` (a list or generator of dicts) to ``path`` as they arrive.
+
+    The header comes from the first row. Nothing is buffered beyond the
+    file object's own write buffer, so a generator such as
+    ``iter_player_stats`` streams straight to disk.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    rows = iter(rows)
+    first = next(rows, None)
+    count = 0
+    with open(path, "w", newline="") as f:
+        if first is not None:
+            writer = csv.DictWriter(f, fieldnames=list(first))
+            writer.writeheader()
+            writer.writerow(first)
+            count = 1
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+    print(f"✅ Saved {count} rows to {path}")
+    from columnar import refresh as refresh_binary
+
+    refresh_binary(path)
+    return count
 
 
 # === Main ===
@@ -157,10 +172,15 @@ def main():
         return
 
     save_to_csv(GAMES_PATH, games)
+    print(get_session().report())
+
+    with SQLiteStore(DB_FILE) as store:
+        store.insert_games(games)
 
-    # Optional: Enable this if you want player stats too
-    # stats = collect_player_stats(games)
-    # save_to_csv(STATS_PATH, stats)
+        # Optional: Enable this if you want player stats too
+        # stats = collect_player_stats(games)
+        # save_to_csv(STATS_PATH, stats)
+        # store.insert_player_stats(stats)
 
 
 if __name__ == "__main__":